@@ -1,12 +1,13 @@
 "use client";
 
 import { useAuth } from "@/context/AuthContext";
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useRouter } from "next/navigation";
 import { PlanesTable } from "@/components/planes-table";
 import { PartsTable } from "@/components/parts-table";
 import { PartScoreCards } from "@/components/part-score-cards";
 import { useToast } from "@/hooks/use-toast";
+import { useEventStream } from "@/hooks/use-event-stream";
 
 interface Part {
   id: string;
@@ -35,22 +36,31 @@ interface PartUsage {
 interface Plane {
   id: string;
   plane_type: string;
-  parts_used: Part[];
+  parts_used: string[];
+  part_counts: Record<string, number>;
   user: string;
   created_at: string;
 }
 
 interface PlanesResponse {
-  count: number;
+  count?: number;
   next: string | null;
-  previous: string | null;
+  previous?: string | null;
   results: Plane[];
 }
 
+// Dashboard endpointi takımın ihtiyaç duyduğu bölümleri (parçalar ve skor ya da uçaklar) ilk sayfa olarak tek istekte döner.
+interface DashboardResponse {
+  team: string;
+  parts?: PartsResponse;
+  planes?: PlanesResponse;
+  score?: PartScoreType;
+}
+
 interface PartsResponse {
-  count: number;
+  count?: number;
   next: string | null;
-  previous: string | null;
+  previous?: string | null;
   results: Part[];
 }
 export interface PartScoreType {
@@ -59,6 +69,16 @@ export interface PartScoreType {
   scores: Scores;
 }
 
+interface ScoreDelta {
+  part_type: string;
+  plane_type: keyof Scores;
+  available: number;
+  used: number;
+}
+
+// Aynı anda gelen olaylar için listeyi tek sefer yeniden okuyoruz.
+const REFRESH_DELAY_MS = 300;
+
 interface Scores {
   TB2: {
     used: number;
@@ -78,6 +98,18 @@ interface Scores {
   };
 }
 
+// Cursor linkinden sadece cursor değerini alıyoruz, istek her zaman NEXT_PUBLIC_API_URL üzerinden yapılıyor.
+const getCursor = (link: string | null): string | null =>
+  link ? new URL(link).searchParams.get("cursor") : null;
+
+const buildPageUrl = (baseUrl: string, cursor: string | null | undefined) => {
+  const params = new URLSearchParams({ with_count: "true" });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  return `${baseUrl}?${params.toString()}`;
+};
+
 export default function DashboardPage() {
   const { user, logout, isLoading } = useAuth();
   const [isMounted, setIsMounted] = useState(false);
@@ -101,12 +133,47 @@ export default function DashboardPage() {
     hasPrevious: false,
     totalCount: 0,
   });
+  // Backend cursor sayfalama kullandığı için her sayfanın cursor'ını sayfa numarasına göre saklıyoruz.
+  const planeCursors = useRef<Record<number, string | null>>({ 1: null });
+  const partCursors = useRef<Record<number, string | null>>({ 1: null });
   const router = useRouter();
   const { toast } = useToast();
 
-  const fetchPlanes = async (page: number = 1) => {
+  const applyPlanesPage = (data: PlanesResponse, page: number) => {
+    planeCursors.current[page + 1] = getCursor(data.next);
+    if (page > 2) {
+      planeCursors.current[page - 1] = getCursor(data.previous ?? null);
+    }
+    const totalCount = data.count ?? 0;
+    setPlanes(data.results);
+    setPlanesPagination({
+      currentPage: page,
+      totalPages: Math.max(1, Math.ceil(totalCount / 10)),
+      hasNext: !!data.next,
+      hasPrevious: !!data.previous,
+      totalCount,
+    });
+  };
+
+  const applyPartsPage = (data: PartsResponse, page: number) => {
+    partCursors.current[page + 1] = getCursor(data.next);
+    if (page > 2) {
+      partCursors.current[page - 1] = getCursor(data.previous ?? null);
+    }
+    const totalCount = data.count ?? 0;
+    setParts(data.results);
+    setPartsPagination({
+      currentPage: page,
+      totalPages: Math.max(1, Math.ceil(totalCount / 10)),
+      hasNext: !!data.next,
+      hasPrevious: !!data.previous,
+      totalCount,
+    });
+  };
+
+  const fetchPlanes = async (page: number = 1, showLoading: boolean = true) => {
     try {
-      setIsLoadingPlanes(true);
+      setIsLoadingPlanes(showLoading);
       const accessToken = document.cookie
         .split("; ")
         .find((row) => row.startsWith("access_token="))
@@ -122,7 +189,10 @@ export default function DashboardPage() {
       }
 
       const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_URL}/v1/planes/?page=${page}`,
+        buildPageUrl(
+          `${process.env.NEXT_PUBLIC_API_URL}/v1/planes/`,
+          planeCursors.current[page]
+        ),
         {
           headers: {
             Authorization: `Bearer ${accessToken}`,
@@ -140,14 +210,7 @@ export default function DashboardPage() {
       }
 
       const data: PlanesResponse = await response.json();
-      setPlanes(data.results);
-      setPlanesPagination({
-        currentPage: page,
-        totalPages: Math.ceil(data.count / 10),
-        hasNext: !!data.next,
-        hasPrevious: !!data.previous,
-        totalCount: data.count,
-      });
+      applyPlanesPage(data, page);
     } catch (error) {
       console.error("Error fetching planes:", error);
       toast({
@@ -160,9 +223,9 @@ export default function DashboardPage() {
     }
   };
 
-  const fetchParts = async (page: number = 1) => {
+  const fetchParts = async (page: number = 1, showLoading: boolean = true) => {
     try {
-      setIsLoadingParts(true);
+      setIsLoadingParts(showLoading);
       const accessToken = document.cookie
         .split("; ")
         .find((row) => row.startsWith("access_token="))
@@ -178,7 +241,10 @@ export default function DashboardPage() {
       }
 
       const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_URL}/v1/parts/?page=${page}`,
+        buildPageUrl(
+          `${process.env.NEXT_PUBLIC_API_URL}/v1/parts/`,
+          partCursors.current[page]
+        ),
         {
           headers: {
             Authorization: `Bearer ${accessToken}`,
@@ -196,14 +262,7 @@ export default function DashboardPage() {
       }
 
       const data: PartsResponse = await response.json();
-      setParts(data.results);
-      setPartsPagination({
-        currentPage: page,
-        totalPages: Math.ceil(data.count / 10),
-        hasNext: !!data.next,
-        hasPrevious: !!data.previous,
-        totalCount: data.count,
-      });
+      applyPartsPage(data, page);
     } catch (error) {
       console.error("Error fetching parts:", error);
       toast({
@@ -265,6 +324,46 @@ export default function DashboardPage() {
     }
   };
 
+  // Olay akışı: skorlar gelen farklarla güncelleniyor, listeler ise değişiklik olduğunda yükleniyor göstermeden yeniden okunuyor.
+  const refreshTimer = useRef<ReturnType<typeof setTimeout> | undefined>(undefined);
+  const scheduleRefresh = (refresh: () => void) => {
+    clearTimeout(refreshTimer.current);
+    refreshTimer.current = setTimeout(refresh, REFRESH_DELAY_MS);
+  };
+  const refreshParts = () =>
+    scheduleRefresh(() => fetchParts(partsPagination.currentPage, false));
+  const isStreaming = useEventStream(!!user, {
+    "part.created": refreshParts,
+    "part.deleted": refreshParts,
+    "part.retyped": refreshParts,
+    "plane.assembled": () =>
+      scheduleRefresh(() => fetchPlanes(planesPagination.currentPage, false)),
+    "score.delta": (delta: ScoreDelta) =>
+      setScore((current) =>
+        current && {
+          ...current,
+          scores: {
+            ...current.scores,
+            [delta.plane_type]: {
+              used: current.scores[delta.plane_type].used + delta.used,
+              unused: current.scores[delta.plane_type].unused + delta.available,
+            },
+          },
+        }
+      ),
+    resync: () => {
+      if (user?.team_name === "ASSEMBLY") {
+        fetchPlanes(planesPagination.currentPage, false);
+      } else {
+        fetchParts(partsPagination.currentPage, false);
+        fetchScores();
+      }
+    },
+  });
+
+  // Akış açıkken skorlar olaylarla güncelleniyor, işlem sonrası tekrar okumak farkların iki kez eklenmesine yol açar.
+  const handleScoreUpdate = isStreaming ? () => {} : fetchScores;
+
   useEffect(() => {
     setIsMounted(true);
   }, []);
@@ -275,14 +374,70 @@ export default function DashboardPage() {
     }
   }, [user, isLoading, router]);
 
+  const fetchDashboard = async () => {
+    try {
+      setIsLoadingPlanes(true);
+      setIsLoadingParts(true);
+      setIsLoadingScores(true);
+      const accessToken = document.cookie
+        .split("; ")
+        .find((row) => row.startsWith("access_token="))
+        ?.split("=")[1];
+
+      if (!accessToken) {
+        toast({
+          variant: "destructive",
+          title: "Hata",
+          description: "Oturum bilgisi bulunamadı. Lütfen tekrar giriş yapın.",
+        });
+        return;
+      }
+
+      const response = await fetch(
+        `${process.env.NEXT_PUBLIC_API_URL}/v1/dashboard/`,
+        {
+          headers: {
+            Authorization: `Bearer ${accessToken}`,
+          },
+        }
+      );
+
+      if (!response.ok) {
+        toast({
+          variant: "destructive",
+          title: "Hata",
+          description: "Gösterge paneli bilgileri getirilemedi. Lütfen tekrar deneyin.",
+        });
+        return;
+      }
+
+      const data: DashboardResponse = await response.json();
+      if (data.planes) {
+        applyPlanesPage(data.planes, 1);
+      }
+      if (data.parts) {
+        applyPartsPage(data.parts, 1);
+      }
+      if (data.score) {
+        setScore(data.score);
+      }
+    } catch (error) {
+      console.error("Error fetching dashboard:", error);
+      toast({
+        variant: "destructive",
+        title: "Hata",
+        description: "Gösterge paneli yüklenirken bir hata oluştu.",
+      });
+    } finally {
+      setIsLoadingPlanes(false);
+      setIsLoadingParts(false);
+      setIsLoadingScores(false);
+    }
+  };
+
   useEffect(() => {
     if (user) {
-      if (user.team_name === "ASSEMBLY") {
-        fetchPlanes(1);
-      } else {
-        fetchParts(1);
-        fetchScores();
-      }
+      fetchDashboard();
     }
   }, [user]);
 
@@ -360,7 +515,7 @@ export default function DashboardPage() {
                   isLoading={isLoadingParts}
                   onPageChange={fetchParts}
                   userTeam={user.team_name || ""}
-                  onScoreUpdate={fetchScores}
+                  onScoreUpdate={handleScoreUpdate}
                 />
               </>
             ))}
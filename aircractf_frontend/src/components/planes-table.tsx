@@ -10,28 +10,18 @@ import { format } from "date-fns";
 import { useState } from "react";
 import { CreatePlaneModal } from "./create-plane-modal";
 
-interface Part {
-  id: string;
-  part_type: string;
-  plane_type: string;
-  team: string;
-  user: {
-    id: string;
-    email: string;
-    first_name: string | null;
-    last_name: string | null;
-    team_name: string;
-    is_active: boolean;
-    is_admin: boolean;
-  };
-  created_at: string;
-  updated_at: string;
-}
+const PART_TYPE_LABELS: Record<string, string> = {
+  WING: "Kanat",
+  FUSELAGE: "Gövde",
+  TAIL: "Kuyruk",
+  AVIONICS: "Aviyonik",
+};
 
 interface Plane {
   id: string;
   plane_type: string;
-  parts_used: Part[];
+  parts_used: string[];
+  part_counts: Record<string, number>;
   user: string;
   created_at: string;
 }
@@ -121,18 +111,21 @@ export function PlanesTable({
       header: "Parça Sayısı",
       cell: (info) => info.getValue().length,
     }),
-    columnHelper.accessor("parts_used", {
+    columnHelper.accessor("part_counts", {
       id: "parts_details",
       header: "Parça Detayları",
       cell: (info) => (
         <div className="max-w-md">
-          {info.getValue().map((part: Part) => (
-            <div key={part.id} className="text-xs mb-1">
-              <span className="font-semibold">{part.part_type} Parçası</span> -{" "}
-              <span className="text-gray-600">{part.plane_type}</span> -{" "}
-              <span className="text-gray-500">id: {part.id}</span>
-            </div>
-          ))}
+          {Object.entries(info.getValue())
+            .filter(([, count]) => count > 0)
+            .map(([partType, count]) => (
+              <div key={partType} className="text-xs mb-1">
+                <span className="font-semibold">
+                  {PART_TYPE_LABELS[partType] ?? partType} Parçası
+                </span>{" "}
+                - <span className="text-gray-600">{count} adet</span>
+              </div>
+            ))}
         </div>
       ),
     }),
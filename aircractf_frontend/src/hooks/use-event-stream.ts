@@ -0,0 +1,126 @@
+import { useEffect, useRef, useState } from "react";
+
+// Backend'in /v1/events/ akışındaki olay tipleri.
+export const EVENT_TYPES = [
+  "part.created",
+  "part.deleted",
+  "part.retyped",
+  "plane.assembled",
+  "score.delta",
+  "resync",
+] as const;
+
+export type StreamEventType = (typeof EVENT_TYPES)[number];
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+export type StreamHandlers = Partial<Record<StreamEventType, (data: any) => void>>;
+
+const RECONNECT_DELAY_MS = 5000;
+// Akış hiç açılamadan bu kadar kez üst üste kapanırsa sunucu akışı desteklemiyor sayılır (ör. WSGI altında 501).
+const MAX_FAILED_OPENS = 3;
+
+const getAccessToken = () =>
+  document.cookie
+    .split("; ")
+    .find((row) => row.startsWith("access_token="))
+    ?.split("=")[1];
+
+// Takımın parça, uçak ve skor değişikliklerini SSE ile dinler ve bağlantı durumunu döner.
+// Kısa kopmalarda tarayıcı Last-Event-ID ile yeniden bağlanır ve kaçırılan olaylar sunucudan tekrar gelir.
+// Sunucu bağlantıyı reddederse (ör. bilet süresi doldu) yeni bilet alınıp akış baştan açılır ve kaçırılmış olabilecek
+// değişiklikler için "resync" handler'ı çağrılır. Akış kapalıysa (bilet 404) ya da sunucu akışı desteklemiyorsa yeniden
+// denenmez; false dönen değer ile sayfa polling'e devam eder.
+export function useEventStream(enabled: boolean, handlers: StreamHandlers): boolean {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+  const [isConnected, setIsConnected] = useState(false);
+
+  useEffect(() => {
+    if (!enabled) {
+      return;
+    }
+    let source: EventSource | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let isClosed = false;
+    let needsResync = false;
+    let failedOpens = 0;
+
+    const scheduleReconnect = () => {
+      setIsConnected(false);
+      needsResync = true;
+      retryTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+    };
+
+    const connect = async () => {
+      const accessToken = getAccessToken();
+      if (!accessToken || isClosed) {
+        return;
+      }
+      try {
+        const response = await fetch(
+          `${process.env.NEXT_PUBLIC_API_URL}/v1/events/ticket/`,
+          {
+            method: "POST",
+            headers: {
+              Authorization: `Bearer ${accessToken}`,
+            },
+          }
+        );
+        if (response.status === 404) {
+          return; // Olay akışı sunucuda kapalı
+        }
+        if (!response.ok) {
+          throw new Error(`Ticket request failed with ${response.status}`);
+        }
+        const { ticket } = await response.json();
+        if (isClosed) {
+          return;
+        }
+
+        let hasOpened = false;
+        source = new EventSource(
+          `${process.env.NEXT_PUBLIC_API_URL}/v1/events/?ticket=${encodeURIComponent(ticket)}`
+        );
+        source.onopen = () => {
+          hasOpened = true;
+          failedOpens = 0;
+          setIsConnected(true);
+          if (needsResync) {
+            needsResync = false;
+            handlersRef.current.resync?.({});
+          }
+        };
+        source.onerror = () => {
+          if (source?.readyState === EventSource.CLOSED) {
+            source.close();
+            if (!hasOpened) {
+              failedOpens += 1;
+            }
+            if (failedOpens < MAX_FAILED_OPENS) {
+              scheduleReconnect();
+            } else {
+              setIsConnected(false);
+            }
+          }
+        };
+        EVENT_TYPES.forEach((type) =>
+          source?.addEventListener(type, (event) =>
+            handlersRef.current[type]?.(JSON.parse((event as MessageEvent).data))
+          )
+        );
+      } catch (error) {
+        console.error("Error opening event stream:", error);
+        scheduleReconnect();
+      }
+    };
+
+    connect();
+    return () => {
+      isClosed = true;
+      clearTimeout(retryTimer);
+      source?.close();
+      setIsConnected(false);
+    };
+  }, [enabled]);
+
+  return isConnected;
+}
@@ -0,0 +1,63 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+
+from aircraft.accounts.models import Team, User
+from aircraft.accounts.serializers import AircraftObtainPairSerializer
+
+PASSWORD = "benchmark-password"
+
+
+def legacy_login(email: str, password: str):
+    # Karşılaştırma için eski login akışı: kullanıcı iki kez okunur ve şifre iki kez hashlenir.
+    user = User.objects.get(email=email)
+    user.check_password(password)
+    user = authenticate(email=email, password=password)
+    return AircraftObtainPairSerializer.get_token(user)
+
+
+def current_login(email: str, password: str):
+    serializer = AircraftObtainPairSerializer(data={"email": email, "password": password})
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+class Command(BaseCommand):
+    help = 'Measures login throughput (logins/sec) of the legacy and the current login path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=50, help='Number of logins per scenario')
+        parser.add_argument('--threads', type=int, default=1, help='Number of concurrent login threads')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        results = {}
+        # Thread'ler ayrı bağlantı kullandığı için benchmark kullanıcısı commit edilir ve sonunda silinir.
+        team = Team.objects.filter(team_type=Team.Team.WING).first() or Team.objects.create(team_type=Team.Team.WING)
+        user = User(email=f'benchmark-{time.time_ns()}@example.com', team=team, is_active=True)
+        user.set_password(PASSWORD)
+        user.save()
+        try:
+            for name, login in (('legacy', legacy_login), ('current', current_login)):
+                results[name] = self._run(login, user.email, options['logins'], options['threads'])
+        finally:
+            user.delete()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(f"{name}: {result['logins_per_second']} logins/s ({result['ms_per_login']} ms/login)")
+
+    def _run(self, login, email: str, count: int, threads: int) -> dict:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: login(email, PASSWORD), range(count)))
+        elapsed = time.perf_counter() - start
+        return {
+            'logins_per_second': round(count / elapsed, 1),
+            'ms_per_login': round(elapsed * 1000 * threads / count, 1),
+        }
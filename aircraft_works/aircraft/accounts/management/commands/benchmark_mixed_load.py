@@ -0,0 +1,84 @@
+import asyncio
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient
+from django.urls import reverse
+
+from aircraft.accounts.models import Team, User
+from aircraft.accounts.serializers import AircraftObtainPairSerializer
+
+PASSWORD = "benchmark-password"
+
+
+def summarize(timings: list) -> dict:
+    if not timings:
+        return {}
+    timings = sorted(timings)
+    return {
+        "count": len(timings),
+        "p50_ms": round(statistics.median(timings), 1),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs part list requests concurrently with logins through the ASGI handler and compares '
+        'part list latency when logins use the sync endpoint and the async (hashing pool) endpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=8, help='Number of concurrent logins per scenario')
+        parser.add_argument('--part-requests', type=int, default=40, help='Number of part list requests per scenario')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        # ASGI handler'daki senkron viewlar ayrı bir thread'de çalıştığı için benchmark kullanıcısı commit edilir ve sonunda silinir.
+        team = Team.objects.filter(team_type=Team.Team.WING).first() or Team.objects.create(team_type=Team.Team.WING)
+        user = User(email=f'benchmark-{time.time_ns()}@example.com', team=team, is_active=True)
+        user.set_password(PASSWORD)
+        user.save()
+        token = str(AircraftObtainPairSerializer.get_token(user).access_token)
+        try:
+            results = {
+                name: asyncio.run(self._scenario(login_url, user.email, token, options['logins'], options['part_requests']))
+                for name, login_url in (('no_logins', None), ('sync_login', reverse('login')), ('async_login', reverse('login_async')))
+            }
+        finally:
+            user.delete()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            parts, logins = result['parts'], result['logins']
+            line = f"{name}: part list p50 {parts['p50_ms']} ms, p95 {parts['p95_ms']} ms"
+            if logins:
+                line += f"; login p50 {logins['p50_ms']} ms"
+            self.stdout.write(line)
+
+    async def _scenario(self, login_url, email: str, token: str, logins: int, part_requests: int) -> dict:
+        client = AsyncClient()
+        part_timings, login_timings = [], []
+
+        async def timed(timings, coroutine):
+            start = time.perf_counter()
+            response = await coroutine
+            timings.append((time.perf_counter() - start) * 1000)
+            return response
+
+        login_tasks = [
+            asyncio.ensure_future(timed(login_timings, client.post(login_url, {'email': email, 'password': PASSWORD}, content_type='application/json')))
+            for _ in range(logins if login_url else 0)
+        ]
+
+        # Parça listesi istekleri loginler sürdüğü boyunca (en az part_requests kadar) art arda gönderilir.
+        sent = 0
+        while sent < part_requests or not all(task.done() for task in login_tasks):
+            await timed(part_timings, client.get(reverse('part_management'), headers={'Authorization': f'Bearer {token}'}))
+            sent += 1
+        await asyncio.gather(*login_tasks)
+        return {'parts': summarize(part_timings), 'logins': summarize(login_timings)}
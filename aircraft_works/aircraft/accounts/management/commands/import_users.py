@@ -0,0 +1,215 @@
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from aircraft.accounts.models import Team, User
+from aircraft.accounts.teams import team_registry
+from aircraft.accounts.validators import validate_name
+from aircraft.core.helpers import reserve_unique_ids
+
+NAME_MAX_LENGTH = 100
+
+
+def _init_worker():
+    # spawn ile başlatılan processlerde Django ayarları yüklü değildir, make_password'un PASSWORD_HASHERS'ı okuyabilmesi için kuruyoruz.
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def read_rows(stream, file_format: str):
+    """ Dosyayı satır satır okur ve (satır_no, dict) üretir; dosyanın tamamı belleğe alınmaz. """
+    if file_format == "csv":
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def clean_row(row) -> tuple:
+    """ Satırı doğrular ve (kullanıcı alanları, hatalar) döner. Kurallar kayıt endpointindeki kurallarla aynıdır. """
+    if row is None:
+        return None, {"row": "Satır okunamadı."}
+    errors = {}
+    email = (row.get("email") or "").strip().lower()
+    try:
+        validate_email(email)
+    except ValidationError:
+        errors["email"] = "Geçerli bir e-posta adresi giriniz."
+
+    for field in ("first_name", "last_name"):
+        value = (row.get(field) or "").strip()
+        if len(value) > NAME_MAX_LENGTH:
+            errors[field] = f"{NAME_MAX_LENGTH} karakterden uzun olamaz."
+        else:
+            try:
+                validate_name(value)
+            except ValidationError as exc:
+                errors[field] = exc.messages[0]
+        row[field] = value
+
+    team_name = (row.get("team") or row.get("team_name") or "").strip().upper()
+    if team_name not in Team.Team.values:
+        errors["team"] = f"Geçersiz takım adı: {team_name}"
+
+    password, password_hash = row.get("password") or "", row.get("password_hash") or ""
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            errors["password_hash"] = "Tanınmayan şifre hash formatı."
+    elif not password:
+        errors["password"] = "Şifre ya da şifre hash'i gereklidir."
+
+    if errors:
+        return None, errors
+    return {
+        "email": email,
+        "first_name": row["first_name"],
+        "last_name": row["last_name"],
+        "team_type": team_name,
+        "password": password,
+        "password_hash": password_hash,
+        "is_active": str(row.get("is_active", "true")).strip().lower() not in ("0", "false", "no"),
+    }, None
+
+
+class Command(BaseCommand):
+    help = 'Imports users from a CSV or NDJSON file (columns: email, first_name, last_name, team, password or password_hash, is_active)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or NDJSON file, '-' reads from stdin")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Input format, guessed from the file extension by default')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of users inserted per bulk_create')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of password hashing processes')
+        parser.add_argument('--rejects', help='Write rejected rows to this NDJSON file instead of stderr')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and hash but do not insert')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or ('csv' if options['path'].lower().endswith('.csv') else 'ndjson')
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        rejects = open(options['rejects'], 'w', encoding='utf-8') if options['rejects'] else None
+        # Takımlar import başında bir kez çözülür.
+        self.teams = {team_type: team_registry.get(team_type) for team_type in Team.Team.values}
+        self.stats = {'processed': 0, 'created': 0, 'rejected': 0}
+        self.seen_emails = set()
+        self.rejects = rejects
+        self.dry_run = options['dry_run']
+        self.workers = options['workers']
+        self.started_at = time.monotonic()
+
+        try:
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+                rows = read_rows(stream, file_format)
+                while True:
+                    batch = list(islice(rows, options['batch_size']))
+                    if not batch:
+                        break
+                    self._import_batch(batch, pool)
+                    self._report_progress()
+        except (OSError, csv.Error) as exc:
+            raise CommandError(f'Could not read {options["path"]}: {exc}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if rejects:
+                rejects.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {self.stats['created']} users created, {self.stats['rejected']} rows rejected "
+            f"in {time.monotonic() - self.started_at:.1f}s"
+        ))
+
+    def _reject(self, line_number: int, email, errors: dict):
+        self.stats['rejected'] += 1
+        record = json.dumps({'line': line_number, 'email': email, 'errors': errors}, ensure_ascii=False)
+        if self.rejects:
+            self.rejects.write(record + '\n')
+        else:
+            self.stderr.write(record)
+
+    def _import_batch(self, batch: list, pool: ProcessPoolExecutor):
+        self.stats['processed'] += len(batch)
+        valid = []
+        for line_number, row in batch:
+            data, errors = clean_row(row)
+            if errors:
+                self._reject(line_number, (row or {}).get('email'), errors)
+            elif data['email'] in self.seen_emails:
+                self._reject(line_number, data['email'], {'email': 'Bu e-posta dosyada birden fazla kez geçiyor.'})
+            else:
+                self.seen_emails.add(data['email'])
+                valid.append((line_number, data))
+
+        # Var olan e-postalar satır başına sorgu yerine batch başına tek sorgu ile bulunur.
+        existing = set(User.objects.filter(email__in=[data['email'] for _, data in valid]).values_list('email', flat=True))
+        for line_number, data in [item for item in valid if item[1]['email'] in existing]:
+            self._reject(line_number, data['email'], {'email': 'Bu e-postaya sahip bir kullanıcı zaten mevcut.'})
+        valid = [item for item in valid if item[1]['email'] not in existing]
+        if not valid:
+            return
+
+        # Şifreler process havuzunda paralel hashlenir, hash'i verilmiş satırlar hashlenmez.
+        to_hash = [data['password'] for _, data in valid if not data['password_hash']]
+        hashes = iter(pool.map(make_password, to_hash, chunksize=max(1, len(to_hash) // (self.workers * 4))))
+        users = []
+        for (_, data), user_id in zip(valid, reserve_unique_ids(len(valid))):
+            users.append(User(
+                id=user_id,
+                email=data['email'],
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                team=self.teams[data['team_type']],
+                password=data['password_hash'] or next(hashes),
+                is_active=data['is_active'],
+                is_staff=False,
+                is_superuser=False,
+            ))
+        if self.dry_run:
+            self.stats['created'] += len(users)
+            return
+        self._insert(users, valid)
+
+    def _insert(self, users: list, valid: list):
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+            self.stats['created'] += len(users)
+        except IntegrityError:
+            # Import sırasında başka bir yerden aynı e-posta ile kullanıcı oluşturulmuş olabilir, o satırları ayırıp tekrar deniyoruz.
+            existing = set(User.objects.filter(email__in=[user.email for user in users]).values_list('email', flat=True))
+            if not existing:
+                raise
+            for line_number, data in valid:
+                if data['email'] in existing:
+                    self._reject(line_number, data['email'], {'email': 'Bu e-postaya sahip bir kullanıcı zaten mevcut.'})
+            remaining = [(user, item) for user, item in zip(users, valid) if user.email not in existing]
+            if remaining:
+                self._insert([user for user, _ in remaining], [item for _, item in remaining])
+
+    def _report_progress(self):
+        elapsed = time.monotonic() - self.started_at
+        self.stdout.write(
+            f"processed {self.stats['processed']}, created {self.stats['created']}, rejected {self.stats['rejected']} "
+            f"({self.stats['processed'] / max(elapsed, 0.001):.0f} rows/s)"
+        )
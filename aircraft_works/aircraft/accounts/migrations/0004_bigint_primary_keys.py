@@ -0,0 +1,35 @@
+# Generated by Django 5.0.8 on 2026-10-17 15:09
+
+import aircraft.core.fields
+import aircraft.core.helpers
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_alter_team_team_type"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="team",
+            name="id",
+            field=aircraft.core.fields.AircraftBigIntegerPrimaryKeyField(
+                default=aircraft.core.helpers.generate_unique_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=aircraft.core.fields.AircraftBigIntegerPrimaryKeyField(
+                default=aircraft.core.helpers.generate_unique_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
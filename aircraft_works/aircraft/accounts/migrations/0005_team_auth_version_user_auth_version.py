@@ -0,0 +1,23 @@
+# Generated by Django 5.0.8 on 2026-10-17 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_bigint_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="auth_version",
+            field=models.BigIntegerField(default=0, editable=False, verbose_name="Auth Version"),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="auth_version",
+            field=models.BigIntegerField(default=0, editable=False, verbose_name="Auth Version"),
+        ),
+    ]
@@ -26,6 +26,7 @@ class User(AdminUtilsMixin, PermissionsMixin, AbstractBaseUser, BaseModelMixin):
     is_staff = models.BooleanField(default=True, verbose_name="Is Staff?")
     is_active = models.BooleanField(default=True, verbose_name="Is Active?")
     is_deleted = models.BooleanField(default=False, verbose_name="Is Deleted?")
+    auth_version = models.BigIntegerField(default=0, editable=False, verbose_name="Auth Version") # Her kayıtta değişir; token claim'leri ve worker cache'indeki kullanıcı bu değer ile doğrulanır.
     groups = models.ManyToManyField(Group, blank=True, related_name="custom_user_groups")
     user_permissions = models.ManyToManyField(Permission, blank=True, related_name="custom_user_permissions")
 
@@ -40,8 +41,30 @@ class User(AdminUtilsMixin, PermissionsMixin, AbstractBaseUser, BaseModelMixin):
         return f"{self.id} - {self.email}"
 
     def save(self, *args: Any, **kwargs: Any) -> None:
+        from aircraft.core.etags import USERS_SCOPE, bump_versions, user_scope
+        from aircraft.core.user_cache import bump_user_version, new_version
+
         self.clean()
+        if kwargs.get("update_fields") == ["last_login"]:
+            super().save(*args, **kwargs)
+            return
+        # Worker cache'lerinde ve token claim'lerinde tutulan kullanıcı bilgilerini geçersiz kılıyoruz.
+        self.auth_version = new_version()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = [*kwargs["update_fields"], "auth_version"]
         super().save(*args, **kwargs)
+        bump_user_version(self.pk, self.auth_version)
+        bump_versions(USERS_SCOPE, user_scope(self.pk)) # Kullanıcı bilgileri parça listesinde ve /users/me/ cevabında yer alıyor.
+
+    def delete(self, *args: Any, **kwargs: Any):
+        from aircraft.core.etags import USERS_SCOPE, bump_versions, user_scope
+        from aircraft.core.user_cache import bump_user_version
+
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        bump_user_version(user_id)
+        bump_versions(USERS_SCOPE, user_scope(user_id))
+        return result
 
 
 # Sistemde bulunan takımlar için bir model yarattım ve model ismi Team'dir.
@@ -59,6 +82,7 @@ class Team(AdminUtilsMixin, BaseModelMixin):
         ASSEMBLY = "ASSEMBLY", "Montaj Takımı"
 
     team_type = models.CharField(max_length=20, choices=Team.choices, default=Team.WING, verbose_name="Takım Türü", unique=True)
+    auth_version = models.BigIntegerField(default=0, editable=False, verbose_name="Auth Version") # Her kayıtta değişir; takım bilgisi içeren token claim'lerini geçersiz kılar.
 
     class Meta:
         verbose_name = "Team"
@@ -68,6 +92,29 @@ class Team(AdminUtilsMixin, BaseModelMixin):
         return f"{self.id} - {self.team_type}"
 
     def save(self, *args: Any, **kwargs: Any) -> None:
+        from aircraft.accounts.teams import team_registry
+        from aircraft.core.etags import USERS_SCOPE, bump_versions, team_scope
+        from aircraft.core.user_cache import bump_team_version, new_version
+
         self.clean()
+        # Bu takımdaki kullanıcıların cache'lenmiş takım bilgilerini ve token claim'lerini geçersiz kılıyoruz.
+        self.auth_version = new_version()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = [*kwargs["update_fields"], "auth_version"]
         super().save(*args, **kwargs)
+        bump_team_version(self.pk, self.auth_version)
+        bump_versions(USERS_SCOPE, team_scope(self.pk))
+        team_registry.clear()
+
+    def delete(self, *args: Any, **kwargs: Any):
+        from aircraft.accounts.teams import team_registry
+        from aircraft.core.etags import USERS_SCOPE, bump_versions, team_scope
+        from aircraft.core.user_cache import bump_team_version
+
+        team_id = self.pk
+        result = super().delete(*args, **kwargs)
+        bump_team_version(team_id)
+        bump_versions(USERS_SCOPE, team_scope(team_id))
+        team_registry.clear()
+        return result
 
@@ -1,13 +1,20 @@
 from rest_framework.fields import CharField, CurrentUserDefault, HiddenField, IntegerField, ChoiceField
-from rest_framework.serializers import ModelSerializer, Serializer, SerializerMethodField
+from rest_framework.serializers import Serializer, SerializerMethodField
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from drf_extra_fields.fields import HybridImageField, LowercaseEmailField
+from django.contrib.auth.models import update_last_login
 from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
 from aircraft.accounts.models import Team, User
+from aircraft.accounts.teams import team_registry
 from aircraft.accounts.validators import validate_name
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from aircraft.core.authentication import add_user_claims
+from aircraft.core.serializers import AircraftModelSerializer
 
 
 class LogoutSerializer(Serializer):
@@ -24,7 +31,7 @@ class LogoutSerializer(Serializer):
             raise ValidationError("Token is invalid or expired")
     
 
-class CreateUserSerializer(ModelSerializer):
+class CreateUserSerializer(AircraftModelSerializer):
     team_name = CharField(write_only=True, required=True)
     email = LowercaseEmailField(required=True, validators=[validate_email])
     first_name = CharField(required=False, allow_blank=True, validators=[validate_name])
@@ -39,11 +46,6 @@ class CreateUserSerializer(ModelSerializer):
             'last_name': {'required': True, 'max_length': 100}
         }
 
-    def validate_email(self, value): # Frontendden gönderilen email sistemde mevcutsa sisteme bu kullanıcı kaydedilmez.
-        if User.objects.filter(email=value).exists():
-            raise ValidationError("Bu e-postaya sahip bir kullanıcı zaten mevcut.")
-        return value
-
     def validate_first_name(self, value):
         if len(value) > 100:
             raise ValidationError('İsim 100 karakterden uzun olamaz.')
@@ -61,38 +63,99 @@ class CreateUserSerializer(ModelSerializer):
         return value
 
     def create(self, validated_data): # User oluşturma yani post metodunda kullanılır.
-        team_name = validated_data.pop("team_name")
-        team, _ = Team.objects.get_or_create(team_type=team_name)
-        validated_data["team"] = team
+        """
+            Kullanıcı tamamen hazırlanıp veritabanına tek bir INSERT ile yazılır; şifre sadece bir kez hashlenir.
+            Takım process içindeki takım kayıt defterinden alınır. E-postanın benzersizliği ayrı bir exists() sorgusu yerine
+            veritabanındaki unique constraint ile kontrol edilir.
+        """
+        team = team_registry.get(validated_data.pop("team_name"))
         password = validated_data.pop("password")
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)  # Kullanıcıyı oluşturduktan sonra frontendden gelen passwordü kullanıya setliyoruz. Hashlenmiş bir şekilde gözükücek artık password.
-        user.is_active = True # Kullanıcı is_active'i True olarak ayarlıyoruz.
-        user.save()
+        password_hash = validated_data.pop("password_hash", None) # Asenkron endpoint şifreyi hashleme havuzunda önceden hashleyip gönderir.
+        user = User(
+            email=User.objects.normalize_email(validated_data.pop("email")),
+            team=team,
+            is_staff=False,
+            is_superuser=False,
+            is_active=True, # Kullanıcı is_active'i True olarak ayarlıyoruz.
+            **validated_data,
+        )
+        if password_hash:
+            user.password = password_hash
+        else:
+            user.set_password(password) # Frontendden gelen passwordü hashlenmiş bir şekilde kullanıcıya setliyoruz.
+
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+                # Foreign key kontrolleri ertelenmiş (DEFERRED) olduğu için normalde en dıştaki transaction commit edilirken yapılır;
+                # dışarıda başka bir atomic bloğu varsa bu blok sadece savepoint'tir. Kontrolleri burada çalıştırıyoruz ki
+                # silinmiş bir takımın id'si hatası bu blokta yakalansın ve kayıt defteri temizlensin.
+                transaction.get_connection().check_constraints()
+        except IntegrityError:
+            if User.objects.filter(email=user.email).exists(): # Frontendden gönderilen email sistemde mevcutsa kullanıcı kaydedilmez.
+                raise ValidationError({"email": ["Bu e-postaya sahip bir kullanıcı zaten mevcut."]})
+            team_registry.clear() # Takım başka bir processte silinmiş olabilir, bir sonraki istekte takım veritabanından okunur.
+            raise
         return user
-    
+
 
 class AircraftObtainPairSerializer(TokenObtainPairSerializer): # Login işlemi için kullanılan serializer
-    def validate(self, attrs) -> dict:
-        email = attrs.get("email") # frontendden gelen email
-        password = attrs.get("password") # frontendden gelen password
-        try:
-            user = User.objects.get(email=email) # Bu emaile sahip sistemde kullanıcı var mı kontrolü yapıyorum.
-            if user.check_password(password): # Eğer varsa frontendden gönderilen passwordle üser passwordünü kontrol ediyorum.
-                attrs["email"] = user.email # Aynı ise emaili kaydediyorum
-        except User.DoesNotExist: # Bu emaile sahip kullanıcı yoksa except bloğuna giricek ve hata vericek.
+    @classmethod
+    def get_token(cls, user):
+        # Takım ve aktiflik bilgilerini token'a ekliyoruz, böylece sonraki isteklerde permission kontrolleri veritabanına gitmeden yapılır.
+        return add_user_claims(super().get_token(user), user)
+
+    def authenticate_user(self, email: str, password: str) -> User:
+        """
+            Kullanıcıyı tek sorguda (takımı ile birlikte) bulur ve şifresini bir kez kontrol eder.
+            TokenObtainPairSerializer.validate tekrar authenticate() çağırıp şifreyi ikinci kez hashlediği için onu kullanmıyoruz.
+        """
+        user = self.get_login_user(email)
+        self.check_login_user(user, user.check_password(password))
+        return user
+
+    @staticmethod
+    def get_login_user(email: str) -> User:
+        user = User.objects.select_related("team").filter(email=email).first() # Bu emaile sahip sistemde kullanıcı var mı kontrolü yapıyorum.
+        if user is None: # Bu emaile sahip kullanıcı yoksa hata vericek.
             raise ValidationError("Sağlanan kimlik bilgilerine sahip böyle bir kullanıcı yok")
-        data = super().validate(attrs) # eklenen bilgilere göre TokenObtainPairSerializer'ın validate fonksiyonuna emaili gönderiyorum ve bu fonksiyon bana access_token ve refresh_token döndürüyor.
+        return user
+
+    def check_login_user(self, user: User, password_is_correct: bool) -> None:
+        # Şifre yanlışsa ya da kullanıcı aktif değilse simplejwt ile aynı hatayı dönüyoruz.
+        if not password_is_correct or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+    def issue_tokens(self, user: User) -> dict:
+        refresh = self.get_token(user) # Doğrulanan kullanıcı için access_token ve refresh_token oluşturuyoruz.
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+    def validate(self, attrs) -> dict:
+        self.user = self.authenticate_user(attrs.get("email"), attrs.get("password")) # frontendden gelen email ve password
+        return self.issue_tokens(self.user)
+
+
+class AircraftTokenRefreshSerializer(TokenRefreshSerializer): # Refresh ile alınan access tokendaki takım bilgilerini güncelleyen serializer
+    def validate(self, attrs) -> dict:
+        data = super().validate(attrs)
+        # Refresh token 7 gün geçerli olduğu için içindeki claim'ler eskimiş olabilir, yeni access token'a güncel bilgileri yazıyoruz.
+        access = AccessToken(data["access"])
+        user = User.objects.select_related("team").filter(**{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}).first()
+        if user is None or not user.is_active:
+            raise ValidationError("No active account found with the given credentials")
+        data["access"] = str(add_user_claims(access, user))
         return data
 
 
-class TeamSerializer(ModelSerializer):
+class TeamSerializer(AircraftModelSerializer):
     class Meta:
         model = Team
         fields = ['id', 'team_type']
 
 
-class UserSerializer(ModelSerializer):
+class UserSerializer(AircraftModelSerializer):
     team_name = SerializerMethodField()
 
     def get_team_name(self, obj):
@@ -0,0 +1,35 @@
+import threading
+
+from django.db import DEFAULT_DB_ALIAS
+
+from aircraft.accounts.models import Team
+
+"""
+    Takım kayıt defteri (registry).
+    Sistemde sadece birkaç takım vardır ve nadiren değişir; kayıt sırasında her seferinde Team tablosuna gitmemek için
+    takım tipi -> takım id eşlemesi process içinde tutulur. Team kaydedildiğinde ya da silindiğinde bu processteki eşleme temizlenir.
+    Başka bir processte silinen bir takımın id'si kullanılırsa foreign key hatası alınır; bu durumda çağıran taraf clear() ile
+    eşlemeyi temizler.
+"""
+
+
+class TeamRegistry:
+    def __init__(self):
+        self._team_ids = {}
+        self._lock = threading.Lock()
+
+    def get(self, team_type: str) -> Team:
+        """ Takımı döner, yoksa oluşturur. Dönen nesnede sadece id ve team_type alanları doludur. """
+        team_id = self._team_ids.get(team_type)
+        if team_id is None:
+            team, _ = Team.objects.get_or_create(team_type=team_type)
+            with self._lock:
+                self._team_ids[team_type] = team_id = team.pk
+        return Team.from_db(DEFAULT_DB_ALIAS, ["id", "team_type"], [team_id, team_type])
+
+    def clear(self):
+        with self._lock:
+            self._team_ids.clear()
+
+
+team_registry = TeamRegistry()
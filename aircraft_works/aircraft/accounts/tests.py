@@ -1,11 +1,32 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from aircraft.accounts.models import User, Team
+from aircraft.accounts.serializers import CreateUserSerializer
+from aircraft.accounts.teams import team_registry
+from aircraft.core.authentication import user_from_claims
+from aircraft.core.hashing import HashingPool
+from aircraft.core.user_cache import UserCache, get_versions, user_cache
 from aircraft.plane_management.models import Part
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 class SignUpTests(APITestCase):
+    def setUp(self):
+        # Takım kayıt defteri process içinde tutulduğu için önceki testlerde geri alınan takımları temizliyoruz.
+        team_registry.clear()
+
     def test_successful_signup(self):
         """Başarılı kayıt testi"""
         url = reverse('sign_up')
@@ -33,6 +54,22 @@ class SignUpTests(APITestCase):
         self.assertEqual(user.last_name, "User")
         self.assertEqual(user.team.team_type, "WING")
 
+    def test_signup_with_deleted_team_clears_registry_inside_outer_transaction(self):
+        """Kayıt defterindeki takım silinmişse hata dıştaki transaction içinde de kayıt sırasında alınmalı ve kayıt defteri temizlenmeli"""
+        team = Team.objects.create(team_type="WING")
+        team_registry.get("WING")
+        Team.objects.filter(pk=team.pk).delete() # Başka bir processte silinmiş gibi; bu processteki kayıt defteri temizlenmez.
+        serializer = CreateUserSerializer(data={
+            "first_name": "Test", "last_name": "User", "email": "user@example.com", "team_name": "WING", "password": "test1234",
+        })
+        serializer.is_valid(raise_exception=True)
+
+        with self.assertRaises(IntegrityError):
+            serializer.save()
+
+        self.assertIsNone(team_registry._team_ids.get("WING"))
+        self.assertEqual(User.objects.count(), 0)
+
     def test_signup_with_invalid_team(self):
         """Geçersiz takım ile kayıt testi"""
         url = reverse('sign_up')
@@ -104,6 +141,29 @@ class SignUpTests(APITestCase):
         # Yeni kullanıcı oluşturulmamalı
         self.assertEqual(User.objects.count(), 1)
 
+    def test_signup_writes_user_once(self):
+        """Kayıt tek INSERT ile yapılmalı, şifre bir kez hashlenmeli ve takım tekrar okunmamalı"""
+        url = reverse('sign_up')
+        data = {
+            "first_name": "Test",
+            "last_name": "User",
+            "email": "first@example.com",
+            "team_name": "WING",
+            "password": "test1234"
+        }
+        self.assertEqual(self.client.post(url, data, format='json').status_code, status.HTTP_201_CREATED)
+
+        data["email"] = "second@example.com"
+        with mock.patch('aircraft.accounts.models.User.set_password', autospec=True, side_effect=User.set_password) as set_password, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set_password.call_count, 1)
+        user_table, team_table = f'"{User._meta.db_table}"', f'"{Team._meta.db_table}"'
+        self.assertEqual([query['sql'].split()[0] for query in queries if user_table in query['sql'] or team_table in query['sql']], ['INSERT'])
+        self.assertTrue(User.objects.get(email="second@example.com").check_password("test1234"))
+
     def test_signup_with_long_names(self):
         """Uzun isimlerle kayıt testi"""
         url = reverse('sign_up')
@@ -232,6 +292,17 @@ class LoginTests(APITestCase):
         # Giriş başarısız olmalı
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_login_hashes_password_once(self):
+        """Login şifreyi bir kez kontrol etmeli ve kullanıcıyı tek sorguda okumalı"""
+        with mock.patch.object(User, 'check_password', autospec=True, side_effect=User.check_password) as check_password, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('login'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(check_password.call_count, 1)
+        user_queries = [query for query in queries if f'FROM "{User._meta.db_table}"' in query['sql']]
+        self.assertEqual(len(user_queries), 1)
+
 class UserDetailTests(APITestCase):
     def setUp(self):
         """Test öncesi gerekli verileri oluşturuyoruz"""
@@ -289,4 +360,309 @@ class UserDetailTests(APITestCase):
         response = self.client.get(url)
         
         # Yetkisiz erişim hatası almalıyız - deaktif kullanıcılar için 403 Forbidden
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_user_detail_returns_304_until_user_changes(self):
+        """Kullanıcı ve takımı değişmedikçe 304, değiştiğinde 200 dönmeli"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('my_user_details')
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1): # Sadece ETag versiyonları okunur
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.user.first_name = "Changed"
+        with self.captureOnCommitCallbacks(execute=True): # Versiyonlar commit sonrası değişiyor
+            self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Changed')
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class TokenClaimsTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.team = Team.objects.create(team_type="WING")
+        self.user = User.objects.create(email="test@example.com", first_name="Test", team=self.team, is_active=True)
+        self.user.set_password("test1234")
+        self.user.save()
+
+    def _login(self):
+        response = self.client.post(reverse('login'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_login_token_contains_team_claims(self):
+        """Login ile dönen access token takım ve aktiflik bilgilerini içermeli"""
+        access = AccessToken(self._login()['access'])
+
+        self.assertEqual(access['team_id'], self.team.id)
+        self.assertEqual(access['team_type'], "WING")
+        self.assertTrue(access['is_active'])
+
+    def test_permission_checks_do_not_query_user_or_team(self):
+        """Claim'leri olan token ile yapılan isteklerde kullanıcı ve takım veritabanından okunmamalı"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('part_management'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tables = (User._meta.db_table, Team._meta.db_table)
+        self.assertFalse(any(query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql'] for query in queries for table in tables))
+
+    def test_user_from_claims_fills_fields(self):
+        """Claim'lerden oluşturulan kullanıcının id, takım ve aktiflik alanları token'daki değerlerle aynı olmalı"""
+        user = user_from_claims(AccessToken(self._login()['access']))
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.team_id, self.team.id)
+        self.assertEqual(user.team.team_type, "WING")
+        self.assertIs(user.is_active, True)
+
+    def test_token_without_claims_falls_back_to_database(self):
+        """Claim'leri olmayan eski tokenlar kullanıcıyı veritabanından okuyarak çalışmaya devam etmeli"""
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = self.client.get(reverse('part_management'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stale_claims_are_checked_against_database(self):
+        """TOKEN_CLAIMS_MAX_AGE süresini aşan claim'ler yerine veritabanındaki güncel durum kullanılmalı"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_200_OK)
+        with self.settings(TOKEN_CLAIMS_MAX_AGE=timedelta(seconds=-1)):
+            self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_restamps_claims(self):
+        """Refresh ile alınan access token takımın güncel bilgisini içermeli"""
+        refresh = self._login()['refresh']
+        assembly_team = Team.objects.create(team_type="ASSEMBLY")
+        self.user.team = assembly_team
+        self.user.save()
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        access = AccessToken(response.data['access'])
+        self.assertEqual(access['team_id'], assembly_team.id)
+        self.assertEqual(access['team_type'], "ASSEMBLY")
+
+    def test_user_detail_with_claims_token_returns_full_user(self):
+        """Kullanıcı detayı token'dan oluşturulan kısmi kullanıcı yerine veritabanındaki tam kaydı dönmeli"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+
+        response = self.client.get(reverse('my_user_details'))
+
+        self.assertEqual(response.data['email'], 'test@example.com')
+        self.assertEqual(response.data['first_name'], 'Test')
+        self.assertEqual(response.data['team_name'], 'WING')
+
+
+class UserCacheTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        user_cache.clear()
+        self.team = Team.objects.create(team_type="WING")
+        self.user = User.objects.create(email="test@example.com", team=self.team, is_active=True)
+        # Claim'leri olmayan token ile istek atıldığında kullanıcı cache üzerinden okunur.
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+
+    def _user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('part_management'))
+        user_queries = [query for query in queries if f'FROM "{User._meta.db_table}"' in query['sql']]
+        return response, user_queries
+
+    def test_user_is_read_once_per_worker(self):
+        """Aynı kullanıcının ikinci isteğinde kullanıcı ve takım veritabanından okunmamalı"""
+        response, first = self._user_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first), 1)
+
+        response, second = self._user_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(second, [])
+
+    def test_deactivation_applies_immediately(self):
+        """Kullanıcı kaydedildiğinde cache'teki kayıt geçersiz olmalı"""
+        self._user_queries()
+        self.user.is_active = False
+        self.user.save()
+
+        response, user_queries = self._user_queries()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(user_queries), 1)
+
+    def test_team_change_invalidates_claims_token(self):
+        """Token alındıktan sonra takımı değişen kullanıcının claim'leri kullanılmamalı"""
+        self.user.set_password("test1234")
+        self.user.save()
+        login = self.client.post(reverse('login'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access']}")
+        self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_200_OK)
+
+        self.user.team = Team.objects.create(team_type="ASSEMBLY")
+        self.user.save()
+
+        self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_lost_versions_do_not_revalidate_tokens(self):
+        """Versiyonlar cache'ten silinse (eviction, worker yeniden başlatma) bile pasife alınan kullanıcının token'ı geçersiz kalmalı"""
+        self.user.set_password("test1234")
+        self.user.save()
+        login = self.client.post(reverse('login'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access']}")
+        self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        cache.clear()
+        self.assertEqual(self.client.get(reverse('part_management')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lost_versions_invalidate_cached_user(self):
+        """Versiyonlar cache'ten silindiğinde cache'teki kullanıcı veritabanındaki güncel versiyon ile karşılaştırılmalı"""
+        self._user_queries()
+        User.objects.filter(pk=self.user.pk).update(auth_version=self.user.auth_version + 1, is_active=False)
+        cache.clear()
+
+        response, user_queries = self._user_queries()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(user_queries), 2)
+
+    def test_cache_is_bounded(self):
+        """Cache en fazla max_size kullanıcı tutmalı ve en eski kullanılanı atmalı"""
+        cache_ = UserCache(max_size=2, timeout=60)
+        users = [User.objects.create(email=f"user{index}@example.com", team=self.team) for index in range(3)]
+        for user in users:
+            cache_.set(user, get_versions(user.pk, user.team_id))
+
+        self.assertIsNone(cache_.get(users[0].pk))
+        self.assertEqual(cache_.get(users[2].pk).email, "user2@example.com")
+        self.assertEqual(cache_.get(users[2].pk).team.team_type, "WING")
+
+    def test_expired_entries_are_not_used(self):
+        """TTL süresi dolan kayıtlar kullanılmamalı"""
+        cache_ = UserCache(max_size=2, timeout=-1)
+        cache_.set(self.user, get_versions(self.user.pk, self.user.team_id))
+
+        self.assertIsNone(cache_.get(self.user.pk))
+
+
+class AsyncAuthTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.team = Team.objects.create(team_type="WING")
+        self.user = User.objects.create(email="test@example.com", team=self.team, is_active=True)
+        self.user.set_password("test1234")
+        self.user.save()
+
+    def test_async_login(self):
+        """Asenkron login senkron login ile aynı tokenları dönmeli"""
+        response = self.client.post(reverse('login_async'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.json()['access'])['team_type'], "WING")
+        self.assertIn('refresh', response.json())
+
+    def test_async_login_errors_match_sync_login(self):
+        """Asenkron login hataları senkron login ile aynı durum kodu ve mesajı dönmeli"""
+        for data in (
+            {'email': 'test@example.com', 'password': 'wrong_password'},
+            {'email': 'nonexistent@example.com', 'password': 'test1234'},
+            {'password': 'test1234'},
+        ):
+            sync_response = self.client.post(reverse('login'), data, format='json')
+            async_response = self.client.post(reverse('login_async'), data, format='json')
+
+            self.assertEqual(async_response.status_code, sync_response.status_code)
+            self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_async_login_upgrades_outdated_password_hash(self):
+        """Asenkron login eski algoritma ile kaydedilmiş şifre hash'ini senkron login gibi güncellemeli"""
+        User.objects.filter(pk=self.user.pk).update(password=make_password("test1234", hasher="pbkdf2_sha1"))
+
+        response = self.client.post(reverse('login_async'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(self.user.check_password("test1234"))
+
+    def test_async_sign_up(self):
+        """Asenkron kayıt ile oluşturulan kullanıcı login olabilmeli"""
+        data = {
+            'email': 'new@example.com',
+            'password': 'test1234',
+            'first_name': 'Test',
+            'last_name': 'User',
+            'team_name': 'WING'
+        }
+
+        response = self.client.post(reverse('sign_up_async'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['email'], 'new@example.com')
+        self.assertTrue(User.objects.get(email='new@example.com').check_password('test1234'))
+
+    def test_full_hashing_pool_rejects_request(self):
+        """Hashleme havuzu ve kuyruğu doluysa istek beklemeden 503 ile reddedilmeli"""
+        pool = HashingPool(workers=1, queue_limit=0)
+        pool._ensure_started()
+        pool._slots.acquire()
+        try:
+            with mock.patch('aircraft.accounts.views.hashing_pool', pool):
+                response = self.client.post(reverse('login_async'), {'email': 'test@example.com', 'password': 'test1234'}, format='json')
+        finally:
+            pool._slots.release()
+            pool.shutdown()
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class ImportUsersTests(APITestCase):
+    def setUp(self):
+        team_registry.clear()
+        self.existing = User.objects.create(email="existing@example.com", team=Team.objects.create(team_type="WING"))
+
+    def test_import_users_from_csv(self):
+        """Geçerli satırlar toplu eklenmeli, hatalı ve tekrar eden satırlar raporlanmalı"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.csv")
+            rejects_path = os.path.join(directory, "rejects.ndjson")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(
+                    "email,first_name,last_name,team,password\n"
+                    "new1@example.com,Ali,Veli,WING,test1234\n"
+                    "NEW2@example.com,Ayşe,Kaya,tail,test1234\n"
+                    "new1@example.com,Ali,Veli,WING,test1234\n"
+                    "existing@example.com,Var,Olan,WING,test1234\n"
+                    "not-an-email,X,Y,WING,test1234\n"
+                    "new3@example.com,Can,Er,UNKNOWN,test1234\n"
+                )
+
+            call_command("import_users", path, "--batch-size", "2", "--workers", "1", "--rejects", rejects_path, stdout=StringIO())
+
+            with open(rejects_path, encoding="utf-8") as file:
+                rejected = [json.loads(line) for line in file]
+
+        self.assertEqual(sorted(row["line"] for row in rejected), [4, 5, 6, 7])
+        self.assertEqual(User.objects.count(), 3)
+        user = User.objects.get(email="new2@example.com")
+        self.assertEqual(user.team.team_type, "TAIL")
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.check_password("test1234"))
@@ -1,13 +1,19 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import check_password, make_password
 from rest_framework.generics import CreateAPIView, GenericAPIView, RetrieveUpdateAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST
 from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
 
 from aircraft.accounts.models import Team, User
-from aircraft.accounts.serializers import AircraftObtainPairSerializer, CreateUserSerializer, LogoutSerializer, UserSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from aircraft.accounts.serializers import AircraftObtainPairSerializer, AircraftTokenRefreshSerializer, CreateUserSerializer, LogoutSerializer, UserSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from aircraft.core.async_views import AircraftAsyncAPIView
+from aircraft.core.etags import ConditionalGetMixin, get_versions, make_etag, team_scope, user_scope
+from aircraft.core.hashing import hashing_pool
 from aircraft.core.permissions import AircraftIsAuthenticated
 
 
@@ -43,13 +49,52 @@ class AircraftTokenObtainPairView(TokenObtainPairView): # Login için oluşturmu
     serializer_class = AircraftObtainPairSerializer
 
 
-class MyUserDetailView(RetrieveUpdateAPIView): # Kullanıcı detayını veren endpointdir.
+class AsyncTokenObtainPairView(AircraftAsyncAPIView): # ASGI altında şifre kontrolünü hashleme havuzunda yapan login endpointidir.
+    async def handle(self, request, data: dict) -> dict:
+        serializer = AircraftObtainPairSerializer(data=data, context={"request": request})
+        attrs = serializer.to_internal_value(data) # Sadece alan doğrulaması, veritabanına gitmez.
+        try:
+            user = await sync_to_async(serializer.get_login_user)(attrs["email"])
+        except ValidationError as exc: # Senkron endpoint ile aynı formatta ({"non_field_errors": [...]}) dönmesi için
+            raise ValidationError(as_serializer_error(exc))
+        # Şifre kontrolü istek thread'ini ve event loop'u bloklamadan hashleme havuzunda yapılır.
+        # Hash eski bir algoritma ya da iterasyon sayısı ile kaydedilmişse check_password setter'ı çağırır (User.check_password ile aynı).
+        outdated = []
+        password_is_correct = await hashing_pool.run(check_password, attrs["password"], user.password, outdated.append)
+        serializer.check_login_user(user, password_is_correct)
+        if outdated: # Yeni hash de havuzda hesaplanır, sadece kayıt veritabanı thread'inde yapılır.
+            user.password = await hashing_pool.run(make_password, attrs["password"])
+            await sync_to_async(user.save)(update_fields=["password"])
+        return await sync_to_async(serializer.issue_tokens)(user)
+
+
+class AsyncSignUpView(AircraftAsyncAPIView): # ASGI altında şifreyi hashleme havuzunda hashleyen kayıt endpointidir.
+    success_status = 201
+
+    async def handle(self, request, data: dict) -> dict:
+        serializer = CreateUserSerializer(data=data, context={"request": request})
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        password_hash = await hashing_pool.run(make_password, serializer.validated_data["password"])
+        await sync_to_async(serializer.save)(password_hash=password_hash)
+        return serializer.data
+
+
+class AircraftTokenRefreshView(TokenRefreshView): # Refresh token ile yeni access token alırken takım bilgilerini de güncelleyen endpointdir.
+    serializer_class = AircraftTokenRefreshSerializer
+
+
+class MyUserDetailView(ConditionalGetMixin, RetrieveUpdateAPIView): # Kullanıcı detayını veren endpointdir.
     serializer_class = UserSerializer
     permission_classes = [AircraftIsAuthenticated] # Bu endpointin çalışması için kullanıcının login olması gerekir.
 
     queryset = User.objects.all()
 
+    def get_etag(self, request): # Kullanıcı ya da takımı kaydedilene kadar cevap değişmez
+        user = request.user
+        return make_etag("me", user.pk, *get_versions(user_scope(user.pk), team_scope(user.team_id)))
+
     def get_object(self) -> User:
-        user = self.request.user
+        # request.user token bilgilerinden oluşturulmuş kısmi bir nesne olabilir, tüm alanları tek sorguda okuyoruz.
+        user = User.objects.select_related('team').get(pk=self.request.user.pk)
         self.check_object_permissions(self.request, user)
         return user
\ No newline at end of file
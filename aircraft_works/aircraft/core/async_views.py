@@ -0,0 +1,44 @@
+import json
+
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.settings import api_settings
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AircraftAsyncAPIView(View):
+    """
+        DRF async view desteklemediği için ASGI altında event loop'u bloklamadan çalışması gereken endpointler için temel sınıf.
+        Body JSON olarak okunur, handle() sonucu JSON olarak döner ve hatalar DRF endpointleri ile aynı exception handler'dan geçer;
+        böylece istemci senkron ve asenkron endpointlerden aynı formatta cevap alır.
+    """
+    http_method_names = ["post"]
+    success_status = 200
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = self.parse_body(request)
+            result = await self.handle(request, data)
+        except APIException as exc:
+            return self.handle_exception(request, exc)
+        return JsonResponse(result, status=self.success_status)
+
+    async def handle(self, request, data: dict) -> dict:
+        raise NotImplementedError
+
+    @staticmethod
+    def parse_body(request) -> dict:
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            raise ParseError()
+        if not isinstance(data, dict):
+            raise ParseError()
+        return data
+
+    def handle_exception(self, request, exc: APIException) -> JsonResponse:
+        response = api_settings.EXCEPTION_HANDLER(exc, {"view": self, "request": request})
+        return JsonResponse(response.data, status=response.status_code)
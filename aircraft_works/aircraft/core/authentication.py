@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from aircraft.accounts.models import Team, User
+from aircraft.core.user_cache import get_cached_user, get_versions
+
+"""
+    Token içine gömülen takım ve kullanıcı bilgileri (claim) ile veritabanına gitmeden kullanıcı oluşturma.
+    Login ve refresh sırasında kullanıcının takım id'si, takım tipi ve aktiflik durumu token'a yazılır.
+    Her istekte bu bilgilerden sadece id, is_active ve team alanları dolu bir User nesnesi oluşturulur;
+    permission kontrolleri ve parça/uçak kayıtlarındaki user foreign key'i için bu yeterlidir.
+    Diğer alanlara (email, isim vb.) erişilirse Django bu alanları veritabanından tembel (lazy) olarak okur.
+    Claim'ler yoksa (eski tokenlar), TOKEN_CLAIMS_MAX_AGE süresinden eskiyse ya da token alındıktan sonra kullanıcı veya takımı
+    kaydedildiyse (versiyonu değiştiyse) kullanıcı worker cache'inden ya da veritabanından okunur.
+"""
+
+TEAM_ID_CLAIM = "team_id"
+TEAM_TYPE_CLAIM = "team_type"
+IS_ACTIVE_CLAIM = "is_active"
+CLAIMS_ISSUED_AT_CLAIM = "claims_iat"
+AUTH_VERSION_CLAIM = "auth_version"
+
+USER_CLAIMS = (TEAM_ID_CLAIM, TEAM_TYPE_CLAIM, IS_ACTIVE_CLAIM, CLAIMS_ISSUED_AT_CLAIM, AUTH_VERSION_CLAIM)
+
+
+def add_user_claims(token, user: User):
+    """ Kullanıcının takım ve aktiflik bilgilerini token'a yazar. user.team select_related ile okunmuş olmalıdır. """
+    team = user.team
+    token[TEAM_ID_CLAIM] = team.id if team else None
+    token[TEAM_TYPE_CLAIM] = team.team_type if team else None
+    token[IS_ACTIVE_CLAIM] = user.is_active
+    token[CLAIMS_ISSUED_AT_CLAIM] = int(time.time())
+    token[AUTH_VERSION_CLAIM] = list(get_versions(user.id, user.team_id))
+    return token
+
+
+def has_fresh_claims(token) -> bool:
+    """ Token'daki claim'ler eksiksiz, TOKEN_CLAIMS_MAX_AGE süresinden yeni ve kullanıcı/takım versiyonları güncel ise True döner. """
+    if any(claim not in token.payload for claim in USER_CLAIMS):
+        return False
+    max_age = settings.TOKEN_CLAIMS_MAX_AGE.total_seconds()
+    if time.time() - token[CLAIMS_ISSUED_AT_CLAIM] > max_age:
+        return False
+    return list(get_versions(token[api_settings.USER_ID_CLAIM], token[TEAM_ID_CLAIM])) == token[AUTH_VERSION_CLAIM]
+
+
+def user_from_claims(token) -> User:
+    """ Veritabanına gitmeden token'daki claim'lerden kısmi (deferred) bir User ve Team nesnesi oluşturur. """
+    team_id = token[TEAM_ID_CLAIM]
+    # Model.from_db kısmi alanlarda değerleri modelin alan sırasına göre eşler, bu yüzden sıra User alanlarının sırası ile aynı olmalıdır.
+    user = User.from_db(
+        DEFAULT_DB_ALIAS,
+        ["id", "team_id", "is_active"],
+        [str(token[api_settings.USER_ID_CLAIM]), team_id, token[IS_ACTIVE_CLAIM]],
+    )
+    team = Team.from_db(DEFAULT_DB_ALIAS, ["id", "team_type"], [team_id, token[TEAM_TYPE_CLAIM]]) if team_id else None
+    User._meta.get_field("team").set_cached_value(user, team)
+    return user
+
+
+class AircraftJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token) -> User:
+        if api_settings.USER_ID_CLAIM not in validated_token.payload:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if not has_fresh_claims(validated_token):
+            return self.get_user_from_db(validated_token)
+
+        if not validated_token[IS_ACTIVE_CLAIM]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user_from_claims(validated_token)
+
+    def get_user_from_db(self, validated_token) -> User:
+        # Claim'ler kullanılamıyorsa simplejwt'nin yaptığı gibi kullanıcıyı okuyoruz; takım aynı sorguda alınır ve sonuç worker cache'inde tutulur.
+        try:
+            user = get_cached_user(validated_token[api_settings.USER_ID_CLAIM])
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
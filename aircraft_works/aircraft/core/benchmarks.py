@@ -0,0 +1,45 @@
+import statistics
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+"""
+    Management komutlarındaki benchmarklar için ortak ölçüm yardımcıları.
+"""
+
+
+def measure(func, repeat: int = 5, warmup: int = 1) -> dict:
+    """ func'ı warmup kadar ısındırıp repeat kez çalıştırır ve süreleri milisaniye cinsinden döner. """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def measure_queries_and_memory(func) -> dict:
+    """ func'ı bir kez çalıştırıp çalıştırdığı SQL sorgusu sayısını ve tracemalloc ile ölçülen en yüksek bellek kullanımını döner. """
+    with CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+        try:
+            func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"queries": len(queries), "peak_bytes": peak_bytes}
@@ -0,0 +1,102 @@
+import hashlib
+
+from django.db import transaction
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+
+from aircraft.core.helpers import generate_unique_id
+from aircraft.core.models import EtagVersion
+
+"""
+    GET endpointleri için ETag ve koşullu GET (If-None-Match -> 304 Not Modified).
+    Her veri kapsamının (ör. bir parça tipinin envanteri, uçak listesi) EtagVersion tablosunda bir versiyonu vardır ve kapsamdaki veri
+    değiştiğinde bump_versions ile yeni, benzersiz bir değere ayarlanır. ETag bu versiyonlardan ve isteğin query string'inden hesaplanır;
+    böylece 304 cevabı için tek bir küçük sorgu çalışır, parça/uçak tabloları okunmaz ve serializer çalışmaz.
+    Versiyonlar veritabanında tutulduğu için tüm worker'lar bir değişikliği hemen görür ve versiyonlar kaybolmaz.
+    Kimlik doğrulama ve yetki kontrolleri ETag karşılaştırmasından önce çalışır.
+"""
+
+USERS_SCOPE = "users" # Herhangi bir kullanıcı ya da takım değiştiğinde değişir (parça listesi kullanıcı bilgilerini içeriyor).
+EMPTY_VERSION = 0 # Henüz hiç değişmemiş kapsamların versiyonu. Satırlar silinmediği için bir kapsam bu değere geri dönmez.
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def team_scope(team_id) -> str:
+    return f"team:{team_id}"
+
+
+def bump_versions(*scopes):
+    """
+        Kapsamların versiyonunu transaction commit olduktan sonra değiştirir; versiyon satırı yazan transaction boyunca kilitlenmediği için
+        paralel yazmalar birbirini beklemez. Commit ile bump arasında hesaplanan bir ETag en kötü durumda sonraki istekte gereksiz bir 200'e yol açar.
+    """
+    scopes = sorted(set(scopes)) # Satırlar hep aynı sırada kilitlenir, paralel bump'lar deadlock oluşturmaz.
+    if not scopes:
+        return
+
+    def bump():
+        EtagVersion.objects.bulk_create(
+            [EtagVersion(scope=scope, version=int(generate_unique_id())) for scope in scopes],
+            update_conflicts=True, unique_fields=["scope"], update_fields=["version"],
+        )
+
+    transaction.on_commit(bump)
+
+
+def get_versions(*scopes) -> list:
+    versions = dict(EtagVersion.objects.filter(scope__in=scopes).values_list("scope", "version"))
+    return [versions.get(scope, EMPTY_VERSION) for scope in scopes]
+
+
+def make_etag(*parts) -> str:
+    return 'W/"{}"'.format(hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest())
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # GET için zayıf karşılaştırma yapılır, W/ öneki dikkate alınmaz.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in parse_etags(if_none_match))
+
+
+class NotModified(APIException):
+    status_code = HTTP_304_NOT_MODIFIED
+    default_detail = ""
+    default_code = "not_modified"
+
+
+class ConditionalGetMixin:
+    """
+        DRF view'lerine ETag desteği ekler. View get_etag() metodunu tanımlar; None dönerse ETag kullanılmaz.
+        ETag initial() içinde kimlik doğrulama ve yetki kontrollerinden sonra hesaplanır ve eşleşirse handler hiç çalıştırılmadan 304 döner.
+    """
+    def get_etag(self, request):
+        raise NotImplementedError
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.get_etag(request) if request.method == "GET" else None
+        if self.etag and etag_matches(request.META.get("HTTP_IF_NONE_MATCH", ""), self.etag):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "etag", None)
+        if etag and response.status_code in (200, 304):
+            response["ETag"] = etag
+            # Cevap kullanıcının takımına göre değiştiği için ara cache'ler Authorization'a göre ayırmalı.
+            patch_vary_headers(response, ("Authorization",))
+        return response
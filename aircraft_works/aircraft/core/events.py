@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from rest_framework.exceptions import APIException
+from rest_framework.status import HTTP_501_NOT_IMPLEMENTED, HTTP_503_SERVICE_UNAVAILABLE
+
+from aircraft.core.helpers import generate_unique_id
+from aircraft.core.user_cache import get_versions
+
+"""
+    Değişiklik olaylarının Server-Sent Events (SSE) ile istemcilere dağıtılması.
+    Yazan taraf publish() çağırır; olaylar transaction commit olduktan sonra tek bir Postgres NOTIFY ile EVENTS_CHANNEL kanalına
+    gönderilir, rollback olan transactionların olayları hiç gönderilmez. Her worker processte tek bir EventHub vardır ve hub'ın tek bir
+    dinleyici thread'i ayrı bir veritabanı bağlantısı ile kanalı LISTEN eder. Gelen olaylar bir kez SSE formatına çevrilir ve event loop'a
+    tek bir çağrı ile verilir, orada takım filtresinden geçip her istemcinin kuyruğuna eklenir. Böylece hangi worker'da yazılırsa yazılsın
+    olay tüm worker'lardaki istemcilere ulaşır ve yüzlerce istemci için worker başına tek bir veritabanı bağlantısı kullanılır.
+    Kuyruğu dolan (yavaş) istemcinin kuyruğu boşaltılıp "resync" olayı gönderilir; istemci bu olayda verileri baştan okumalıdır.
+    Son EVENTS_HISTORY_SIZE olay bellekte tutulur, yeniden bağlanan istemciye Last-Event-ID'den sonraki olaylar tekrar gönderilir.
+"""
+
+logger = logging.getLogger("aircraft.events")
+
+RESYNC = "resync"
+ALL_TEAMS = None
+NOTIFY_PAYLOAD_LIMIT = 7900 # Postgres NOTIFY payload'ı 8000 byte'tan kısa olmalı.
+TICKET_SALT = "aircraft.core.events"
+
+
+class EventStreamUnavailable(APIException):
+    status_code = HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Olay akışı sadece ASGI sunucusu ile kullanılabilir."
+    default_code = "event_stream_unavailable"
+
+
+class EventStreamFull(APIException):
+    status_code = HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Bağlı istemci sayısı sınıra ulaştı, lütfen biraz sonra tekrar deneyin."
+    default_code = "event_stream_full"
+
+
+def publish(events: list):
+    """ events: [(olay tipi, olayı alacak takım tipleri ya da ALL_TEAMS, veri)]. Olaylar transaction commit olduktan sonra gönderilir. """
+    if not settings.EVENTS_ENABLED or not events:
+        return
+    # robust=True: NOTIFY başarısız olursa commit edilmiş isteğin cevabı bozulmaz, hata loglanır.
+    transaction.on_commit(lambda: _notify(events), robust=True)
+
+
+def _notify(events: list):
+    payload = json.dumps(
+        [{"id": generate_unique_id(), "type": event_type, "teams": teams, "data": data} for event_type, teams, data in events],
+        separators=(",", ":"),
+    )
+    if len(payload) > NOTIFY_PAYLOAD_LIMIT:
+        payload = json.dumps([{"id": generate_unique_id(), "type": RESYNC, "teams": ALL_TEAMS, "data": {}}])
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [settings.EVENTS_CHANNEL, payload])
+
+
+def format_event(event_id, event_type: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def make_ticket(user) -> str:
+    """
+        EventSource header gönderemediği için akış, access token yerine sadece akışta geçerli imzalı bir bilet ile açılır.
+        Bilete kullanıcı ve takımın auth versiyonları yazılır; akış açılırken güncel versiyonlarla karşılaştırılır (ticket_is_current).
+    """
+    return signing.dumps({
+        "user": str(user.pk),
+        "team_id": user.team_id,
+        "team": user.team.team_type if user.team else None,
+        "auth_version": list(get_versions(user.pk, user.team_id)),
+    }, salt=TICKET_SALT)
+
+
+def read_ticket(ticket: str) -> dict | None:
+    try:
+        return signing.loads(ticket, salt=TICKET_SALT, max_age=settings.EVENTS_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
+
+def ticket_is_current(ticket: dict) -> bool:
+    """
+        Bilet alındıktan sonra kullanıcı ya da takımı kaydedildiyse (pasife alma, takım değişikliği) bilet geçersizdir; böylece eski
+        takımın olayları bilet süresi dolana kadar gönderilmeye devam etmez. Frontend reddedilen akış için yeni bilet alır.
+    """
+    if "auth_version" not in ticket:
+        return False
+    return list(get_versions(ticket["user"], ticket["team_id"])) == ticket["auth_version"]
+
+
+class Subscription:
+    def __init__(self, team_type: str, loop):
+        self.team_type = team_type
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+
+    def offer(self, frame: str):
+        # Event loop thread'inde çalışır.
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event(generate_unique_id(), RESYNC, {}))
+
+
+class EventHub:
+    def __init__(self):
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # Fork sonrası dinleyici thread çocuk processe geçmez, çocuk kendi dinleyicisini ilk istemcide başlatır.
+        self._lock = threading.Lock()
+        self._subscribers = {} # event loop -> abonelikler
+        self._history = deque(maxlen=settings.EVENTS_HISTORY_SIZE)
+        self._listener = None
+        self._listening = threading.Event()
+        self._stop = threading.Event()
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def subscribe(self, team_type: str, last_event_id: str = None) -> tuple:
+        """
+            Event loop içinden çağrılır ve (abonelik, tekrar gönderilecek olaylar) döner. Abonelik ve geçmişin okunması aynı lock altında
+            yapıldığı için bir olay ya geçmişte ya da kuyrukta bulunur, iki kez gönderilmez. last_event_id geçmişte yoksa
+            (çok eski ya da dinleyici yeniden başlamış) olaylar yerine None döner ve istemciye resync gönderilmelidir.
+        """
+        subscription = Subscription(team_type, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(subscription.loop, set()).add(subscription)
+            if self._listener is None:
+                self._stop.clear()
+                self._listener = threading.Thread(target=self._listen, name="aircraft-events", daemon=True)
+                self._listener.start()
+            replay = self._replay(last_event_id, team_type) if last_event_id else []
+        return subscription, replay
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.loop, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscribers.pop(subscription.loop, None)
+
+    def _replay(self, last_event_id: str, team_type: str) -> list | None:
+        history = list(self._history)
+        for index, (event_id, _, _) in enumerate(history):
+            if event_id == last_event_id:
+                return [frame for _, teams, frame in history[index + 1:] if teams is ALL_TEAMS or team_type in teams]
+        return None
+
+    def dispatch(self, payload: str):
+        """ Dinleyici thread'inde gelen NOTIFY payload'ını tüm event loop'lardaki abonelere dağıtır. """
+        events = [(event["id"], event["teams"], format_event(event["id"], event["type"], event["data"])) for event in json.loads(payload)]
+        with self._lock:
+            self._history.extend(events)
+            targets = [(loop, tuple(subscriptions)) for loop, subscriptions in self._subscribers.items()]
+        for loop, subscriptions in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, subscriptions, events)
+            except RuntimeError: # event loop kapanmış
+                with self._lock:
+                    self._subscribers.pop(loop, None)
+
+    @staticmethod
+    def _deliver(subscriptions: tuple, events: list):
+        for subscription in subscriptions:
+            for _, teams, frame in events:
+                if teams is ALL_TEAMS or subscription.team_type in teams:
+                    subscription.offer(frame)
+
+    def _listen(self):
+        reconnecting = False
+        while not self._stop.is_set():
+            database = connections.create_connection(DEFAULT_DB_ALIAS)
+            try:
+                database.ensure_connection()
+                database.connection.execute(f"LISTEN {database.ops.quote_name(settings.EVENTS_CHANNEL)}")
+                self._listening.set()
+                if reconnecting:
+                    # Bağlantı koptuğu sürede gelen olaylar kaçırıldı, istemciler verileri baştan okumalı.
+                    self.dispatch(json.dumps([{"id": generate_unique_id(), "type": RESYNC, "teams": ALL_TEAMS, "data": {}}]))
+                while not self._stop.is_set():
+                    for notify in database.connection.notifies(timeout=1.0):
+                        self.dispatch(notify.payload)
+            except Exception:
+                logger.exception("Event listener connection failed")
+                self._listening.clear()
+                reconnecting = True
+                self._stop.wait(settings.EVENTS_RECONNECT_DELAY)
+            finally:
+                database.close()
+        self._listening.clear()
+
+    def wait_until_listening(self, timeout: float) -> bool:
+        return self._listening.wait(timeout)
+
+    def stop(self):
+        """ Dinleyici thread'ini durdurur (testler için). Sonraki abonelikte yeniden başlatılır. """
+        with self._lock:
+            listener, self._listener = self._listener, None
+        self._stop.set()
+        if listener is not None:
+            listener.join()
+
+
+hub = EventHub()
@@ -1,4 +1,5 @@
-from django.db.models.fields import CharField
+from django.core import validators
+from django.db.models.fields import BigIntegerField, CharField
 
 from aircraft.core.helpers import generate_unique_id
 
@@ -10,3 +11,29 @@ class AircraftPrimaryKeyField(CharField): # Custom oluşturduğumuz field CharFi
         kwargs["editable"] = False # Alanın editlenmesini yani düzenlenmesini engelliyoruz çünkü db'de bulunan id'ler yani pk'lar değiştirilemez.
         kwargs["max_length"] = 64 # Bu alanın max uzunluğunu 64 karakter olarak ayarlıyoruz.
         super().__init__(*args, **kwargs)
+
+
+class AircraftBigIntegerPrimaryKeyField(BigIntegerField):
+    """
+        AircraftPrimaryKeyField'ın veritabanında 64 bitlik tam sayı (bigint) olarak saklanan versiyonu.
+        Index'ler ve foreign key'ler sabit 8 byte olur, karşılaştırmalar sayısal yapılır ve sıralama sayısal sıraya uyar.
+        Python tarafında değer eskisi gibi ondalık string olarak tutulur; böylece API cevapları, JWT claim'leri ve
+        2^53 üzerindeki sayıları kaybeden JavaScript istemcileri için id formatı değişmez.
+    """
+    def __init__(self, *args, **kwargs):
+        kwargs["primary_key"] = True
+        kwargs["default"] = generate_unique_id
+        kwargs["editable"] = False
+        super().__init__(*args, **kwargs)
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else str(value)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        return None if value is None else str(value)
+
+    def run_validators(self, value):
+        # Aralık validatorleri sayı beklediği için string id'yi sayıya çevirip doğruluyoruz.
+        super().run_validators(int(value) if value not in validators.EMPTY_VALUES else value)
+
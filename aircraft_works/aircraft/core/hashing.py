@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework.exceptions import APIException
+from rest_framework.status import HTTP_503_SERVICE_UNAVAILABLE
+
+"""
+    Şifre hashleme gibi CPU yoğun işleri istek thread'i yerine sınırlı bir thread havuzunda çalıştırır.
+    Django'nun PBKDF2 hasher'ı hashlib.pbkdf2_hmac kullanır ve bu fonksiyon hesaplama sırasında GIL'i bıraktığı için
+    thread havuzu birden fazla çekirdeği kullanabilir; process havuzuna göre veri kopyalama maliyeti de yoktur.
+    Havuzda çalışan ve bekleyen iş sayısı PASSWORD_HASHING_WORKERS + PASSWORD_HASHING_QUEUE_LIMIT ile sınırlıdır,
+    sınır aşılırsa istek bekletilmeden 503 ile reddedilir.
+"""
+
+
+class HashingPoolBusy(APIException):
+    status_code = HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Sunucu şu anda çok yoğun, lütfen biraz sonra tekrar deneyin."
+    default_code = "hashing_pool_busy"
+
+
+class HashingPool:
+    def __init__(self, workers: int = None, queue_limit: int = None):
+        self._workers = workers
+        self._queue_limit = queue_limit
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Havuz ilk kullanımda oluşturulur; böylece ayarlar okunmadan ve hashleme kullanılmayan processlerde thread açılmaz.
+        with self._lock:
+            if self._executor is None:
+                workers = self._workers or settings.PASSWORD_HASHING_WORKERS
+                queue_limit = self._queue_limit if self._queue_limit is not None else settings.PASSWORD_HASHING_QUEUE_LIMIT
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+                self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, func, *args, **kwargs):
+        """ func'ı havuzda çalıştırır ve sonucunu bekler. Havuz ve kuyruk doluysa HashingPoolBusy fırlatır. """
+        self._ensure_started()
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+            return await asyncio.wrap_future(future)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._slots = None
+
+
+hashing_pool = HashingPool()
@@ -0,0 +1,219 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+"""
+    Snowflake benzeri 63 bitlik id üreticisi.
+    | 42 bit milisaniye (unix epoch) | 10 bit worker id | 11 bit sıra numarası |
+    Zaman damgası eski generate_unique_id ile aynı bit pozisyonunda olduğu için yeni id'ler eski id'lerden her zaman büyüktür.
+    Aynı milisaniyede üretilen id'ler sıra numarası ile artar, böylece bir process içinde id'ler her zaman artan sıradadır.
+    Worker id process başına sabittir ve Postgres advisory lock ile alınır; lock'u tutan process yaşadığı sürece başka bir process
+    (aynı ya da farklı makinede) aynı worker id'yi alamaz, bu yüzden farklı processler aynı milisaniyede aynı id'yi üretemez.
+    Bir worker id başka bir processe geçtiğinde eski sahibinin ürettiği id'lerle çakışmamak için:
+    - Sıra numaraları biten allocator saatin en fazla MAX_AHEAD_MILLIS önüne geçer, daha ilerisi için saatin yetişmesini bekler.
+    - Lock'u bırakan allocator saati son kullandığı milisaniyeyi geçene kadar bekler.
+    - Lock'u yeni alan allocator ilk id'den önce CLAIM_GRACE_MILLIS bekler.
+    - Lock'u tutan bağlantı en fazla CLAIM_CHECK_INTERVAL_MILLIS'te bir kontrol edilir; kopmuşsa yeni bir worker id alınır.
+      CLAIM_GRACE_MILLIS, kontrol aralığı ile MAX_AHEAD_MILLIS'in toplamından büyük olduğu için bağlantısı kopan process'in
+      kopmayı fark etmeden ürettiği id'ler, aynı worker id'yi yeni alan process'in id'lerinden her zaman eskidir.
+"""
+
+TIMESTAMP_BITS = 42
+WORKER_BITS = 10
+SEQUENCE_BITS = 11
+
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+WORKER_SHIFT = SEQUENCE_BITS
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+MAX_AHEAD_MILLIS = 10
+CLAIM_CHECK_INTERVAL_MILLIS = 100
+CLAIM_GRACE_MILLIS = CLAIM_CHECK_INTERVAL_MILLIS + MAX_AHEAD_MILLIS + 50
+
+# pg_try_advisory_lock(classid, objid) çağrısındaki sabit classid; objid olarak worker id kullanılır.
+WORKER_LOCK_CLASS_ID = 0x49440000
+
+logger = logging.getLogger("aircraft.ids")
+
+
+def _current_millis() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _sleep_millis(millis: int):
+    time.sleep(millis / 1000)
+
+
+def _running_command() -> str | None:
+    # manage.py ya da django-admin ile çalışan yönetim komutunun adı; gunicorn/uvicorn gibi sunucu processlerinde None döner.
+    if os.path.basename(sys.argv[0]) in ("manage.py", "django-admin") and len(sys.argv) > 1:
+        return sys.argv[1]
+    return None
+
+
+def claim_worker_id(start: int = None) -> tuple:
+    """
+        0-1023 arasından advisory lock'u alınabilen ilk worker id'yi seçer ve (worker_id, bağlantı) döner.
+        Aramaya process id'sinden başlanır, böylece aynı makinedeki processler genelde ilk denemede boş bir id bulur.
+        Lock bu bağlantıya aittir ve bağlantı açık kaldığı sürece tutulur; process ölünce Postgres lock'u kendisi bırakır.
+        Bağlantı Django'nun istek sonunda kapattığı bağlantılardan ayrıdır.
+    """
+    start = os.getpid() if start is None else start
+    connection = connections.create_connection(DEFAULT_DB_ALIAS)
+    with connection.cursor() as cursor:
+        for offset in range(MAX_WORKER_ID + 1):
+            worker_id = (start + offset) & MAX_WORKER_ID
+            cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [WORKER_LOCK_CLASS_ID, worker_id])
+            if cursor.fetchone()[0]:
+                return worker_id, connection
+    connection.close()
+    raise RuntimeError(f"Boşta worker id kalmadı, {MAX_WORKER_ID + 1} worker id'nin hepsi başka processler tarafından kullanılıyor.")
+
+
+def configured_worker_id() -> int | None:
+    """ ID_WORKER_ID (AIRCRAFT_ID_WORKER_ID) ayarı verilmişse onu döner; verilmemişse worker id advisory lock ile alınmalıdır. """
+    if settings.ID_WORKER_ID is None:
+        return None
+    worker_id = int(settings.ID_WORKER_ID)
+    if not 0 <= worker_id <= MAX_WORKER_ID:
+        raise ValueError(f"ID_WORKER_ID 0 ile {MAX_WORKER_ID} arasında olmalıdır.")
+    return worker_id
+
+
+class IdAllocator:
+    def __init__(self, worker_id: int = None, clock=_current_millis, sleep=_sleep_millis):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._fixed_worker_id = worker_id is not None
+        self._worker_id = worker_id
+        self._claim_connection = None
+        self._claim_checked_at = 0
+        self._last_millis = -1
+        self._sequence = 0
+
+    @property
+    def worker_id(self) -> int:
+        with self._lock:
+            return self._ensure_worker_id()
+
+    def _ensure_worker_id(self) -> int:
+        # Worker id ilk id üretiminde alınır; import sırasında (migrate, collectstatic vb.) veritabanına gidilmez.
+        if self._claim_connection is not None:
+            self._check_claim()
+        if self._worker_id is None:
+            configured = configured_worker_id()
+            if configured is not None:
+                self._worker_id = configured
+            else:
+                try:
+                    self._worker_id, self._claim_connection = claim_worker_id()
+                except DatabaseError:
+                    if _running_command() not in settings.ID_UNCLAIMED_COMMANDS:
+                        raise
+                    return self._unclaimed_worker_id()
+                self._claim_checked_at = self._clock()
+                # Bu worker id'yi az önce bırakan (ya da bağlantısı kopan) process'in ürettiği id'ler geride kalsın.
+                self._wait_until(self._clock() + CLAIM_GRACE_MILLIS)
+        return self._worker_id
+
+    def _unclaimed_worker_id(self) -> int:
+        """
+            Veritabanına bağlanılamadığında sadece satır yazmayan yönetim komutlarında (ID_UNCLAIMED_COMMANDS) kullanılan, process id'sinden
+            türetilen ve çakışma garantisi olmayan worker id. Django system check'leri model örneği oluşturup id ürettiği için bu komutlar
+            veritabanı olmadan da çalışabilsin diye vardır. Değer saklanmaz, sonraki id'de lock tekrar denenir.
+        """
+        logger.warning("Worker id için veritabanına bağlanılamadı, process id'sinden türetilen geçici değer kullanılıyor.")
+        return os.getpid() & MAX_WORKER_ID
+
+    def _check_claim(self):
+        # Lock'u tutan bağlantı koparsa lock Postgres tarafından sessizce bırakılır; kopmuşsa worker id'yi yeniden alıyoruz.
+        if self._clock() - self._claim_checked_at < CLAIM_CHECK_INTERVAL_MILLIS:
+            return
+        if self._claim_connection.is_usable():
+            self._claim_checked_at = self._clock()
+            return
+        logger.warning("Worker id lock'unu tutan bağlantı koptu, yeni bir worker id alınıyor.")
+        self._drop_claim()
+
+    def _drop_claim(self):
+        try:
+            self._claim_connection.close()
+        except DatabaseError:
+            pass
+        self._claim_connection = None
+        self._worker_id = None
+
+    def _wait_until(self, millis: int):
+        while self._clock() < millis:
+            self._sleep(millis - self._clock())
+
+    def release(self):
+        """ Advisory lock'u bırakır, bir sonraki id üretiminde yeni bir worker id alınır. """
+        with self._lock:
+            # Saat son kullanılan milisaniyeyi geçmeden worker id'yi bırakırsak yeni sahibi aynı id'leri üretebilir.
+            self._wait_until(self._last_millis + 1)
+            if self._claim_connection is not None:
+                self._drop_claim()
+            if not self._fixed_worker_id:
+                self._worker_id = None
+
+    def _reset_after_fork(self):
+        # Fork edilen process parent ile aynı durumu ve lock'u tutan bağlantıyı miras alır. Bağlantı parent'a ait olduğu için
+        # kapatılmadan bırakılır (psycopg başka processte açılmış bağlantıyı kapatmaz), çocuk ilk id'de kendi worker id'sini alır.
+        self._lock = threading.Lock()
+        if not self._fixed_worker_id:
+            self._claim_connection = None
+            self._worker_id = None
+
+    def _reserve_block(self, count: int) -> tuple:
+        """
+            Aynı milisaniye içinde en fazla `count` adet ardışık sıra numarası ayırır ve (milisaniye, ilk_sıra, adet) döner.
+            Sıra numaraları biterse ya da saat geri giderse bir sonraki milisaniyeyi kullanır; böylece id'ler hiçbir zaman azalmaz.
+            Bir sonraki milisaniye saatin MAX_AHEAD_MILLIS'ten daha önündeyse saatin yetişmesi beklenir.
+        """
+        now = self._clock()
+        if now > self._last_millis:
+            self._last_millis = now
+            self._sequence = 0
+        elif self._sequence > MAX_SEQUENCE:
+            self._wait_until(self._last_millis + 1 - MAX_AHEAD_MILLIS)
+            self._last_millis += 1
+            self._sequence = 0
+        first = self._sequence
+        taken = min(count, MAX_SEQUENCE + 1 - first)
+        self._sequence += taken
+        return self._last_millis, first, taken
+
+    def _compose(self, millis: int, worker_id: int, sequence: int) -> int:
+        return (millis << TIMESTAMP_SHIFT) | (worker_id << WORKER_SHIFT) | sequence
+
+    def next_id(self) -> str:
+        with self._lock:
+            worker_id = self._ensure_worker_id()
+            millis, sequence, _ = self._reserve_block(1)
+            return str(self._compose(millis, worker_id, sequence))
+
+    def reserve(self, count: int) -> list:
+        """ `count` adet artan sırada id'yi tek bir kilit ile ayırır. bulk_create ile oluşturulan kayıtlara id vermek için kullanılır. """
+        ids = []
+        with self._lock:
+            while len(ids) < count:
+                # Büyük ayırmalar saatin yetişmesini beklediği için lock'u tutan bağlantı her blokta tekrar kontrol edilir.
+                worker_id = self._ensure_worker_id()
+                millis, first, taken = self._reserve_block(count - len(ids))
+                base = self._compose(millis, worker_id, 0)
+                ids.extend(str(base | sequence) for sequence in range(first, first + taken))
+        return ids
+
+
+allocator = IdAllocator()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=allocator._reset_after_fork)
@@ -0,0 +1,63 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from aircraft.accounts.models import Team, User
+from aircraft.accounts.serializers import AircraftObtainPairSerializer
+from aircraft.core.user_cache import user_cache
+from aircraft.plane_management.views import PartView
+
+
+class Command(BaseCommand):
+    help = 'Measures requests/sec of an authenticated part list call with and without the user cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Number of requests per scenario')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        results = {}
+        # Benchmark kullanıcısı ve takımı transaction sonunda geri alınır, veritabanında iz bırakmaz.
+        with transaction.atomic():
+            team = Team.objects.filter(team_type=Team.Team.WING).first() or Team.objects.create(team_type=Team.Team.WING)
+            user = User.objects.create(email=f'benchmark-{time.time_ns()}@example.com', team=team, is_active=True)
+            plain_token = str(RefreshToken.for_user(user).access_token)
+            claims_token = str(AircraftObtainPairSerializer.get_token(user).access_token)
+
+            scenarios = {
+                'database': (plain_token, False),
+                'user_cache': (plain_token, True),
+                'token_claims': (claims_token, True),
+            }
+            for name, (token, cache_enabled) in scenarios.items():
+                user_cache.clear()
+                with override_settings(USER_CACHE_ENABLED=cache_enabled):
+                    results[name] = self._run(token, count)
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(f"{name}: {result['requests_per_second']} req/s ({result['ms_per_request']} ms/request)")
+
+    def _run(self, token: str, count: int) -> dict:
+        factory = APIRequestFactory()
+        view = PartView.as_view()
+        start = time.perf_counter()
+        for _ in range(count):
+            response = view(factory.get('/api/v1/parts/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+            response.render()
+            if response.status_code != 200:
+                raise RuntimeError(f'Unexpected status code {response.status_code}')
+        elapsed = time.perf_counter() - start
+        return {
+            'requests_per_second': round(count / elapsed, 1),
+            'ms_per_request': round(elapsed * 1000 / count, 3),
+        }
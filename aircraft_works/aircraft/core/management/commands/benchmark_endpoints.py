@@ -0,0 +1,174 @@
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from aircraft.accounts.models import User
+from aircraft.accounts.serializers import AircraftObtainPairSerializer
+from aircraft.accounts.teams import team_registry
+from aircraft.core.benchmarks import format_bytes, measure, measure_queries_and_memory
+from aircraft.core.user_cache import user_cache
+from aircraft.plane_management.management.commands.generate_dataset import EMAIL_TEMPLATE
+from aircraft.plane_management.inventory import record_parts_created
+from aircraft.plane_management.models import Part, PartInventory, PartUsage, PlaneAssembly
+
+PASSWORD = "benchmark-password"
+# Milisaniyenin altındaki süre farkları ölçüm gürültüsü sayılır ve regresyon olarak işaretlenmez.
+TIME_NOISE_MS = 1.0
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the hot endpoints against generated datasets of several sizes and records wall time, SQL query count '
+        'and peak memory. Results can be written as a JSON baseline and compared with an earlier baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000', help='Comma separated part counts of the generated datasets')
+        parser.add_argument('--repeat', type=int, default=5, help='How many times each endpoint is timed')
+        parser.add_argument('--create-quantity', type=int, default=10000, help='Quantity sent to the part create endpoint')
+        parser.add_argument('--seed', type=int, default=42, help='Seed passed to generate_dataset')
+        parser.add_argument('--output', help='Write the results to this JSON baseline file')
+        parser.add_argument('--compare', help='Compare the results with this JSON baseline file and fail on regressions')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Allowed relative increase of wall time and peak memory before it is reported as a regression')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be a comma separated list of integers')
+        baseline = self._load(options['compare']) if options['compare'] else None
+
+        results = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'repeat': options['repeat'],
+                'create_quantity': options['create_quantity'],
+                'seed': options['seed'],
+            },
+            'sizes': {},
+        }
+        for size in sizes:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{size} parts'))
+            results['sizes'][str(size)] = self._benchmark_size(size, options)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = self._compare(baseline, results, options['threshold'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regressions compared to {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS(f'No regressions compared to {options["compare"]}'))
+
+    def _load(self, path: str) -> dict:
+        try:
+            with open(path, encoding='utf-8') as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read baseline {path}: {exc}')
+
+    def _benchmark_size(self, size: int, options: dict) -> dict:
+        results = {}
+        # Geri alınan önceki çalıştırmaların bıraktığı ölü satırlar ölçümleri yavaşlatıyor, bu yüzden tablolar önce temizleniyor.
+        # VACUUM transaction içinde çalışamadığı için (ör. testlerde) atlanır.
+        if not connection.in_atomic_block:
+            with connection.cursor() as cursor:
+                for model in (Part, PlaneAssembly, PartUsage, PartInventory, User):
+                    cursor.execute(f'VACUUM ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+        # Veri seti ve endpointlerin yaptığı değişiklikler transaction sonunda geri alınır, veritabanında iz bırakmaz.
+        # Bu yüzden on_commit ile çalışan işler (ör. cache versiyonlarının ikinci kez yazılması) ölçüme dahil değildir.
+        with transaction.atomic():
+            call_command('generate_dataset', '--parts', str(size), '--users-per-team', '2', '--seed', str(options['seed']), '--reset',
+                         stdout=StringIO())
+            for name, func in self._endpoints(options['create_quantity'], runs=options['repeat'] + 2).items():
+                result = measure(func, repeat=options['repeat'])
+                result.update(measure_queries_and_memory(func))
+                results[name] = result
+                self.stdout.write(
+                    f"  {name}: median {result['median_ms']} ms (min {result['min_ms']} ms), "
+                    f"{result['queries']} queries, peak {format_bytes(result['peak_bytes'])}"
+                )
+            transaction.set_rollback(True)
+
+        # Geri alınan satırlara ait process içi cache kayıtları bir sonraki boyutu etkilemesin diye temizleniyor.
+        cache.clear()
+        user_cache.clear()
+        team_registry.clear()
+        return results
+
+    def _endpoints(self, create_quantity: int, runs: int) -> dict:
+        client = APIClient()
+        wing_user = User.objects.get(email=EMAIL_TEMPLATE.format(team='wing', index=0))
+        assembly_user = User.objects.get(email=EMAIL_TEMPLATE.format(team='assembly', index=0))
+        # Dataset kullanıcıları daha önce başka bir şifre ile oluşturulmuş olabilir, login için şifre burada belirleniyor.
+        wing_user.set_password(PASSWORD)
+        wing_user.save(update_fields=['password'])
+        wing_auth = f'Bearer {AircraftObtainPairSerializer.get_token(wing_user).access_token}'
+        assembly_auth = f'Bearer {AircraftObtainPairSerializer.get_token(assembly_user).access_token}'
+        part_id = Part.objects.filter(part_type=Part.PartTypes.WING, used_in_plane=False).values_list('id', flat=True).first()
+        plane = {
+            'plane_type': 'AKINCI',
+            'parts_used': [
+                {'part_type': part_type, 'plane_type': 'AKINCI', 'amount': 2 if part_type == Part.PartTypes.WING else 1}
+                for part_type in Part.PartTypes.values
+            ],
+        }
+        # Küçük veri setlerinde boşta parça kalmayabilir; uçak üretimi her çalıştırmada (ısınma ve bellek ölçümü dahil) parça tükettiği için yedek parça ekleniyor.
+        for part_used in plane['parts_used']:
+            amount = part_used['amount'] * runs
+            Part.objects.bulk_create([Part(part_type=part_used['part_type'], plane_type='AKINCI') for _ in range(amount)])
+            record_parts_created(part_used['part_type'], 'AKINCI', amount)
+
+        def call(method: str, url: str, expected_status: int, data=None, auth=None):
+            def func():
+                headers = {'HTTP_AUTHORIZATION': auth} if auth else {}
+                response = getattr(client, method)(url, data, format='json', **headers)
+                if response.status_code != expected_status:
+                    raise CommandError(f'{method.upper()} {url} returned {response.status_code}: {getattr(response, "data", "")}')
+            return func
+
+        return {
+            'part_list': call('get', reverse('part_management'), 200, auth=wing_auth),
+            'part_detail': call('get', reverse('part_details', kwargs={'pk': part_id}), 200, auth=wing_auth),
+            'part_create': call('post', reverse('part_management'), 201, auth=wing_auth,
+                                data={'part_type': 'WING', 'plane_type': 'TB2', 'quantity': create_quantity}),
+            'plane_assembly': call('post', reverse('plane_management'), 201, data=plane, auth=assembly_auth),
+            'plane_list': call('get', reverse('plane_management'), 200, auth=assembly_auth),
+            'part_score': call('get', reverse('parts_score'), 200, auth=wing_auth),
+            'login': call('post', reverse('login'), 200, data={'email': wing_user.email, 'password': PASSWORD}),
+            'users_me': call('get', reverse('my_user_details'), 200, auth=wing_auth),
+        }
+
+    def _compare(self, baseline: dict, results: dict, threshold: float) -> list:
+        """ Baseline'da da bulunan her boyut ve endpoint için süre, sorgu sayısı ve bellek artışlarını listeler. """
+        regressions = []
+        for size, endpoints in results['sizes'].items():
+            for name, current in endpoints.items():
+                previous = baseline.get('sizes', {}).get(size, {}).get(name)
+                if previous is None:
+                    continue
+                label = f'{name} @ {size} parts'
+                # Süre karşılaştırmasında en düşük süre kullanılır; median'a göre makinedeki diğer yükten daha az etkilenir.
+                if current['min_ms'] > previous['min_ms'] * (1 + threshold) and current['min_ms'] - previous['min_ms'] > TIME_NOISE_MS:
+                    regressions.append(f"{label}: min {previous['min_ms']} ms -> {current['min_ms']} ms")
+                # Sorgu sayısı deterministiktir, her artış regresyondur (ör. N+1).
+                if current['queries'] > previous['queries']:
+                    regressions.append(f"{label}: {previous['queries']} -> {current['queries']} queries")
+                if current['peak_bytes'] > previous['peak_bytes'] * (1 + threshold):
+                    regressions.append(
+                        f"{label}: peak memory {format_bytes(previous['peak_bytes'])} -> {format_bytes(current['peak_bytes'])}"
+                    )
+        return regressions
@@ -0,0 +1,43 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from aircraft.core.benchmarks import measure
+from aircraft.core.ids import IdAllocator
+
+
+def legacy_generate_unique_id() -> str:
+    # Karşılaştırma için eski generate_unique_id: her çağrıda yeni SystemRandom ve 21 random bit.
+    unique_id = int(time.time() * 1000) << 21
+    unique_id |= random.SystemRandom().getrandbits(21)
+    return str(unique_id)
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark of the legacy random id generator and the snowflake id allocator'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000, help='Number of ids generated per run')
+        parser.add_argument('--repeat', type=int, default=5, help='How many times each generator is timed')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        count, repeat = options['count'], options['repeat']
+        allocator = IdAllocator(worker_id=0)
+
+        results = {
+            'legacy': measure(lambda: [legacy_generate_unique_id() for _ in range(count)], repeat=repeat),
+            'next_id': measure(lambda: [allocator.next_id() for _ in range(count)], repeat=repeat),
+            'reserve': measure(lambda: allocator.reserve(count), repeat=repeat),
+        }
+        for result in results.values():
+            result['ns_per_id'] = round(result['median_ms'] * 1_000_000 / count, 1)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, result in results.items():
+            self.stdout.write(f"{name}: median {result['median_ms']} ms for {count} ids ({result['ns_per_id']} ns/id)")
@@ -0,0 +1,116 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from aircraft.core.benchmarks import format_bytes, measure
+
+# Eski şema (varchar(64) + Django'nun varchar alanlar için eklediği _like index'leri) ve yeni bigint şema.
+KEY_TYPES = {
+    "varchar": {"column": "varchar(64)", "cast": "::text", "like_indexes": True},
+    "bigint": {"column": "bigint", "cast": "", "like_indexes": False},
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares index size and join speed of varchar(64) and bigint primary keys on a seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--parts', type=int, default=200000, help='Number of parts to seed')
+        parser.add_argument('--parts-per-plane', type=int, default=5, help='Number of parts used by each plane')
+        parser.add_argument('--repeat', type=int, default=5, help='How many times each query is timed')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        results = {}
+        # Tablolar geçici oluşturuluyor ve transaction sonunda geri alınıyor, veritabanında iz bırakmıyor.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                self._seed_ids(cursor, options['parts'], options['parts_per_plane'])
+                for name, key_type in KEY_TYPES.items():
+                    results[name] = self._benchmark(cursor, name, key_type, options['repeat'])
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name} keys'))
+            self.stdout.write(f"  index size: {format_bytes(result['index_bytes'])}")
+            for query, timing in result['queries'].items():
+                self.stdout.write(f"  {query}: median {timing['median_ms']} ms (min {timing['min_ms']} ms)")
+
+        old, new = results['varchar'], results['bigint']
+        self.stdout.write(self.style.SUCCESS(
+            f"bigint indexes are {old['index_bytes'] / max(new['index_bytes'], 1):.2f}x smaller, "
+            f"join is {old['queries']['join']['median_ms'] / max(new['queries']['join']['median_ms'], 0.001):.2f}x faster"
+        ))
+
+    def _seed_ids(self, cursor, parts, parts_per_plane):
+        # Her iki şema da aynı id'leri kullansın diye id'ler generate_unique_id ile aynı formatta (milisaniye << 21 | random) bir kez üretiliyor.
+        # Çakışma olmaması için her satıra farklı bir milisaniye veriliyor.
+        cursor.execute(
+            "CREATE TEMPORARY TABLE bench_ids ON COMMIT DROP AS "
+            "SELECT n, (((floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint + n) << 21) "
+            "| floor(random() * 2097152)::bigint) AS id, "
+            "(ARRAY['WING', 'BODY', 'TAIL', 'AVIONICS'])[1 + n %% 4] AS part_type "
+            "FROM generate_series(1, %s) AS n",
+            [parts],
+        )
+        cursor.execute(
+            "CREATE TEMPORARY TABLE bench_plane_ids ON COMMIT DROP AS "
+            "SELECT n, (SELECT max(id) FROM bench_ids) + (n::bigint << 21) AS id FROM generate_series(1, %s) AS n",
+            [max(parts // parts_per_plane, 1)],
+        )
+        self.parts_per_plane = parts_per_plane
+
+    def _benchmark(self, cursor, name, key_type, repeat):
+        column, cast = key_type['column'], key_type['cast']
+        part, plane, usage = f'bench_{name}_part', f'bench_{name}_plane', f'bench_{name}_usage'
+        cursor.execute(f"CREATE TEMPORARY TABLE {part} (id {column} PRIMARY KEY, part_type varchar(10) NOT NULL) ON COMMIT DROP")
+        cursor.execute(f"CREATE TEMPORARY TABLE {plane} (id {column} PRIMARY KEY) ON COMMIT DROP")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {usage} (id bigserial PRIMARY KEY, part_id {column} NOT NULL, plane_id {column} NOT NULL) "
+            f"ON COMMIT DROP"
+        )
+        cursor.execute(f"INSERT INTO {part} SELECT id{cast}, part_type FROM bench_ids")
+        cursor.execute(f"INSERT INTO {plane} SELECT id{cast} FROM bench_plane_ids")
+        cursor.execute(
+            f"INSERT INTO {usage} (part_id, plane_id) SELECT parts.id{cast}, planes.id{cast} "
+            f"FROM bench_ids parts JOIN bench_plane_ids planes ON planes.n = 1 + (parts.n - 1) / %s",
+            [self.parts_per_plane],
+        )
+        cursor.execute(f"CREATE INDEX ON {usage} (part_id)")
+        cursor.execute(f"CREATE INDEX ON {usage} (plane_id)")
+        if key_type['like_indexes']:
+            for table, field in ((part, 'id'), (plane, 'id'), (usage, 'part_id'), (usage, 'plane_id')):
+                cursor.execute(f"CREATE INDEX ON {table} ({field} varchar_pattern_ops)")
+        for table in (part, plane, usage):
+            cursor.execute(f"ANALYZE {table}")
+
+        cursor.execute(
+            "SELECT coalesce(sum(pg_indexes_size(relid)), 0) FROM pg_catalog.pg_statio_all_tables "
+            "WHERE relname IN (%s, %s, %s) AND schemaname LIKE 'pg_temp%%'",
+            [part, plane, usage],
+        )
+        index_bytes = int(cursor.fetchone()[0])
+
+        cursor.execute(f"SELECT id FROM {plane} ORDER BY id LIMIT 1 OFFSET (SELECT count(*) / 2 FROM {plane})")
+        plane_id = cursor.fetchone()[0]
+
+        def run(sql, params=None):
+            return lambda: (cursor.execute(sql, params), cursor.fetchall())
+
+        queries = {
+            'join': measure(run(
+                f"SELECT count(*) FROM {usage} u JOIN {part} p ON p.id = u.part_id "
+                f"JOIN {plane} pl ON pl.id = u.plane_id WHERE p.part_type = 'AVIONICS'"
+            ), repeat=repeat),
+            'plane_parts_lookup': measure(run(
+                f"SELECT p.id FROM {usage} u JOIN {part} p ON p.id = u.part_id WHERE u.plane_id = %s",
+                [plane_id],
+            ), repeat=repeat),
+            'ordered_page': measure(run(f"SELECT id FROM {part} ORDER BY id DESC LIMIT 100"), repeat=repeat),
+        }
+        return {'index_bytes': index_bytes, 'queries': queries}
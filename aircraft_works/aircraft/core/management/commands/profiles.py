@@ -0,0 +1,60 @@
+import pstats
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from aircraft.core.benchmarks import format_bytes
+from aircraft.core.middleware import profile_token
+
+
+class Command(BaseCommand):
+    help = (
+        'Lists the request profiles stored in PROFILING_DIR, summarises one profile or all profiles of a view by top functions, '
+        'or prints a signed header value that makes the profiling middleware profile a request'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Profile file names to summarise')
+        parser.add_argument('--view', help='Summarise all profiles whose file name contains this view name (e.g. part-management)')
+        parser.add_argument('--sort', default='cumulative', choices=['cumulative', 'tottime', 'ncalls'], help='Sort order of the summary')
+        parser.add_argument('--limit', type=int, default=25, help='Number of functions shown in the summary')
+        parser.add_argument('--token', action='store_true', help=f'Print a signed value for the {settings.PROFILING_HEADER} header')
+
+    def handle(self, *args, **options):
+        if options['token']:
+            self.stdout.write(f'{settings.PROFILING_HEADER}: {profile_token()}')
+            return
+
+        directory = Path(settings.PROFILING_DIR)
+        profiles = sorted(directory.glob('*.prof'), reverse=True) if directory.is_dir() else []
+        if options['view']:
+            paths = [path for path in profiles if options['view'] in path.name]
+        else:
+            paths = [directory / name for name in options['names']]
+
+        if not paths:
+            if options['view'] or options['names']:
+                raise CommandError('No matching profiles found')
+            self._list(profiles)
+            return
+
+        missing = [str(path) for path in paths if not path.is_file()]
+        if missing:
+            raise CommandError(f'Profiles not found: {", ".join(missing)}')
+        # Birden fazla profil verildiğinde istatistikler toplanır; böylece tek bir istekteki gürültü yerine görünümün genel sıcak noktaları görülür.
+        output = StringIO()
+        stats = pstats.Stats(str(paths[0]), stream=output)
+        for path in paths[1:]:
+            stats.add(str(path))
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{len(paths)} profiles, sorted by {options["sort"]}'))
+        stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
+        self.stdout.write(output.getvalue())
+
+    def _list(self, profiles: list):
+        if not profiles:
+            self.stdout.write(f'No profiles in {settings.PROFILING_DIR}')
+            return
+        for path in profiles:
+            self.stdout.write(f'{path.name}  {format_bytes(path.stat().st_size)}')
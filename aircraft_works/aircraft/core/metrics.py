@@ -0,0 +1,175 @@
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+"""
+    Çok processli (WSGI worker'ları) çalışan uygulama için metrik kaydı.
+    Her process kendi sayaçlarını bellekte tutar ve en fazla METRICS_FLUSH_INTERVAL saniyede bir METRICS_DIR altındaki
+    kendine ait dosyaya (metrics-<pid>-<başlangıç>.json) yazar. Dosya geçici dosyaya yazılıp os.replace ile değiştirildiği için
+    okuyan taraf yarım yazılmış dosya görmez. Dosya arka plandaki flush thread'inde yazılır, inc/observe sadece belleği günceller;
+    böylece satır kilitleri tutan bir transaction içinden (ör. parça ayırma) çağrıldıklarında dosya I/O'su beklenmez. /api/v1/metrics/ isteği dizindeki tüm dosyaları okuyup toplar ve Prometheus text
+    formatında döner; böylece hangi worker'a gelirse gelsin tüm worker'ların toplamı görülür.
+    Kapanan processlerin dosyaları silinmez, sayaçlar toplam olarak artmaya devam eder. METRICS_DIR deploy sırasında temizlenmelidir.
+    Fork sonrası çocuk processin sayaçları sıfırlanır; aksi halde ebeveynin değerleri iki kez sayılırdı.
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+# metrik adı -> (tip, açıklama, histogram bucket'ları)
+METRICS = {
+    "aircraft_http_requests_total": (COUNTER, "HTTP requests by route, method and status code.", None),
+    "aircraft_http_request_duration_seconds": (HISTOGRAM, "HTTP request latency by route and method.", LATENCY_BUCKETS),
+    "aircraft_db_queries_total": (COUNTER, "SQL queries executed by route.", None),
+    "aircraft_db_query_duration_seconds_total": (COUNTER, "Time spent in SQL queries by route.", None),
+    "aircraft_db_queries_per_request": (HISTOGRAM, "SQL queries per request by route.", QUERY_COUNT_BUCKETS),
+    "aircraft_allocation_duration_seconds": (HISTOGRAM, "Duration of plane part allocation by plane type.", LATENCY_BUCKETS),
+    "aircraft_allocation_lock_seconds": (HISTOGRAM, "Duration of locking free parts by part type.", LATENCY_BUCKETS),
+    "aircraft_parts_allocated_total": (COUNTER, "Parts allocated to committed planes by plane and part type.", None),
+    "aircraft_allocation_failures_total": (COUNTER, "Allocations that failed because of missing parts by plane and part type.", None),
+}
+
+
+logger = logging.getLogger("aircraft.metrics")
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+
+    def _reset(self):
+        # Lock da yeniden oluşturulur; fork sırasında başka bir thread'in tuttuğu lock çocukta hiç bırakılmazdı.
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._flusher = None
+        self._values = {}
+        self._path = None
+        self._last_flush = 0.0
+
+    def inc(self, name: str, labels: dict, value: float = 1):
+        if not settings.METRICS_ENABLED:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name: str, labels: dict, value: float):
+        """ Histograma bir ölçüm ekler. Bucket'lar kümülatif tutulur (le değerine eşit ya da küçük ölçümlerin sayısı). """
+        if not settings.METRICS_ENABLED:
+            return
+        buckets = METRICS[name][2]
+        with self._lock:
+            for bucket in buckets:
+                key = _key(f"{name}_bucket", {**labels, "le": str(bucket)})
+                self._values[key] = self._values.get(key, 0) + int(value <= bucket)
+            for suffix, amount in (("_bucket", 1), ("_count", 1), ("_sum", value)):
+                key = _key(f"{name}{suffix}", {**labels, "le": "+Inf"} if suffix == "_bucket" else labels)
+                self._values[key] = self._values.get(key, 0) + amount
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            self._start_flusher()
+            self._flush_requested.set()
+
+    def _start_flusher(self):
+        # Thread ilk flush isteğinde başlatılır; fork sonrası çocukta thread olmadığı için _reset ile yeniden başlatılır.
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, args=(self._flush_requested,), name="metrics-flush", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self, requested: threading.Event):
+        while True:
+            requested.wait()
+            requested.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Metrikler dosyaya yazılamadı.")
+
+    def flush(self):
+        """ Bu processin değerlerini kendi dosyasına yazar. """
+        # Flush thread'i ile collect/atexit aynı anda yazarsa eski değerler yenilerinin üzerine yazılmasın.
+        with self._write_lock:
+            with self._lock:
+                if not self._values:
+                    return
+                samples = [[name, list(labels), value] for (name, labels), value in self._values.items()]
+                self._last_flush = time.monotonic()
+            directory = Path(settings.METRICS_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            if self._path is None or self._path.parent != directory:
+                self._path = directory / f"metrics-{os.getpid()}-{time.time_ns()}.json"
+            descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(samples, file)
+            os.replace(temporary, self._path)
+
+    def collect(self) -> dict:
+        """ Dizindeki tüm processlerin dosyalarını okuyup {(ad, etiketler): toplam} döner. """
+        self.flush()
+        totals = {}
+        directory = Path(settings.METRICS_DIR)
+        for path in directory.glob("metrics-*.json") if directory.is_dir() else []:
+            try:
+                with open(path) as file:
+                    samples = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in samples:
+                key = (name, tuple(tuple(label) for label in labels))
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _sort_key(item) -> tuple:
+    # Histogram bucket'ları le etiketine göre sayısal sıralanır.
+    (series, labels), _ = item
+    le = dict(labels).get("le")
+    return series, tuple(label for label in labels if label[0] != "le"), float(le) if le else 0.0
+
+
+def render_prometheus(totals: dict) -> str:
+    """ Toplanmış değerleri Prometheus text (0.0.4) formatına çevirir. """
+    lines = []
+    for name, (metric_type, help_text, _) in METRICS.items():
+        series_names = (f"{name}_bucket", f"{name}_sum", f"{name}_count") if metric_type == HISTOGRAM else (name,)
+        samples = sorted(((key, value) for key, value in totals.items() if key[0] in series_names), key=_sort_key)
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(f"{series}{_format_labels(labels)} {value}" for (series, labels), value in samples)
+    return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
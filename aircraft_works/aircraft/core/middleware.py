@@ -0,0 +1,187 @@
+import cProfile
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from aircraft.core.metrics import metrics
+
+"""
+    İstek başına ölçüm middleware'leri.
+    QueryInstrumentationMiddleware: Örneklenen isteklerde çalışan sorgular connection.execute_wrapper ile sayılır ve süreleri toplanır. Sonuç Server-Timing header'ı
+    ile istemciye (tarayıcının network sekmesinde görünür) ve tek satırlık JSON log olarak aircraft.sql logger'ına yazılır.
+    Parametreleri hariç aynı SQL'in bir istekte SQL_INSTRUMENTATION_REPEAT_THRESHOLD kez ya da daha fazla çalışması
+    N+1 belirtisi sayılır ve log satırı WARNING seviyesinde yazılır.
+    Örneklenmeyen isteklerde wrapper kurulmaz, maliyeti tek bir random() çağrısıdır.
+    MetricsMiddleware: Her isteğin route, method ve status bazında sayısını, süresini ve sorgu sayısını aircraft.core.metrics'e yazar.
+    ProfilingMiddleware: Seçilen istekleri cProfile ile profilleyip dosyaya yazar, profiller "manage.py profiles" ile incelenir.
+"""
+
+logger = logging.getLogger("aircraft.sql")
+SQL_LOG_LENGTH = 200
+PROFILE_TOKEN_SALT = "aircraft.core.profiling"
+PROFILE_TOKEN_VALUE = "profile"
+
+
+class QueryRecorder:
+    def __init__(self, track_statements: bool = True):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter() if track_statements else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if self.statements is not None:
+                self.statements[sql] += 1
+
+    def repeated(self, threshold: int) -> list:
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not settings.SQL_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = settings.SQL_INSTRUMENTATION_SAMPLE_RATE
+        self.path_prefix = settings.SQL_INSTRUMENTATION_PATH_PREFIX
+        self.repeat_threshold = settings.SQL_INSTRUMENTATION_REPEAT_THRESHOLD
+
+    def __call__(self, request):
+        if not request.path.startswith(self.path_prefix) or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+
+        timings = [f'db;dur={db_ms:.1f};desc="{recorder.count} queries"', f"app;dur={total_ms - db_ms:.1f}", f"total;dur={total_ms:.1f}"]
+        if response.has_header("Server-Timing"):
+            timings.insert(0, response["Server-Timing"])
+        response["Server-Timing"] = ", ".join(timings)
+
+        repeated = recorder.repeated(self.repeat_threshold)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_ms": round(db_ms, 1),
+            "total_ms": round(total_ms, 1),
+            "repeated": [{"sql": sql[:SQL_LOG_LENGTH], "count": count} for sql, count in repeated],
+        }
+        logger.log(logging.WARNING if repeated else logging.INFO, json.dumps(record, ensure_ascii=False))
+        return response
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder(track_statements=False)
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        # Etiket olarak URL yerine route kalıbı (ör. api/v1/parts/<int:pk>/) kullanılır, böylece seri sayısı sınırlı kalır.
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        metrics.inc("aircraft_http_requests_total", {"route": route, "method": request.method, "status": str(response.status_code)})
+        metrics.observe("aircraft_http_request_duration_seconds", {"route": route, "method": request.method}, duration)
+        metrics.inc("aircraft_db_queries_total", {"route": route}, recorder.count)
+        metrics.inc("aircraft_db_query_duration_seconds_total", {"route": route}, recorder.duration)
+        metrics.observe("aircraft_db_queries_per_request", {"route": route}, recorder.count)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+        İstekleri cProfile ile profiller ve sonucu PROFILING_DIR altına "<zaman>_<method>-<view>_<süre>ms.prof" adıyla yazar.
+        Profil, geçerli imzalı bir PROFILING_HEADER header'ı gönderen isteklerde ya da PROFILING_SAMPLE_RATE oranında rastgele
+        seçilen isteklerde alınır. İmzalı değer "manage.py profiles --token" ile üretilir. Aynı anda processte tek bir istek profillenir.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.path_prefix = settings.PROFILING_PATH_PREFIX
+        self.header = "HTTP_" + settings.PROFILING_HEADER.upper().replace("-", "_")
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if not request.path.startswith(self.path_prefix) or not self._should_profile(request):
+            return self.get_response(request)
+        if not self.lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration_ms = (time.perf_counter() - start) * 1000
+        finally:
+            self.lock.release()
+
+        match = request.resolver_match
+        name = save_profile(profiler, match.view_name if match else "unknown", request.method, duration_ms)
+        response["X-Profile-Id"] = name
+        return response
+
+    def _should_profile(self, request) -> bool:
+        token = request.META.get(self.header)
+        if token:
+            return is_valid_profile_token(token)
+        return random.random() < self.sample_rate
+
+
+def profile_token() -> str:
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign(PROFILE_TOKEN_VALUE)
+
+
+def is_valid_profile_token(token: str) -> bool:
+    try:
+        return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE) == PROFILE_TOKEN_VALUE
+    except signing.BadSignature:
+        return False
+
+
+def save_profile(profiler, view_name: str, method: str, duration_ms: float) -> str:
+    """ Profili dosyaya yazar, PROFILING_MAX_FILES sayısını aşan en eski profilleri siler ve dosya adını döner. """
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_view_name = re.sub(r"[^A-Za-z0-9]+", "-", view_name).strip("-") or "unknown"
+    name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{method.lower()}-{safe_view_name}_{duration_ms:.0f}ms.prof"
+    profiler.dump_stats(directory / name)
+
+    profiles = sorted(directory.glob("*.prof"))
+    for old in profiles[:max(0, len(profiles) - settings.PROFILING_MAX_FILES)]:
+        old.unlink(missing_ok=True)
+    return name
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.8 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="EtagVersion",
+            fields=[
+                (
+                    "scope",
+                    models.CharField(
+                        max_length=100,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Kapsam",
+                    ),
+                ),
+                ("version", models.BigIntegerField(verbose_name="Versiyon")),
+            ],
+            options={
+                "verbose_name": "Etag Version",
+                "verbose_name_plural": "Etag Versions",
+            },
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.urls import reverse
 
-from aircraft.core.fields import AircraftPrimaryKeyField
+from aircraft.core.fields import AircraftBigIntegerPrimaryKeyField
 
 class AdminUtilsMixin(object): #Djangonun admin paneli için yazmışl olduğum mixindir. Admin panele model sınıfları için yardımcı işlevler ekleyebilmemi sağlıyor. Örneğin admin panelde bir nesnenin detay sayfasına yönlendirmek için bu mixin kullanılır.
     @classmethod
@@ -18,7 +18,7 @@ class AdminUtilsMixin(object): #Djangonun admin paneli için yazmışl olduğum
 
 
 class BaseModelMixin(models.Model): # Her modelde ortak bulunan fieldları her defasında yazmamk için bir mixin oluşturdum model sınıflarına bu mixini vererek modellere id, created_at ve updated_at değerlerini sağlamış oluyorum.
-    id = AircraftPrimaryKeyField() # Custom yazmış olduğum fieldı kullanıyorum 
+    id = AircraftBigIntegerPrimaryKeyField() # Custom yazmış olduğum fieldı kullanıyorum, id'ler veritabanında bigint olarak tutuluyor.
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created Date") # Objenin database'e kaydedilme tarihini tutuyot.
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated Date") # Objenin database'de en son güncellenme tarihini tutuyor.
 
@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class EtagVersion(models.Model): # ETag'lerin bağlı olduğu veri kapsamlarının (ör. bir parça tipinin envanteri, uçak listesi) versiyonlarını tutar.
+    scope = models.CharField(max_length=100, primary_key=True, verbose_name="Kapsam")
+    version = models.BigIntegerField(verbose_name="Versiyon") # Kapsamdaki veri her değiştiğinde benzersiz yeni bir değere ayarlanır.
+
+    class Meta:
+        verbose_name = "Etag Version"
+        verbose_name_plural = "Etag Versions"
+
+    def __str__(self):
+        return f"{self.scope}: {self.version}"
@@ -1,4 +1,9 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
 
 """
     Bu sınıf, Django'nun sayfalama (pagination) işlemini özelleştirir. Frontend, API sorgusunda
@@ -10,4 +15,60 @@ from rest_framework.pagination import PageNumberPagination
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10 # Varsayılan sayfa boyutu 10 olarak ayarlanmıştır. Bu, her sayfada gösterilecek öğe sayısını belirler.
     page_size_query_param = "page_size" # URL parametresi olarak 'page_size' ile frontend sayfa boyutunu değiştirebilir.
-    max_page_size = 10000 # Sayfa boyutunun üst sınırıdır. Frontend bu sınırdan büyük bir sayfa boyutu isteyemez.
\ No newline at end of file
+    max_page_size = 10000 # Sayfa boyutunun üst sınırıdır. Frontend bu sınırdan büyük bir sayfa boyutu isteyemez.
+
+
+"""
+    Parça ve uçak listeleri için keyset (cursor) sayfalama. OFFSET ve COUNT(*) yerine son görülen kaydın
+    (created_at, id) değerinden devam edilir, bu yüzden sayfa maliyeti tablo büyüdükçe artmaz.
+    - next/previous: Opak (base64) cursor içeren linklerdir.
+    - with_count=true: Toplam sayı istenirse view'in get_pagination_count() metodu ya da kısa süre cache'lenen
+      bir COUNT(*) kullanılır. View'ler sayaç tablosu veya Postgres istatistiklerinden hesaplanan tahmini sayılar dönebilir.
+"""
+class AircraftCursorPagination(CursorPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100 # Cursor sayfalamada derin sayfalar ucuz olduğu için büyük sayfa boyutlarına gerek yok.
+    ordering = ("-created_at", "-id") # Snowflake id'ler zaman damgasıyla başladığı için aynı created_at'e sahip kayıtlar id ile sıralanır.
+    count_query_param = "with_count"
+    count_cache_timeout = 30
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes"):
+            self.count = self.get_count(queryset, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, view=None) -> int:
+        # Önce view'in daha ucuz bir sayım yolu olup olmadığına bakıyoruz (ör. envanter sayaçları).
+        if view is not None and hasattr(view, "get_pagination_count"):
+            count = view.get_pagination_count(queryset)
+            if count is not None:
+                return count
+        cache_key = "pagination_count:" + hashlib.md5(str(queryset.query).encode()).hexdigest()
+        return cache.get_or_set(cache_key, queryset.count, self.count_cache_timeout)
+
+    def get_paginated_response(self, data):
+        response = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            response["count"] = self.count
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"] = {"type": "integer", "example": 123}
+        return response_schema
+
+
+def estimate_table_count(model, minimum: int = 10000):
+    """
+        Postgres'in tablo istatistiklerinden (pg_class.reltuples) tahmini satır sayısını döner.
+        Küçük ya da hiç analiz edilmemiş tablolarda tahmin güvenilir olmadığı için None döner, bu durumda gerçek sayım yapılır.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < minimum:
+        return None
+    return row[0]
@@ -29,8 +29,8 @@ class IsNotAircraftAssemblyTeam(BasePermission): # Bu permission sistemem login
         if not self.has_permission(request, view):
             return False
 
-        # Kullanıcının takımı ile parçanın takımı aynı olmalı
-        return obj.user.team == request.user.team
+        # Kullanıcının takımı ile parçanın takımı aynı olmalı, id'ler karşılaştırıldığı için takım nesneleri yüklenmez.
+        return obj.user.team_id == request.user.team_id
 
 
 class IsAircraftWingTeam(BasePermission): # Bu permission sistemem login olmuş ve takımı kanat olan kullanıcılara izin verir.
@@ -97,5 +97,5 @@ class HasTeamAndNotAssembly(BasePermission):
         if not self.has_permission(request, view):
             return False
 
-        # Kullanıcının takımı ile parçanın takımı aynı olmalı
-        return obj.user.team == request.user.team
\ No newline at end of file
+        # Kullanıcının takımı ile parçanın takımı aynı olmalı, id'ler karşılaştırıldığı için takım nesneleri yüklenmez.
+        return obj.user.team_id == request.user.team_id
\ No newline at end of file
@@ -0,0 +1,10 @@
+from rest_framework.fields import CharField
+from rest_framework.serializers import ModelSerializer
+
+from aircraft.core.fields import AircraftBigIntegerPrimaryKeyField
+
+
+class AircraftModelSerializer(ModelSerializer):
+    # ModelSerializer BigIntegerField'ları IntegerField'a çevirip sayı döndüğü için id'ler API'de eskisi gibi string dönsün diye CharField kullanıyoruz.
+    # DRF'in global eşlemesi değiştirilmiyor, sadece bu sınıftan türeyen serializer'lar etkilenir.
+    serializer_field_mapping = {**ModelSerializer.serializer_field_mapping, AircraftBigIntegerPrimaryKeyField: CharField}
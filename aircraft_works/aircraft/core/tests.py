@@ -0,0 +1,450 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from aircraft.accounts.models import Team, User
+from aircraft.core.events import RESYNC, EventHub
+from aircraft.core.helpers import generate_unique_id, reserve_unique_ids
+from aircraft.core.ids import (
+    CLAIM_CHECK_INTERVAL_MILLIS, CLAIM_GRACE_MILLIS, MAX_AHEAD_MILLIS, MAX_SEQUENCE, MAX_WORKER_ID, TIMESTAMP_SHIFT, WORKER_SHIFT,
+    IdAllocator, allocator as global_allocator,
+)
+from aircraft.core.metrics import metrics
+from aircraft.core.middleware import QueryInstrumentationMiddleware, QueryRecorder, profile_token
+from aircraft.plane_management.models import Part
+
+
+def _generate_in_process(count: int) -> tuple:
+    # Fork edilen processte global allocator ile id üretir, worker id ve id'leri döner.
+    ids = reserve_unique_ids(count) + [generate_unique_id() for _ in range(count)]
+    worker_ids = {(int(unique_id) >> WORKER_SHIFT) & MAX_WORKER_ID for unique_id in ids}
+    return worker_ids, ids
+
+
+def _record_in_process(count: int) -> int:
+    # Fork edilen processte global metrik kaydına yazar ve processin dosyasına flush eder.
+    for _ in range(count):
+        metrics.inc("aircraft_http_requests_total", {"route": "test/", "method": "GET", "status": "200"})
+    metrics.flush()
+    return os.getpid()
+
+
+class IdAllocatorTests(SimpleTestCase):
+    def test_ids_are_unique_and_increasing_within_a_millisecond(self):
+        """Aynı milisaniyede üretilen id'ler sıra numarası ile artmalı"""
+        allocator = IdAllocator(worker_id=5, clock=lambda: 1000)
+
+        ids = [int(allocator.next_id()) for _ in range(10)]
+
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertTrue(all(unique_id >> TIMESTAMP_SHIFT == 1000 for unique_id in ids))
+        self.assertTrue(all((unique_id >> WORKER_SHIFT) & MAX_WORKER_ID == 5 for unique_id in ids))
+
+    def test_reserve_spills_into_next_millisecond(self):
+        """Sıra numarası biterse beklemeden bir sonraki milisaniyeye geçilmeli"""
+        allocator = IdAllocator(worker_id=1, clock=lambda: 1000)
+
+        ids = [int(unique_id) for unique_id in allocator.reserve(MAX_SEQUENCE * 3)]
+        after = int(allocator.next_id())
+
+        self.assertEqual(len(set(ids)), MAX_SEQUENCE * 3)
+        self.assertEqual(ids, sorted(ids))
+        self.assertLess(ids[-1], after)
+        self.assertEqual(ids[-1] >> TIMESTAMP_SHIFT, 1002)
+
+    def test_ids_do_not_go_back_when_clock_goes_back(self):
+        """Sistem saati geri gitse bile id'ler azalmamalı"""
+        now = [2000]
+        allocator = IdAllocator(worker_id=1, clock=lambda: now[0])
+        first = int(allocator.next_id())
+        now[0] = 1500
+
+        second = int(allocator.next_id())
+
+        self.assertGreater(second, first)
+
+    def test_reserve_waits_for_clock_beyond_max_ahead(self):
+        """Büyük ayırmalar saatin MAX_AHEAD_MILLIS'ten daha önüne geçmemeli, saatin yetişmesini beklemeli"""
+        now = [1000]
+        sleeps = []
+
+        def sleep(millis):
+            sleeps.append(millis)
+            now[0] += millis
+
+        allocator = IdAllocator(worker_id=1, clock=lambda: now[0], sleep=sleep)
+        ids = allocator.reserve((MAX_SEQUENCE + 1) * (MAX_AHEAD_MILLIS + 5))
+
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(sleeps)
+        self.assertLessEqual((int(ids[-1]) >> TIMESTAMP_SHIFT) - now[0], MAX_AHEAD_MILLIS)
+
+    def test_release_waits_until_clock_passes_last_used_millisecond(self):
+        """Worker id bırakılmadan önce saat son kullanılan milisaniyeyi geçmeli"""
+        now = [1000]
+        allocator = IdAllocator(clock=lambda: now[0], sleep=lambda millis: now.__setitem__(0, now[0] + millis))
+        with override_settings(ID_WORKER_ID="3"):
+            last = int(allocator.reserve(MAX_SEQUENCE * 3)[-1])
+
+        allocator.release()
+
+        self.assertGreater(now[0], last >> TIMESTAMP_SHIFT)
+
+    @override_settings(ID_WORKER_ID=None)
+    def test_dead_claim_connection_is_claimed_again(self):
+        """Lock'u tutan bağlantı koparsa id üretmeden önce yeni bir worker id alınmalı ve beklenmeli"""
+        now = [1000]
+        allocator = IdAllocator(clock=lambda: now[0], sleep=lambda millis: now.__setitem__(0, now[0] + millis))
+        dead, alive = mock.Mock(), mock.Mock()
+        dead.is_usable.return_value = False
+        with mock.patch("aircraft.core.ids.claim_worker_id", side_effect=[(3, dead), (4, alive)]):
+            first = int(allocator.next_id())
+            now[0] += CLAIM_CHECK_INTERVAL_MILLIS
+            second = int(allocator.next_id())
+
+        self.assertEqual((first >> WORKER_SHIFT) & MAX_WORKER_ID, 3)
+        self.assertEqual((second >> WORKER_SHIFT) & MAX_WORKER_ID, 4)
+        dead.close.assert_called_once()
+        self.assertGreaterEqual((second >> TIMESTAMP_SHIFT) - (first >> TIMESTAMP_SHIFT), CLAIM_CHECK_INTERVAL_MILLIS + CLAIM_GRACE_MILLIS)
+
+    @override_settings(ID_WORKER_ID=None, ID_UNCLAIMED_COMMANDS=["check"])
+    def test_unclaimed_worker_id_is_only_used_by_allowed_commands_and_not_kept(self):
+        """Veritabanına bağlanılamazsa geçici worker id sadece izin verilen komutlarda kullanılmalı ve saklanmamalı"""
+        allocator = IdAllocator()
+        with mock.patch("aircraft.core.ids.claim_worker_id", side_effect=DatabaseError) as claim:
+            with mock.patch("aircraft.core.ids._running_command", return_value="check"):
+                allocator.next_id()
+                allocator.next_id()
+            self.assertEqual(claim.call_count, 2)
+            self.assertIsNone(allocator._worker_id)
+
+            with mock.patch("aircraft.core.ids._running_command", return_value=None):
+                with self.assertRaises(DatabaseError):
+                    allocator.next_id()
+
+
+@override_settings(ID_WORKER_ID=None)
+class WorkerIdClaimTests(TestCase):
+    def test_processes_with_same_low_pid_bits_get_different_worker_ids(self):
+        """Pid'lerinin son 10 biti aynı olan (farklı container'lardaki) processler farklı worker id almalı"""
+        first, second = IdAllocator(), IdAllocator()
+        self.addCleanup(first.release)
+        self.addCleanup(second.release)
+
+        with mock.patch("aircraft.core.ids.os.getpid", return_value=7):
+            first_worker_id = first.worker_id
+        with mock.patch("aircraft.core.ids.os.getpid", return_value=7 + MAX_WORKER_ID + 1):
+            second_worker_id = second.worker_id
+
+        self.assertNotEqual(first_worker_id, second_worker_id)
+        self.assertNotEqual(first.next_id(), second.next_id())
+
+    def test_released_worker_id_can_be_claimed_again(self):
+        """Lock'u bırakılan worker id başka bir process tarafından tekrar alınabilmeli"""
+        first, second = IdAllocator(), IdAllocator()
+        self.addCleanup(second.release)
+        with mock.patch("aircraft.core.ids.os.getpid", return_value=42):
+            worker_id = first.worker_id
+            first.release()
+            self.assertEqual(second.worker_id, worker_id)
+
+    def test_configured_worker_id_skips_lock(self):
+        """ID_WORKER_ID (AIRCRAFT_ID_WORKER_ID) verilmişse veritabanına gitmeden bu değer kullanılmalı"""
+        allocator = IdAllocator()
+        with override_settings(ID_WORKER_ID="17"):
+            self.assertEqual(allocator.worker_id, 17)
+        self.assertIsNone(allocator._claim_connection)
+
+    def test_no_collisions_across_processes(self):
+        """Aynı anda id üreten processler farklı worker id kullanmalı ve çakışan id üretmemeli"""
+        # Testlerde kullanılan sabit worker id bırakılır, parent ve çocuklar advisory lock ile worker id alır.
+        global_allocator.release()
+        self.addCleanup(global_allocator.release)
+        generate_unique_id()  # Parent processteki allocator durumunun fork ile çocuklara geçtiği durumu test ediyoruz.
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=4) as pool:
+            results = pool.map(_generate_in_process, [20000] * 4)
+
+        worker_ids = [worker_id for worker_set, _ in results for worker_id in worker_set]
+        all_ids = [unique_id for _, ids in results for unique_id in ids]
+        self.assertEqual(len(worker_ids), 4)
+        self.assertEqual(len(set(worker_ids)), 4)
+        self.assertEqual(len(all_ids), len(set(all_ids)))
+
+
+class BenchmarkEndpointsTests(TestCase):
+    def test_baseline_is_written_and_query_regressions_are_reported(self):
+        """Sonuçlar baseline dosyasına yazılmalı, baseline'a göre artan sorgu sayısı regresyon olarak raporlanmalı"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark_endpoints', '--sizes', '200', '--repeat', '1', '--create-quantity', '10', '--output', path, stdout=StringIO())
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+
+            endpoints = baseline['sizes']['200']
+            self.assertEqual(set(endpoints), {'part_list', 'part_detail', 'part_create', 'plane_assembly', 'plane_list', 'part_score', 'login', 'users_me'})
+            self.assertTrue(all({'min_ms', 'median_ms', 'queries', 'peak_bytes'} <= set(result) for result in endpoints.values()))
+
+            # Süre ve bellek sınırları gevşek tutulup sadece sorgu sayısı düşürülüyor
+            for result in endpoints.values():
+                result['min_ms'] = result['peak_bytes'] = 10 ** 9
+            endpoints['part_list']['queries'] -= 1
+            with open(path, 'w') as baseline_file:
+                json.dump(baseline, baseline_file)
+
+            output = StringIO()
+            with self.assertRaises(CommandError):
+                call_command('benchmark_endpoints', '--sizes', '200', '--repeat', '1', '--create-quantity', '10', '--compare', path, stdout=output)
+            self.assertIn('part_list @ 200 parts', output.getvalue())
+            self.assertNotIn('part_detail @ 200 parts', output.getvalue())
+
+
+@override_settings(SQL_INSTRUMENTATION_ENABLED=True, SQL_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class QueryInstrumentationMiddlewareTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.team = Team.objects.create(team_type="WING")
+        self.user = User.objects.create(email="wing@example.com", team=self.team, is_active=True)
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_header_and_log_line(self):
+        """Ölçülen isteklerde sorgu sayısı ve DB süresi Server-Timing header'ında ve JSON log satırında olmalı"""
+        with self.assertLogs('aircraft.sql', level='INFO') as logs:
+            response = self.client.get(reverse('part_management'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+, total;dur=[\d.]+$')
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['method'], record['path'], record['status']), ('GET', reverse('part_management'), 200))
+        self.assertGreater(record['queries'], 0)
+        self.assertEqual(record['repeated'], [])
+
+    def test_repeated_queries_are_reported(self):
+        """Parametreleri hariç aynı SQL eşik kadar tekrar ederse N+1 olarak raporlanmalı"""
+        parts = [Part.objects.create(part_type="WING", plane_type="TB2", user=self.user) for _ in range(3)]
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for part in parts:
+                Part.objects.get(id=part.id)
+            Team.objects.count()
+
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual([count for _, count in recorder.repeated(3)], [3])
+        self.assertEqual(recorder.repeated(4), [])
+
+    @override_settings(SQL_INSTRUMENTATION_REPEAT_THRESHOLD=1)
+    def test_repeated_queries_are_logged_as_warning(self):
+        """N+1 bulunan isteklerin log satırı WARNING seviyesinde yazılmalı"""
+        with self.assertLogs('aircraft.sql', level='INFO') as logs:
+            self.client.get(reverse('part_management'))
+
+        self.assertEqual(logs.records[0].levelname, 'WARNING')
+        self.assertTrue(json.loads(logs.records[0].getMessage())['repeated'])
+
+    @override_settings(SQL_INSTRUMENTATION_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_measured(self):
+        """Örneklenmeyen isteklerde header eklenmemeli"""
+        self.assertFalse(self.client.get(reverse('part_management')).has_header('Server-Timing'))
+
+    @override_settings(SQL_INSTRUMENTATION_ENABLED=False)
+    def test_disabled_middleware_is_not_loaded(self):
+        """Kapalıyken middleware yüklenmemeli"""
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryInstrumentationMiddleware(lambda request: None)
+        self.assertFalse(self.client.get(reverse('part_management')).has_header('Server-Timing'))
+
+
+class ProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.team = Team.objects.create(team_type="WING")
+        self.user = User.objects.create(email="wing@example.com", team=self.team, is_active=True)
+        self.client.force_authenticate(user=self.user)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0.0, PROFILING_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_signed_header_profiles_request(self):
+        """İmzalı header gönderilen istek profillenmeli ve profil komut ile özetlenebilmeli"""
+        response = self.client.get(reverse('part_management'), HTTP_X_AIRCRAFT_PROFILE=profile_token())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        name = response['X-Profile-Id']
+        self.assertRegex(name, r'_get-part-management_\d+ms\.prof$')
+        self.assertEqual(os.listdir(self.directory), [name])
+
+        output = StringIO()
+        call_command('profiles', stdout=output)
+        self.assertIn(name, output.getvalue())
+        output = StringIO()
+        call_command('profiles', '--view', 'part-management', '--limit', '5', stdout=output)
+        self.assertIn('function calls', output.getvalue())
+
+    def test_invalid_or_missing_header_is_not_profiled(self):
+        """Geçersiz imzalı ya da header'sız istekler (örnekleme kapalıyken) profillenmemeli"""
+        self.assertFalse(self.client.get(reverse('part_management'), HTTP_X_AIRCRAFT_PROFILE='profile:bad').has_header('X-Profile-Id'))
+        self.assertFalse(self.client.get(reverse('part_management')).has_header('X-Profile-Id'))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    @override_settings(PROFILING_MAX_FILES=2)
+    def test_old_profiles_are_removed(self):
+        """Profil sayısı PROFILING_MAX_FILES'ı aşınca en eski profiller silinmeli"""
+        with self.settings(PROFILING_SAMPLE_RATE=1.0):
+            self.client = self.client_class()
+            self.client.force_authenticate(user=self.user)
+            names = [self.client.get(reverse('part_management'))['X-Profile-Id'] for _ in range(3)]
+
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted(names[1:]))
+
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(METRICS_ENABLED=True, METRICS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics._reset()
+        self.addCleanup(metrics._reset)
+
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.assembly_team = Team.objects.create(team_type="ASSEMBLY")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.assembly_user = User.objects.create(email="assembly@example.com", team=self.assembly_team, is_active=True)
+
+    def _scrape(self) -> str:
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_are_counted_per_route(self):
+        """İstekler route, method ve status bazında sayılmalı ve histogramlar tüm bucket'ları içermeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        for _ in range(2):
+            self.client.get(reverse('part_management'))
+        self.client.get(reverse('part_details', kwargs={'pk': '404'}))
+
+        body = self._scrape()
+        self.assertIn('aircraft_http_requests_total{method="GET",route="api/v1/parts/",status="200"} 2', body)
+        self.assertIn('aircraft_http_requests_total{method="GET",route="api/v1/parts/<int:pk>/",status="404"} 1', body)
+        self.assertIn('aircraft_http_request_duration_seconds_bucket{le="0.005",method="GET",route="api/v1/parts/"}', body)
+        self.assertIn('aircraft_http_request_duration_seconds_count{method="GET",route="api/v1/parts/"} 2', body)
+        self.assertRegex(body, r'aircraft_db_queries_total\{route="api/v1/parts/"\} [1-9]')
+
+    def test_allocation_metrics(self):
+        """Montajda kilit ve allocation süreleri ölçülmeli, ayrılan parçalar commit sonrası sayılmalı"""
+        for part_type in Part.PartTypes.values:
+            Part.objects.create(part_type=part_type, plane_type="TB2", user=self.wing_user)
+        self.client.force_authenticate(user=self.assembly_user)
+        data = {'plane_type': 'TB2', 'parts_used': [{'part_type': part_type, 'plane_type': 'TB2', 'amount': 1} for part_type in Part.PartTypes.values]}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('plane_management'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        body = self._scrape()
+        self.assertIn('aircraft_allocation_duration_seconds_count{plane_type="TB2"} 1', body)
+        self.assertIn('aircraft_allocation_lock_seconds_count{part_type="WING"} 1', body)
+        self.assertIn('aircraft_parts_allocated_total{part_type="AVIONICS",plane_type="TB2"} 1', body)
+
+    def test_recording_does_not_write_the_file_in_the_calling_thread(self):
+        """inc/observe dosyayı çağıran thread'de yazmamalı, dosya arka plandaki flush thread'inde yazılmalı"""
+        flushed = threading.Event()
+        flush_threads = []
+
+        def flush():
+            flush_threads.append(threading.current_thread().name)
+            flushed.set()
+
+        with self.settings(METRICS_FLUSH_INTERVAL=0), mock.patch.object(metrics, "flush", side_effect=flush):
+            metrics.inc("aircraft_allocation_failures_total", {"plane_type": "TB2", "part_type": "WING"})
+            self.assertTrue(flushed.wait(5))
+
+        self.assertEqual(flush_threads, ["metrics-flush"])
+
+    def test_values_of_all_processes_are_aggregated(self):
+        """Farklı processlerin yazdığı değerler toplanarak dönmeli"""
+        metrics.inc("aircraft_http_requests_total", {"route": "test/", "method": "GET", "status": "200"}, 5)
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=2) as pool:
+            pids = pool.map(_record_in_process, [10, 20])
+
+        self.assertNotIn(os.getpid(), pids)
+        self.assertIn('aircraft_http_requests_total{method="GET",route="test/",status="200"} 35', self._scrape())
+
+    def test_scrape_is_limited_to_allowed_ips(self):
+        """İzin verilen IP'ler dışından metrikler okunamamalı"""
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1').status_code, status.HTTP_403_FORBIDDEN)
+        with self.settings(METRICS_ENABLED=False):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EventHubTests(SimpleTestCase):
+    def setUp(self):
+        """Dinleyici thread'i başlatılmayan ayrı bir hub oluşturuyoruz, olaylar dispatch ile elle veriliyor"""
+        self.hub = EventHub()
+        patcher = mock.patch.object(self.hub, "_listen")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _payload(self, *events) -> str:
+        return json.dumps([{"id": event_id, "type": "part.created", "teams": teams, "data": {"id": event_id}} for event_id, teams in events])
+
+    async def _dispatch(self, payload: str):
+        # NOTIFY'lar dinleyici thread'inden geldiği için dispatch ayrı bir thread'de çağrılıyor.
+        await asyncio.to_thread(self.hub.dispatch, payload)
+        await asyncio.sleep(0)
+
+    async def test_events_are_delivered_by_team(self):
+        """Olaylar sadece hedef takımın istemcilerine gitmeli, ALL_TEAMS olayları herkese gitmeli"""
+        wing, _ = self.hub.subscribe("WING")
+        tail, _ = self.hub.subscribe("TAIL")
+        await self._dispatch(self._payload(("1", ["WING"]), ("2", None)))
+
+        frame = await asyncio.wait_for(wing.queue.get(), 1)
+        self.assertTrue(frame.startswith("id: 1\nevent: part.created\ndata: "))
+        self.assertTrue((await asyncio.wait_for(wing.queue.get(), 1)).startswith("id: 2\n"))
+        self.assertTrue((await asyncio.wait_for(tail.queue.get(), 1)).startswith("id: 2\n"))
+        self.assertTrue(tail.queue.empty())
+
+        self.hub.unsubscribe(wing)
+        self.hub.unsubscribe(tail)
+        self.assertEqual(self.hub.client_count, 0)
+
+    async def test_reconnecting_client_receives_missed_events(self):
+        """Last-Event-ID geçmişte varsa sonraki olaylar tekrar gönderilmeli, yoksa resync gerekmeli"""
+        await self._dispatch(self._payload(("1", ["WING"]), ("2", ["TAIL"]), ("3", ["WING"])))
+
+        _, replay = self.hub.subscribe("WING", last_event_id="1")
+        self.assertEqual([frame.split("\n")[0] for frame in replay], ["id: 3"])
+        _, replay = self.hub.subscribe("WING", last_event_id="unknown")
+        self.assertIsNone(replay)
+
+    async def test_slow_client_receives_resync(self):
+        """Kuyruğu dolan istemcinin kuyruğu boşaltılmalı ve tek bir resync olayı almalı"""
+        with override_settings(EVENTS_QUEUE_SIZE=2):
+            subscription, _ = self.hub.subscribe("WING")
+        await self._dispatch(self._payload(("1", ["WING"]), ("2", ["WING"]), ("3", ["WING"])))
+
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertIn(f"event: {RESYNC}\n", subscription.queue.get_nowait())
+
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from aircraft.core.helpers import generate_unique_id
+
+"""
+    Kimliği doğrulanmış kullanıcılar için worker (process) içi cache.
+    Kullanıcı ve takım satırları user id'ye göre sınırlı boyutlu (LRU) ve süreli (TTL) bir sözlükte tutulur.
+    Her kullanıcı ve takımın veritabanında bir auth_version değeri vardır; User.save ve Team.save bu değeri benzersiz yeni bir değere
+    ayarlar ve Django cache'ine yazar. Cache'teki kayıt okunurken versiyonlar karşılaştırılır, değişmişse kayıt atılır ve kullanıcı
+    veritabanından yeniden okunur. Versiyon cache'te yoksa (silinmiş, worker yeniden başlamış) veritabanından okunur; böylece
+    cache'in kaybolması eski bir token'ı ya da cache kaydını tekrar geçerli hale getiremez.
+    Versiyonlar cache'te AUTH_VERSION_CACHE_TIMEOUT saniye tutulur. CACHES workerlar arasında ortak değilse başka bir worker'da
+    yapılan pasife alma ve takım değişiklikleri en geç bu süre sonunda etkili olur; ortak cache'te hemen etkili olur.
+"""
+
+USER_VERSION_KEY = "auth_user_version:{}"
+TEAM_VERSION_KEY = "auth_team_version:{}"
+
+
+def new_version() -> int:
+    return int(generate_unique_id())
+
+
+def _bump(key: str, version):
+    # Commit olana kadar versiyon hiçbir token ve cache kaydı ile eşleşmeyen geçici bir değere ayarlanır (bu sırada okunan eski satır
+    # cache'lenirse commit sonrası geçersiz olur). Commit sonrası veritabanındaki yeni değer yazılır, silinen kayıtlarda anahtar silinir.
+    timeout = settings.AUTH_VERSION_CACHE_TIMEOUT
+    cache.set(key, new_version(), timeout)
+    transaction.on_commit(lambda: cache.set(key, version, timeout) if version is not None else cache.delete(key))
+
+
+def bump_user_version(user_id, version=None):
+    if user_id:
+        _bump(USER_VERSION_KEY.format(user_id), version)
+
+
+def bump_team_version(team_id, version=None):
+    if team_id:
+        _bump(TEAM_VERSION_KEY.format(team_id), version)
+
+
+def _load_versions(user_id, team_id, keys: list) -> dict:
+    """ Cache'te bulunmayan versiyonları veritabanından okur. Kayıt yoksa hiçbir token ile eşleşmeyecek yeni bir değer kullanılır. """
+    from aircraft.accounts.models import Team, User
+
+    user_key = USER_VERSION_KEY.format(user_id)
+    versions = {}
+    if user_key in keys:
+        versions[user_key] = User.objects.filter(pk=user_id).values_list("auth_version", flat=True).first()
+    if team_id and TEAM_VERSION_KEY.format(team_id) in keys:
+        versions[TEAM_VERSION_KEY.format(team_id)] = Team.objects.filter(pk=team_id).values_list("auth_version", flat=True).first()
+
+    for key, version in versions.items():
+        # add() bu arada save() ile yazılan daha yeni bir değeri ezmez.
+        cache.add(key, version if version is not None else new_version(), settings.AUTH_VERSION_CACHE_TIMEOUT)
+    return cache.get_many(list(versions))
+
+
+def get_versions(user_id, team_id) -> tuple:
+    """ Kullanıcı ve takımın güncel versiyonlarını (user_version, team_version) olarak döner. Takımı olmayan kullanıcıda takım versiyonu None'dır. """
+    user_key = USER_VERSION_KEY.format(user_id)
+    team_key = TEAM_VERSION_KEY.format(team_id)
+    keys = [user_key, team_key] if team_id else [user_key]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        versions.update(_load_versions(user_id, team_id, missing))
+    return versions.get(user_key), versions.get(team_key) if team_id else None
+
+
+class UserCache:
+    """
+        Thread-safe LRU + TTL cache. Model nesneleri yerine alan değerleri saklanır ve her okumada yeni nesne oluşturulur;
+        böylece bir isteğin kullanıcı nesnesi üzerinde yaptığı değişiklik diğer isteklere taşınmaz.
+    """
+    def __init__(self, max_size: int = None, timeout: float = None):
+        self._max_size = max_size
+        self._timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size if self._max_size is not None else settings.USER_CACHE_SIZE
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout if self._timeout is not None else settings.USER_CACHE_TIMEOUT
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, versions, user_values, team_values = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+
+        if get_versions(user_id, user_values["team_id"]) != versions:
+            self.delete(user_id)
+            return None
+        return self._build(user_values, team_values)
+
+    def set(self, user, versions: tuple):
+        user_values = {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields}
+        team = user.team
+        team_values = {field.attname: getattr(team, field.attname) for field in team._meta.concrete_fields} if team else None
+        with self._lock:
+            self._entries[user.pk] = (time.monotonic() + self.timeout, versions, user_values, team_values)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _build(user_values: dict, team_values: dict):
+        from aircraft.accounts.models import Team, User
+
+        user = User.from_db(DEFAULT_DB_ALIAS, list(user_values), list(user_values.values()))
+        team = Team.from_db(DEFAULT_DB_ALIAS, list(team_values), list(team_values.values())) if team_values else None
+        User._meta.get_field("team").set_cached_value(user, team)
+        return user
+
+
+user_cache = UserCache()
+
+
+def get_cached_user(user_id):
+    """
+        Kullanıcıyı (takımı ile birlikte) worker cache'inden döner, yoksa veritabanından tek sorgu ile okuyup cache'e yazar.
+        Kullanıcı yoksa User.DoesNotExist fırlatılır.
+    """
+    from aircraft.accounts.models import User
+
+    if not settings.USER_CACHE_ENABLED:
+        return User.objects.select_related("team").get(pk=user_id)
+
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    # Kullanıcı versiyonu veritabanı okumasından önce alınıyor; okuma sırasında yapılan bir değişiklik sonraki istekte fark edilir.
+    # Takım id'si okumadan önce bilinmediği için takım versiyonu sonra alınıyor, bu aradaki yarışın etkisi TTL ile sınırlıdır.
+    user_version, _ = get_versions(user_id, None)
+    user = User.objects.select_related("team").get(pk=user_id)
+    user_cache.set(user, (user_version, get_versions(user_id, user.team_id)[1]))
+    return user
@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+from aircraft.core.metrics import metrics, render_prometheus
+
+
+def metrics_view(request): # Tüm worker'ların metriklerini Prometheus text formatında döner, sadece METRICS_ALLOWED_IPS'teki scraper'lar okuyabilir.
+    if not settings.METRICS_ENABLED:
+        raise Http404()
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(render_prometheus(metrics.collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
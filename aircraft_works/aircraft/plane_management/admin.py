@@ -1,6 +1,8 @@
 from django.contrib.admin import register, ModelAdmin
+from django.db import transaction
 
-from aircraft.plane_management.models import Part, PartUsage, PlaneAssembly
+from aircraft.plane_management.inventory import record_queryset_deleted
+from aircraft.plane_management.models import Part, PartInventory, PartUsage, PlaneAssembly
 
 @register(Part)
 class PartAdmin(ModelAdmin):
@@ -13,6 +15,20 @@ class PartAdmin(ModelAdmin):
         obj.clean()
         super().save_model(request, obj, form, change)
 
+    def delete_queryset(self, request, queryset):
+        # Toplu silme işleminde model delete() çağrılmadığı için envanter sayaçlarını burada güncelliyoruz.
+        with transaction.atomic():
+            record_queryset_deleted(queryset)
+            super().delete_queryset(request, queryset)
+
+
+@register(PartInventory)
+class PartInventoryAdmin(ModelAdmin):
+    list_display = ["part_type", "plane_type", "slot", "available", "used"]
+    list_filter = ["part_type", "plane_type"]
+    ordering = ["part_type", "plane_type", "slot"]
+    readonly_fields = ["part_type", "plane_type", "slot", "available", "used", "created_at", "updated_at"]
+
 
 @register(PartUsage)
 class PartUsageAdmin(ModelAdmin):
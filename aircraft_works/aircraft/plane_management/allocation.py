@@ -0,0 +1,92 @@
+import time
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from aircraft.core.metrics import metrics
+from aircraft.plane_management.inventory import record_parts_used
+from aircraft.plane_management.models import Part, PartUsage, PlaneAssembly
+
+"""
+    Uçak montajı için parça ayırma (allocation) motoru.
+    Uçağın ihtiyaç listesindeki (parça tipi -> adet) parçalar satır kilidiyle (FOR UPDATE SKIP LOCKED) seçilir,
+    PartUsage kayıtları tek bir bulk insert ile yazılır ve parçaların used_in_plane alanı tek bir
+    bulk update ile güncellenir. Envanter sayaçları da aynı transaction içinde güncellenir. Böylece montaj süresi kullanılan parça sayısından bağımsız kalır.
+"""
+
+
+def build_requirements(parts_data: list) -> dict:
+    """ Frontendden gelen parts_used listesini {parça_tipi: adet} sözlüğüne çevirir. Aynı tip birden fazla gelirse adetler toplanır. """
+    requirements = {}
+    for part_data in parts_data:
+        part_type = part_data['part_type']
+        requirements[part_type] = requirements.get(part_type, 0) + int(part_data['amount'])
+    return requirements
+
+
+def raise_missing_parts(plane_type: str, part_type: str, missing: int):
+    """ Eksik parça hatasını tüm akışlarda aynı mesajla fırlatmak için kullanılır. """
+    part_type_display = Part.PartTypes(part_type).label if part_type in Part.PartTypes.values else part_type
+    raise ValidationError(
+        f"{plane_type} uçağı için {part_type_display} parçası eksik, "
+        f"{missing} adet parça bulunamadı."
+    )
+
+
+def free_parts(plane_type: str, part_type: str, amount: int):
+    """ Verilen tipte en eski `amount` adet kullanılmamış parçanın id'lerini kilitleyerek seçen queryset. part_free_alloc_idx ile okunur. """
+    return (
+        Part.objects.select_for_update(skip_locked=True)
+        .filter(plane_type=plane_type, part_type=part_type, used_in_plane=False)
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)[:amount]
+    )
+
+
+def lock_free_parts(plane_type: str, part_type: str, amount: int) -> list:
+    """
+        Verilen tipte en eski `amount` adet kullanılmamış parçayı kilitleyerek seçer ve id'lerini döner.
+        SKIP LOCKED sayesinde başka bir montaj transaction'ının kilitlediği satırlar beklenmeden atlanır,
+        böylece paralel montajlar aynı parçayı seçmez ve birbirini beklemez.
+    """
+    return list(free_parts(plane_type, part_type, amount))
+
+
+def allocate_parts(plane_assembly: PlaneAssembly, requirements: dict) -> list:
+    """
+        Uçak için gereken parçaları seçer ve uçağa bağlar. transaction.atomic() içinde çağrılmalıdır.
+        - Her parça tipi için en eski kullanılmamış parçalar satır kilidi alınarak seçilir (parça tipi başına tek sorgu).
+          Postgres FOR UPDATE ile pencere fonksiyonlarını birlikte kabul etmediği için tipler ayrı sorgulanır.
+        - Kilitli parçalar transaction bitene kadar başka montajlar tarafından seçilemez.
+        - Yeterli parça yoksa ValidationError fırlatılır ve transaction geri alınır.
+    """
+    plane_type = plane_assembly.plane_type
+    started_at = time.perf_counter()
+    part_ids = []
+    for part_type, amount in requirements.items():
+        lock_started_at = time.perf_counter()
+        locked_ids = lock_free_parts(plane_type, part_type, amount)
+        metrics.observe("aircraft_allocation_lock_seconds", {"part_type": part_type}, time.perf_counter() - lock_started_at)
+        if len(locked_ids) < amount:
+            metrics.inc("aircraft_allocation_failures_total", {"plane_type": plane_type, "part_type": part_type})
+            raise_missing_parts(plane_type, part_type, amount - len(locked_ids))
+        part_ids.extend(locked_ids)
+
+    usages = PartUsage.objects.bulk_create(
+        [PartUsage(part_id=part_id, plane_assembly=plane_assembly) for part_id in part_ids]
+    )
+    # bulk update auto_now alanını güncellemediği için updated_at'i elle veriyoruz.
+    updated = Part.objects.filter(id__in=part_ids, used_in_plane=False).update(used_in_plane=True, updated_at=timezone.now())
+    if updated != len(part_ids):
+        raise ValidationError("Seçilen parçalardan bazıları başka bir montajda kullanıldı, lütfen tekrar deneyin.")
+    record_parts_used(plane_type, requirements)
+
+    metrics.observe("aircraft_allocation_duration_seconds", {"plane_type": plane_type}, time.perf_counter() - started_at)
+    # Ayrılan parçalar transaction commit edilirse sayılır, geri alınan montajlar sayaca yansımaz.
+    def count_allocated_parts():
+        for part_type, amount in requirements.items():
+            metrics.inc("aircraft_parts_allocated_total", {"plane_type": plane_type, "part_type": part_type}, amount)
+
+    transaction.on_commit(count_allocated_parts)
+    return usages
@@ -0,0 +1,37 @@
+from aircraft.accounts.models import Team
+from aircraft.core.events import publish
+
+"""
+    Parça, uçak ve skor değişikliklerinin akış olayları. Parça ve skor olayları parçanın tipindeki takıma,
+    uçak olayları montaj takımına gider. Skor olayları sayaçlardaki farkı taşır, istemci mevcut skorlara ekler.
+"""
+
+PART_CREATED = "part.created"
+PART_DELETED = "part.deleted"
+PART_RETYPED = "part.retyped"
+PLANE_ASSEMBLED = "plane.assembled"
+SCORE_DELTA = "score.delta"
+
+
+def parts_created(part_type: str, plane_type: str, count: int, first_id, last_id):
+    publish([(PART_CREATED, [part_type], {"part_type": part_type, "plane_type": plane_type, "count": count, "first_id": str(first_id), "last_id": str(last_id)})])
+
+
+def part_deleted(part_type: str, plane_type: str, part_id=None, count: int = 1):
+    publish([(PART_DELETED, [part_type], {"part_type": part_type, "plane_type": plane_type, "id": str(part_id) if part_id else None, "count": count})])
+
+
+def part_retyped(part_id, part_type: str, previous_plane_type: str, plane_type: str):
+    publish([(PART_RETYPED, [part_type], {"id": str(part_id), "part_type": part_type, "previous_plane_type": previous_plane_type, "plane_type": plane_type})])
+
+
+def plane_assembled(plane_assembly, requirements: dict):
+    publish([(PLANE_ASSEMBLED, [Team.Team.ASSEMBLY], {"id": str(plane_assembly.id), "plane_type": plane_assembly.plane_type, "part_counts": requirements})])
+
+
+def score_deltas(rows: list):
+    """ rows: [((part_type, plane_type), (available_farkı, used_farkı))] """
+    publish([
+        (SCORE_DELTA, [part_type], {"part_type": part_type, "plane_type": plane_type, "available": available, "used": used})
+        for (part_type, plane_type), (available, used) in rows
+    ])
@@ -0,0 +1,216 @@
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from aircraft.core.etags import bump_versions
+from aircraft.core.events import ALL_TEAMS, RESYNC, publish
+from aircraft.plane_management import events
+from aircraft.plane_management.models import Part, PartInventory
+
+"""
+    Parça envanter sayaçları.
+    Her (parça tipi, uçak tipi) kovası için kullanılabilir ve kullanılmış parça sayıları PartInventory tablosunda tutulur.
+    Sayaçlar parça oluşturma, silme, uçak tipi güncelleme ve montaj ile aynı transaction içinde güncellenir.
+    Böylece skor ve stok kontrolleri Part tablosunu taramak yerine birkaç satır okuyarak yapılır.
+    Takım skorları ayrıca kısa süreli cache'te tutulur ve takımın parçaları değiştiğinde cache silinir.
+"""
+
+
+def score_cache_key(part_type: str) -> str:
+    # Her takım tek bir parça tipi ürettiği için takım skorları parça tipine göre saklanıyor.
+    return f"part_score:{part_type}"
+
+
+PLANES_SCOPE = "planes" # Uçak listesi ETag'inin bağlı olduğu versiyon kapsamı.
+
+
+def inventory_scope(part_type: str) -> str:
+    # Parça listesi ve skor ETag'lerinin bağlı olduğu versiyon kapsamı.
+    return f"inventory:{part_type}"
+
+
+def invalidate_scores(part_types):
+    """
+        Verilen parça tiplerinin skor cache'ini siler ve envanter ETag versiyonlarını değiştirir. Silme işlemi hem hemen hem de
+        transaction commit olduktan sonra yapılır; böylece commit öncesi başka bir istek eski sayaçları cache'e yazsa bile commit sonrası temizlenir.
+    """
+    part_types = set(part_types)
+    keys = [score_cache_key(part_type) for part_type in part_types]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+    bump_versions(*(inventory_scope(part_type) for part_type in part_types))
+
+
+def _apply_deltas(deltas: dict):
+    """
+        {(part_type, plane_type): [available_farkı, used_farkı]} sözlüğünü sayaçlara tek bir upsert sorgusu ile uygular.
+        Transaction başına tek bir dilim seçilir ve kovalar sıralı yazılır, böylece paralel transactionlar
+        aynı satırı beklemez ve birbirini kilitlemez (deadlock oluşmaz). Sayaç satırı yoksa aynı sorguda oluşturulur.
+    """
+    rows = [(bucket, delta) for bucket, delta in sorted(deltas.items()) if delta[0] or delta[1]]
+    if not rows:
+        return
+
+    slot = random.randrange(PartInventory.SLOTS)
+    now = timezone.now()
+    table = connection.ops.quote_name(PartInventory._meta.db_table)
+    values = []
+    params = []
+    for (part_type, plane_type), (available, used) in rows:
+        values.append("(%s, %s, %s, %s, %s, %s, %s, %s)")
+        params.extend([PartInventory._meta.pk.get_default(), now, now, part_type, plane_type, slot, available, used])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (id, created_at, updated_at, part_type, plane_type, slot, available, used) "
+            f"VALUES {', '.join(values)} "
+            f"ON CONFLICT (part_type, plane_type, slot) DO UPDATE SET "
+            f"available = {table}.available + EXCLUDED.available, "
+            f"used = {table}.used + EXCLUDED.used, "
+            f"updated_at = EXCLUDED.updated_at",
+            params,
+        )
+    invalidate_scores(part_type for (part_type, _), _ in rows)
+    events.score_deltas(rows)
+    if any(used for _, (_, used) in rows):
+        bump_versions(PLANES_SCOPE) # Kullanılmış parçalar değiştiyse uçak listesindeki parça özetleri de değişmiştir.
+
+
+def _add_bucket(deltas: dict, bucket: tuple, sign: int, count: int = 1):
+    part_type, plane_type, used_in_plane = bucket
+    delta = deltas.setdefault((part_type, plane_type), [0, 0])
+    delta[1 if used_in_plane else 0] += sign * count
+
+
+def record_part_change(before, after):
+    """ Tek bir parçanın (part_type, plane_type, used_in_plane) kovası değiştiğinde çağrılır. Oluşturmada before, silmede after None'dır. """
+    if before == after:
+        # Sayaçlar değişmese de parçanın diğer alanları (ör. kullanıcı) değişmiş olabilir, liste ETag'i yenilenmeli.
+        if after is not None:
+            bump_versions(inventory_scope(after[0]))
+        return
+    deltas = {}
+    if before is not None:
+        _add_bucket(deltas, before, -1)
+    if after is not None:
+        _add_bucket(deltas, after, 1)
+    _apply_deltas(deltas)
+
+
+def record_parts_created(part_type: str, plane_type: str, count: int):
+    """ bulk_create ile toplu oluşturulan parçalar için çağrılır. """
+    _apply_deltas({(part_type, plane_type): [count, 0]})
+
+
+def record_parts_used(plane_type: str, requirements: dict):
+    """ Montajda kullanılan parçaları kullanılabilirden kullanılmışa taşır. """
+    _apply_deltas({(part_type, plane_type): [-amount, amount] for part_type, amount in requirements.items()})
+
+
+def record_queryset_deleted(queryset):
+    """ queryset.delete() sinyal ya da model delete() çağırmadığı için silinecek parçaların kovaları önceden toplanır. """
+    deltas = {}
+    buckets = queryset.values('part_type', 'plane_type', 'used_in_plane').annotate(count=Count('id')).order_by()
+    for row in buckets:
+        _add_bucket(deltas, (row['part_type'], row['plane_type'], row['used_in_plane']), -1, row['count'])
+        events.part_deleted(row['part_type'], row['plane_type'], count=row['count'])
+    _apply_deltas(deltas)
+
+
+def get_available_counts(plane_type: str, part_types) -> dict:
+    """ Verilen uçak tipi için kullanılabilir parça sayılarını {parça_tipi: adet} olarak döner. """
+    rows = (
+        PartInventory.objects.filter(plane_type=plane_type, part_type__in=list(part_types))
+        .values('part_type')
+        .annotate(total=Sum('available'))
+        .values_list('part_type', 'total')
+    )
+    return dict(rows)
+
+
+def get_plane_scores(part_type: str) -> dict:
+    """ Parça tipinin her uçak modeli için kullanılan ve kullanılmayan sayılarını döner. """
+    plane_scores = {plane: {"used": 0, "unused": 0} for plane in Part.PlaneTypes.values}
+    rows = (
+        PartInventory.objects.filter(part_type=part_type)
+        .values('plane_type')
+        .annotate(used=Sum('used'), unused=Sum('available'))
+        .order_by()
+    )
+    for row in rows:
+        plane_scores[row['plane_type']] = {"used": row['used'], "unused": row['unused']}
+    return plane_scores
+
+
+def get_part_type_total(part_type: str) -> int:
+    """ Verilen tipteki toplam parça sayısını (kullanılan + kullanılmayan) sayaçlardan döner. """
+    totals = PartInventory.objects.filter(part_type=part_type).aggregate(available=Sum('available'), used=Sum('used'))
+    return (totals['available'] or 0) + (totals['used'] or 0)
+
+
+def get_cached_plane_scores(part_type: str) -> dict:
+    """ get_plane_scores sonucunu PART_SCORE_CACHE_TIMEOUT saniye boyunca cache'te tutar. """
+    return cache.get_or_set(
+        score_cache_key(part_type),
+        lambda: get_plane_scores(part_type),
+        settings.PART_SCORE_CACHE_TIMEOUT,
+    )
+
+
+def count_source_rows() -> dict:
+    """ Part tablosundan gerçek sayıları {(part_type, plane_type): (available, used)} olarak hesaplar. """
+    counts = {}
+    rows = Part.objects.values('part_type', 'plane_type', 'used_in_plane').annotate(count=Count('id')).order_by()
+    for row in rows:
+        available, used = counts.get((row['part_type'], row['plane_type']), (0, 0))
+        if row['used_in_plane']:
+            used += row['count']
+        else:
+            available += row['count']
+        counts[(row['part_type'], row['plane_type'])] = (available, used)
+    return counts
+
+
+def count_counter_rows() -> dict:
+    """ Sayaç tablosundaki dilimleri toplayarak {(part_type, plane_type): (available, used)} döner. """
+    rows = PartInventory.objects.values('part_type', 'plane_type').annotate(available=Sum('available'), used=Sum('used')).order_by()
+    return {(row['part_type'], row['plane_type']): (row['available'], row['used']) for row in rows}
+
+
+def find_drift() -> dict:
+    """ Sayaçlar ile Part tablosu arasındaki farkları {kova: (sayaç, gerçek)} olarak döner. """
+    source = count_source_rows()
+    counters = count_counter_rows()
+    drift = {}
+    for bucket in set(source) | set(counters):
+        expected = source.get(bucket, (0, 0))
+        actual = counters.get(bucket, (0, 0))
+        if expected != actual:
+            drift[bucket] = (actual, expected)
+    return drift
+
+
+def rebuild_counters() -> dict:
+    """
+        Sayaç tablosunu Part tablosundan yeniden oluşturur.
+        Tablo EXCLUSIVE modda kilitlenir; böylece sayım sırasında devam eden transactionlar bitmeden sayılmaz ve sayaç güncellemeleri kaybolmaz.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {PartInventory._meta.db_table} IN EXCLUSIVE MODE')
+        source = count_source_rows()
+        PartInventory.objects.all().delete()
+        PartInventory.objects.bulk_create([
+            PartInventory(part_type=part_type, plane_type=plane_type, slot=0, available=available, used=used)
+            for (part_type, plane_type), (available, used) in source.items()
+        ])
+        invalidate_scores(Part.PartTypes.values)
+        bump_versions(PLANES_SCOPE)
+        publish([(RESYNC, ALL_TEAMS, {})]) # Sayaçlar baştan hesaplandığı için istemciler farkları değil tüm veriyi yeniden okumalı.
+    return source
@@ -0,0 +1,165 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from aircraft.accounts.models import Team, User
+from aircraft.accounts.teams import team_registry
+from aircraft.core.helpers import reserve_unique_ids
+from aircraft.plane_management.inventory import rebuild_counters
+from aircraft.plane_management.models import Part, PartInventory, PartUsage, PlaneAssembly
+
+EMAIL_TEMPLATE = "dataset-{team}-{index}@example.com"
+ID_CHUNK = 100000
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a reproducible synthetic dataset: users per team, parts spread over part and plane types, '
+        'assembled planes and part usage history. Rows are written with COPY.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--parts', type=int, default=100000, help='Total number of parts to generate')
+        parser.add_argument('--users-per-team', type=int, default=10, help='Number of users created for each team')
+        parser.add_argument('--assembled-ratio', type=float, default=0.5,
+                            help='Share of the scarcest part bucket of each plane type that is used in assembled planes')
+        parser.add_argument('--days', type=int, default=365, help='created_at values are spread over this many past days')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, the same seed produces the same dataset')
+        parser.add_argument('--password', default='dataset1234', help='Password of the generated users')
+        parser.add_argument('--reset', action='store_true',
+                            help='Truncate parts, planes, usages and counters before generating (destroys existing data)')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['assembled_ratio'] <= 1:
+            raise CommandError('--assembled-ratio must be between 0 and 1')
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.days = options['days']
+        started_at = time.monotonic()
+
+        with transaction.atomic():
+            if options['reset']:
+                self._reset()
+            users = self._create_users(options['users_per_team'], options['password'])
+            buckets = self._bucket_sizes(options['parts'])
+            planes = self._plan_planes(buckets, options['assembled_ratio'])
+            self._copy_planes(planes, users[Team.Team.ASSEMBLY])
+            parts, usages = self._copy_parts_and_usages(buckets, planes, users)
+
+        # Yeni satırların istatistikleri planner için güncelleniyor ve envanter sayaçları Part tablosundan yeniden hesaplanıyor.
+        with connection.cursor() as cursor:
+            for model in (Part, PlaneAssembly, PartUsage):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        rebuild_counters()
+
+        plane_count = sum(len(plane_ids) for plane_ids in planes.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {parts} parts, {plane_count} planes and {usages} part usages '
+            f'in {time.monotonic() - started_at:.1f}s (seed {options["seed"]})'
+        ))
+
+    def _reset(self):
+        tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in (PartUsage, Part, PlaneAssembly, PartInventory))
+        with connection.cursor() as cursor:
+            # Aynı transaction içinde bekleyen ertelenmiş FK kontrolleri varsa TRUNCATE hata verir, önce onları çalıştırıyoruz.
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f'TRUNCATE {tables}')
+        self.stdout.write(self.style.WARNING('Truncated parts, planes, part usages and inventory counters'))
+
+    def _create_users(self, users_per_team: int, password: str) -> dict:
+        # Tüm kullanıcılar aynı şifreyi kullandığı için şifre bir kez hashleniyor.
+        password_hash = make_password(password)
+        users = []
+        for team_type in Team.Team.values:
+            team = team_registry.get(team_type)
+            users += [
+                User(email=EMAIL_TEMPLATE.format(team=team_type.lower(), index=index), team=team, password=password_hash,
+                     first_name='Dataset', last_name=team_type.title(), is_active=True, is_staff=False)
+                for index in range(users_per_team)
+            ]
+        User.objects.bulk_create(users, ignore_conflicts=True) # Daha önce oluşturulmuş dataset kullanıcıları tekrar eklenmez.
+
+        by_team = {team_type: [] for team_type in Team.Team.values}
+        rows = User.objects.filter(email__in=[user.email for user in users]).order_by('email').values_list('id', 'team__team_type')
+        for user_id, team_type in rows:
+            by_team[team_type].append(user_id)
+        self.stdout.write(f'{len(users)} dataset users ready')
+        return by_team
+
+    def _bucket_sizes(self, total: int) -> dict:
+        """ Parçaları (parça tipi, uçak tipi) kovalarına rastgele ağırlıklarla dağıtır. """
+        buckets = [(part_type, plane_type) for part_type in Part.PartTypes.values for plane_type in Part.PlaneTypes.values]
+        weights = [self.random.uniform(0.5, 1.5) for _ in buckets]
+        scale = total / sum(weights)
+        sizes = {bucket: int(weight * scale) for bucket, weight in zip(buckets, weights)}
+        sizes[buckets[0]] += total - sum(sizes.values())
+        return sizes
+
+    def _plan_planes(self, buckets: dict, assembled_ratio: float) -> dict:
+        # Her uçak her parça tipinden bir tane kullanır; uçak sayısı o uçak tipinin en az parçası olan kovasıyla sınırlıdır.
+        planes = {}
+        for plane_type in PlaneAssembly.PlaneTypes.values:
+            available = min(buckets[(part_type, plane_type)] for part_type in Part.PartTypes.values)
+            planes[plane_type] = reserve_unique_ids(int(available * assembled_ratio))
+        return planes
+
+    def _created_at(self):
+        return self.now - timedelta(seconds=self.random.randrange(self.days * 86400 or 1))
+
+    def _copy(self, model, columns: list, rows):
+        """ Satırları psycopg COPY ile yazar; rows bir generator olabilir, satırlar belleğe toplanmaz. """
+        table = connection.ops.quote_name(model._meta.db_table)
+        count = 0
+        with connection.cursor() as cursor:
+            with cursor.cursor.copy(f'COPY {table} ({", ".join(columns)}) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+        return count
+
+    def _copy_planes(self, planes: dict, assembly_users: list):
+        if not assembly_users:
+            raise CommandError('At least one assembly user is needed to generate planes')
+
+        def rows():
+            for plane_type, plane_ids in planes.items():
+                for plane_id in plane_ids:
+                    created_at = self._created_at()
+                    yield plane_id, created_at, created_at, plane_type, self.random.choice(assembly_users)
+
+        count = self._copy(PlaneAssembly, ['id', 'created_at', 'updated_at', 'plane_type', 'user_id'], rows())
+        self.stdout.write(f'{count} planes written')
+
+    def _copy_parts_and_usages(self, buckets: dict, planes: dict, users: dict) -> tuple:
+        usages = []
+
+        def part_rows():
+            for (part_type, plane_type), size in buckets.items():
+                plane_ids = planes[plane_type]
+                team_users = users[part_type]
+                for offset in range(0, size, ID_CHUNK):
+                    part_ids = reserve_unique_ids(min(ID_CHUNK, size - offset))
+                    for index, part_id in enumerate(part_ids, start=offset):
+                        # Kovanın ilk len(plane_ids) parçası sırayla uçaklarda kullanılmış olarak işaretlenir.
+                        used = index < len(plane_ids)
+                        if used:
+                            usages.append((part_id, plane_ids[index]))
+                        created_at = self._created_at()
+                        yield part_id, created_at, created_at, part_type, plane_type, self.random.choice(team_users), used
+                self.stdout.write(f'{part_type} / {plane_type}: {size} parts written')
+
+        parts = self._copy(Part, ['id', 'created_at', 'updated_at', 'part_type', 'plane_type', 'user_id', 'used_in_plane'], part_rows())
+
+        def usage_rows():
+            for offset in range(0, len(usages), ID_CHUNK):
+                chunk = usages[offset:offset + ID_CHUNK]
+                for usage_id, (part_id, plane_id) in zip(reserve_unique_ids(len(chunk)), chunk):
+                    yield usage_id, self.now, self.now, part_id, plane_id
+
+        usage_count = self._copy(PartUsage, ['id', 'created_at', 'updated_at', 'part_id', 'plane_assembly_id'], usage_rows())
+        return parts, usage_count
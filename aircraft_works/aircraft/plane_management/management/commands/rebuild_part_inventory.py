@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from aircraft.plane_management.inventory import find_drift, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the part inventory counters from the Part table and verifies them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only verify the counters, do not rebuild them')
+
+    def handle(self, *args, **options):
+        drift = find_drift()
+        for (part_type, plane_type), (actual, expected) in sorted(drift.items()):
+            self.stdout.write(self.style.WARNING(
+                f'{part_type} / {plane_type}: counters available={actual[0]} used={actual[1]}, '
+                f'parts available={expected[0]} used={expected[1]}'
+            ))
+
+        if options['check']:
+            if drift:
+                raise CommandError(f'{len(drift)} inventory buckets are out of sync')
+            self.stdout.write(self.style.SUCCESS('Inventory counters match the Part table'))
+            return
+
+        source = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(source)} inventory buckets'))
+
+        # Yeniden oluşturulan sayaçların Part tablosu ile birebir aynı olduğunu doğruluyoruz.
+        remaining = find_drift()
+        if remaining:
+            raise CommandError(f'{len(remaining)} inventory buckets are still out of sync after rebuild')
+        self.stdout.write(self.style.SUCCESS('Inventory counters match the Part table'))
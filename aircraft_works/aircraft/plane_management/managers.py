@@ -0,0 +1,35 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count, Q, QuerySet, Value
+
+
+class PartQuerySet(QuerySet):
+    def with_list_relations(self) -> "QuerySet":
+        """
+            PartListSerializer'ın ihtiyaç duyduğu ilişkileri sabit sayıda sorguda getirir.
+            Kullanıcı ve takımı JOIN ile aynı sorguda, kullanım geçmişi ise tek bir ek sorgu ile yüklenir.
+            Böylece sayfadaki parça sayısı artsa da sorgu sayısı değişmez.
+        """
+        return self.select_related('user__team').prefetch_related('usage_history')
+
+
+class PlaneAssemblyQuerySet(QuerySet):
+    def with_part_summary(self) -> "QuerySet":
+        """
+            Uçak listesinin kompakt gösterimi için her uçağın parça id'lerini ve parça tipine göre sayılarını
+            tek bir gruplanmış sorgu ile hesaplar. Parçaların kendisi, kullanıcıları ve takımları yüklenmez.
+        """
+        from aircraft.plane_management.models import Part
+
+        part_counts = {
+            f"{part_type.lower()}_count": Count('part_usage_history', filter=Q(part_usage_history__part__part_type=part_type))
+            for part_type in Part.PartTypes.values
+        }
+        return self.annotate(
+            part_ids=ArrayAgg(
+                'part_usage_history__part_id',
+                filter=Q(part_usage_history__isnull=False),
+                ordering='part_usage_history__part_id',
+                default=Value([]),
+            ),
+            **part_counts,
+        )
@@ -0,0 +1,113 @@
+# Generated by Django 5.0.8 on 2026-10-17 15:00
+
+import aircraft.core.fields
+import aircraft.core.helpers
+import aircraft.core.mixins
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_part_inventory(apps, schema_editor):
+    # Var olan parçalardan başlangıç sayaçlarını hesaplıyoruz.
+    Part = apps.get_model("plane_management", "Part")
+    PartInventory = apps.get_model("plane_management", "PartInventory")
+    counts = {}
+    rows = (
+        Part.objects.values("part_type", "plane_type", "used_in_plane")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        counter = counts.setdefault(
+            (row["part_type"], row["plane_type"]),
+            PartInventory(
+                part_type=row["part_type"], plane_type=row["plane_type"], slot=0
+            ),
+        )
+        if row["used_in_plane"]:
+            counter.used += row["count"]
+        else:
+            counter.available += row["count"]
+    PartInventory.objects.bulk_create(counts.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "plane_management",
+            "0010_alter_part_part_type_alter_part_plane_type_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PartInventory",
+            fields=[
+                (
+                    "id",
+                    aircraft.core.fields.AircraftPrimaryKeyField(
+                        default=aircraft.core.helpers.generate_unique_id,
+                        editable=False,
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created Date"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated Date"),
+                ),
+                (
+                    "part_type",
+                    models.CharField(
+                        choices=[
+                            ("WING", "Kanat"),
+                            ("FUSELAGE", "Gövde"),
+                            ("TAIL", "Kuyruk"),
+                            ("AVIONICS", "Aviyonik"),
+                        ],
+                        max_length=50,
+                        verbose_name="Parça Türü",
+                    ),
+                ),
+                (
+                    "plane_type",
+                    models.CharField(
+                        choices=[
+                            ("TB2", "TB2"),
+                            ("TB3", "TB3"),
+                            ("AKINCI", "AKINCI"),
+                            ("KIZILELMA", "KIZILELMA"),
+                        ],
+                        max_length=20,
+                        verbose_name="Uçak Tipi",
+                    ),
+                ),
+                (
+                    "slot",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Sayaç Dilimi"
+                    ),
+                ),
+                (
+                    "available",
+                    models.IntegerField(default=0, verbose_name="Kullanılabilir"),
+                ),
+                ("used", models.IntegerField(default=0, verbose_name="Kullanılan")),
+            ],
+            options={
+                "verbose_name": "Part Inventory",
+                "verbose_name_plural": "Part Inventories",
+                "unique_together": {("part_type", "plane_type", "slot")},
+            },
+            bases=(aircraft.core.mixins.AdminUtilsMixin, models.Model),
+        ),
+        migrations.RunPython(populate_part_inventory, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.8 on 2026-10-17 15:09
+
+import aircraft.core.fields
+import aircraft.core.helpers
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plane_management", "0011_partinventory"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="part",
+            name="id",
+            field=aircraft.core.fields.AircraftBigIntegerPrimaryKeyField(
+                default=aircraft.core.helpers.generate_unique_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="partinventory",
+            name="id",
+            field=aircraft.core.fields.AircraftBigIntegerPrimaryKeyField(
+                default=aircraft.core.helpers.generate_unique_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="partusage",
+            name="id",
+            field=aircraft.core.fields.AircraftBigIntegerPrimaryKeyField(
+                default=aircraft.core.helpers.generate_unique_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="planeassembly",
+            name="id",
+            field=aircraft.core.fields.AircraftBigIntegerPrimaryKeyField(
+                default=aircraft.core.helpers.generate_unique_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.8 on 2026-10-17 15:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Index'ler büyük Part tablosunda yazmaları kilitlememek için CONCURRENTLY oluşturuluyor, bu transaction içinde çalışamaz.
+    atomic = False
+
+    dependencies = [
+        ("plane_management", "0012_bigint_primary_keys"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="part",
+            index=models.Index(
+                condition=models.Q(("used_in_plane", False)),
+                fields=["part_type", "plane_type", "created_at", "id"],
+                name="part_free_alloc_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="part",
+            index=models.Index(
+                fields=["part_type", "-created_at", "-id"], name="part_type_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="part",
+            index=models.Index(fields=["user", "part_type"], name="part_user_type_idx"),
+        ),
+        # user_id'nin tek başına index'i, (user, part_type) index'i oluştuktan sonra kaldırılıyor.
+        migrations.AlterField(
+            model_name="part",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="parts",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Kullanıcı",
+            ),
+        ),
+    ]
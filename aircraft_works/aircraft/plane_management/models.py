@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from aircraft.accounts.models import Team, User
 from aircraft.core.mixins import AdminUtilsMixin, BaseModelMixin
+from aircraft.plane_management.managers import PartQuerySet, PlaneAssemblyQuerySet
 from django.core.exceptions import ValidationError
 
 
@@ -20,10 +21,22 @@ class Part(AdminUtilsMixin, BaseModelMixin): # Parçaları tutmak için oluştur
 
     part_type = models.CharField(max_length=50, choices=PartTypes.choices, verbose_name="Parça Türü")
     plane_type = models.CharField(max_length=20, choices=PlaneTypes.choices, default=PlaneTypes.TB2, verbose_name="Uçak Tipi")
-    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="parts", verbose_name="Kullanıcı") # Her parçayı üreten bir kullanıcı vardır sistemdeki var olan parçaları kimin ürettiğini tutuyor bu field.
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, db_index=False, related_name="parts", verbose_name="Kullanıcı") # Her parçayı üreten bir kullanıcı vardır sistemdeki var olan parçaları kimin ürettiğini tutuyor bu field. Tek başına index'i yok, (user, part_type) index'i user ile yapılan sorguları da karşılıyor.
     # is_deleted = models.BooleanField(default=False, verbose_name="Is Deleted?")
     used_in_plane = models.BooleanField(default=False, verbose_name="Kullanıldı mı?") # Parçalar uçak oluşumunda kullanılıyor uçak oluşumunda kullanılan parçalar silinmiyor used_in_plane alanı True olarak güncelleniyor ve daha sonra bu parçalar kullanılmıyor.
 
+    objects = PartQuerySet.as_manager() # Listeleme için ilişkileri önceden yükleyen queryset metodlarını sağlıyor.
+
+    class Meta:
+        indexes = [
+            # Montajda boştaki en eski parçaların seçimi (allocation.free_parts): sadece kullanılmamış parçaları içerdiği için küçük kalır.
+            models.Index(fields=['part_type', 'plane_type', 'created_at', 'id'], condition=models.Q(used_in_plane=False), name='part_free_alloc_idx'),
+            # Parça listesi: parça tipine göre cursor sayfalama sırasıyla (-created_at, -id).
+            models.Index(fields=['part_type', '-created_at', '-id'], name='part_type_created_idx'),
+            # Takımın parçaları (user__team ile join) ve kullanıcı silinirken SET NULL için user_id aramaları.
+            models.Index(fields=['user', 'part_type'], name='part_user_type_idx'),
+        ]
+
     def clean(self): # Bu method aslında sistemem parça eklerken uyulması gereken bazı gereksinimler.
         # öncelikle parça üretmek için sistemde kullanıcı ve kullanıcının takımı olması gerek.
         if not self.user:
@@ -45,6 +58,49 @@ class Part(AdminUtilsMixin, BaseModelMixin): # Parçaları tutmak için oluştur
 
     def __str__(self):
         return f"{self.get_part_type_display()} for {self.get_plane_type_display()}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Veritabanından okunan parçanın envanter kovasını saklıyoruz, save() sırasında neyin değiştiğini anlamak için kullanılıyor.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_bucket = instance.inventory_bucket() if {"part_type", "plane_type", "used_in_plane"} <= set(field_names) else None
+        return instance
+
+    def inventory_bucket(self) -> tuple:
+        return (self.part_type, self.plane_type, self.used_in_plane)
+
+    def save(self, *args, **kwargs):
+        # Parça kaydedilirken envanter sayaçları da aynı transaction içinde güncelleniyor.
+        from aircraft.plane_management import events
+        from aircraft.plane_management.inventory import record_part_change
+
+        if self._state.adding:
+            before = None
+        else:
+            before = getattr(self, "_loaded_bucket", None)
+            if before is None:
+                before = Part.objects.filter(pk=self.pk).values_list("part_type", "plane_type", "used_in_plane").first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Parça olayı skor olayından önce yayınlanır, istemci olayları bu sırayla alır.
+            if before is None:
+                events.parts_created(self.part_type, self.plane_type, 1, self.pk, self.pk)
+            elif before[1] != self.plane_type:
+                events.part_retyped(self.pk, self.part_type, before[1], self.plane_type)
+            record_part_change(before, self.inventory_bucket())
+        self._loaded_bucket = self.inventory_bucket()
+
+    def delete(self, *args, **kwargs):
+        from aircraft.plane_management import events
+        from aircraft.plane_management.inventory import record_part_change
+
+        part_id = self.pk
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            events.part_deleted(self.part_type, self.plane_type, part_id)
+            record_part_change(self.inventory_bucket(), None)
+        return result
     
 
 class PlaneAssembly(AdminUtilsMixin, BaseModelMixin): #Montaj takımının ürettiği uçakları tuttuğum modeldir.
@@ -62,6 +118,8 @@ class PlaneAssembly(AdminUtilsMixin, BaseModelMixin): #Montaj takımının üret
     ) # Bu alan uçak üretilirken kullanıclan parça listesidir.
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="plane_assemblies", verbose_name="Kullanıcı") # Uçağı üreten kullanıcıdır.
 
+    objects = PlaneAssemblyQuerySet.as_manager() # Uçak listesi için parça özetini hesaplayan queryset metodlarını sağlıyor.
+
     def clean(self):
         # Burada uçak üretimini yapıcak olan kullanıcı montaj ekibi içinde olmalı yoksa hata fırlatıcak.
         if self.user and self.user.team and self.user.team.team_type != Team.Team.ASSEMBLY:
@@ -70,6 +128,21 @@ class PlaneAssembly(AdminUtilsMixin, BaseModelMixin): #Montaj takımının üret
     def __str__(self):
         return f"{self.id} - {self.plane_type}"
 
+    def save(self, *args, **kwargs):
+        from aircraft.core.etags import bump_versions
+        from aircraft.plane_management.inventory import PLANES_SCOPE
+
+        super().save(*args, **kwargs)
+        bump_versions(PLANES_SCOPE) # Uçak listesinin ETag'ini geçersiz kılıyoruz.
+
+    def delete(self, *args, **kwargs):
+        from aircraft.core.etags import bump_versions
+        from aircraft.plane_management.inventory import PLANES_SCOPE
+
+        result = super().delete(*args, **kwargs)
+        bump_versions(PLANES_SCOPE)
+        return result
+
 
 class PartUsage(AdminUtilsMixin, BaseModelMixin): # Uçak üretiminde kullanılan parçaları tutan bir modedlir.
     part = models.ForeignKey(Part, on_delete=models.CASCADE, related_name="usage_history", verbose_name="Parça") # Parça ile ilişkisi 1:N şeklindedir. Bu yüzden Foreignkey olarak ekliyoruz.
@@ -80,3 +153,21 @@ class PartUsage(AdminUtilsMixin, BaseModelMixin): # Uçak üretiminde kullanıla
 
     def __str__(self):
         return f"{self.part.part_type} - {self.plane_assembly}"
+
+
+class PartInventory(AdminUtilsMixin, BaseModelMixin): # Parça tablosunu taramadan stok durumunu okuyabilmek için tutulan sayaç tablosudur.
+    SLOTS = 8 # Her (parça tipi, uçak tipi) sayacı paralel transactionlar aynı satırı beklemesin diye bu kadar satıra bölünür, okurken toplanır.
+
+    part_type = models.CharField(max_length=50, choices=Part.PartTypes.choices, verbose_name="Parça Türü")
+    plane_type = models.CharField(max_length=20, choices=Part.PlaneTypes.choices, verbose_name="Uçak Tipi")
+    slot = models.PositiveSmallIntegerField(default=0, verbose_name="Sayaç Dilimi")
+    available = models.IntegerField(default=0, verbose_name="Kullanılabilir") # Uçakta kullanılmamış parça sayısı
+    used = models.IntegerField(default=0, verbose_name="Kullanılan") # Uçakta kullanılmış parça sayısı
+
+    class Meta:
+        unique_together = ('part_type', 'plane_type', 'slot')
+        verbose_name = "Part Inventory"
+        verbose_name_plural = "Part Inventories"
+
+    def __str__(self):
+        return f"{self.part_type} - {self.plane_type} [{self.slot}]: {self.available}/{self.used}"
@@ -1,12 +1,18 @@
 from aircraft.accounts.serializers import UserSerializer
+from aircraft.core.helpers import reserve_unique_ids
+from aircraft.plane_management import events
+from aircraft.plane_management.allocation import allocate_parts, build_requirements, raise_missing_parts
+from aircraft.plane_management.inventory import get_available_counts, record_parts_created
 from aircraft.plane_management.models import Part, PartUsage, PlaneAssembly
 from drf_extra_fields.relations import PresentablePrimaryKeyRelatedField
 from rest_framework.exceptions import ValidationError
-from rest_framework.serializers import ModelSerializer, Serializer, SerializerMethodField
+from rest_framework.serializers import Serializer, SerializerMethodField
 from rest_framework.fields import CharField, CurrentUserDefault, HiddenField, IntegerField, ChoiceField, ListField, DictField
+from django.conf import settings
 from django.db import transaction
+from aircraft.core.serializers import AircraftModelSerializer
 
-class PartCreateSerializer(ModelSerializer):
+class PartCreateSerializer(AircraftModelSerializer):
     user = HiddenField(default=CurrentUserDefault())
     plane_type = ChoiceField(choices=Part.PlaneTypes.choices, required=True)
     part_type = ChoiceField(choices=Part.PartTypes.choices, required=True)
@@ -23,34 +29,49 @@ class PartCreateSerializer(ModelSerializer):
             raise ValidationError({'quantity': 'Miktar en az 1 olmalıdır.'})
 
         # Kullanıcının takımı ile parça uyumlu mu? Bunu `clean()` içinde kontrol edeceğiz.
-        for _ in range(quantity):
-            part = Part(**attrs)  # Geçici Part nesnesi oluştur
-            part.clean()  # Modelin clean() metodunu çağır
-        
+        # Kural miktardan bağımsız olduğu için tek bir geçici parça ile bir kez kontrol etmek yeterli.
+        Part(**attrs).clean()
+
         attrs['_quantity'] = quantity  # Geçici olarak validasyon sonrası kullanılacak
         return attrs
 
     def create(self, validated_data):
-        """ `clean()` çağırmamıza gerek yok çünkü `validate()` aşamasında zaten çağırdık. """
+        """
+            `clean()` çağırmamıza gerek yok çünkü `validate()` aşamasında zaten çağırdık.
+            Parçalar PART_CREATE_BATCH_SIZE büyüklüğünde gruplar halinde eklenir, böylece çok büyük miktarlarda da
+            bellekte sadece bir grup tutulur ve tek bir dev INSERT sorgusu oluşmaz.
+            Oluşturulan parçalar yerine {count, first_id, last_id} özeti döner.
+        """
         quantity = validated_data.pop('_quantity')  # Önceki adımda eklediğimiz geçici quantity bilgisini al
-        parts = [Part(**validated_data) for _ in range(quantity)]  # Belirtilen miktarda Part oluştur
-        return Part.objects.bulk_create(parts)  # Toplu olarak kaydet
-
-
-class PartUsageSerializer(ModelSerializer):
+        batch_size = settings.PART_CREATE_BATCH_SIZE
+        first_id = last_id = None
+        with transaction.atomic():
+            for offset in range(0, quantity, batch_size):
+                # id'ler grup başına tek seferde ayrılıyor, böylece her parça için ayrı id üretimi yapılmıyor.
+                part_ids = reserve_unique_ids(min(batch_size, quantity - offset))
+                Part.objects.bulk_create([Part(id=part_id, **validated_data) for part_id in part_ids])  # Toplu olarak kaydet
+                first_id = first_id or part_ids[0]
+                last_id = part_ids[-1]
+            events.parts_created(validated_data['part_type'], validated_data['plane_type'], quantity, first_id, last_id)
+            record_parts_created(validated_data['part_type'], validated_data['plane_type'], quantity)  # bulk_create save() çağırmadığı için sayaçları elle güncelliyoruz
+        return {'count': quantity, 'first_id': first_id, 'last_id': last_id}
+
+
+class PartUsageSerializer(AircraftModelSerializer):
     class Meta:
         model = PartUsage
         fields = ('plane_assembly',)
 
 
-class PartListSerializer(ModelSerializer):
+class PartListSerializer(AircraftModelSerializer):
     team = SerializerMethodField()
     part_type = CharField(source='get_part_type_display', read_only=True)
     user = PresentablePrimaryKeyRelatedField(presentation_serializer=UserSerializer, read_only=True)
     part_usages = SerializerMethodField()  # PartUsage bilgilerini ekleyin, yani uçakta kullanıldıysa hangi uçakta kullanıldı
 
     def get_part_usages(self, obj: Part) -> list:
-        return PartUsageSerializer(obj.usage_history.all(), many=True).data if obj.usage_history.exists() else []
+        # usage_history prefetch edildiği için burada ek sorgu çalışmaz, kullanılmamış parçalar için boş liste döner.
+        return PartUsageSerializer(obj.usage_history.all(), many=True).data
 
     def get_team(self, obj: Part) -> str:
         return obj.user.team.get_team_type_display() if obj.user and obj.user.team else None
@@ -99,39 +120,17 @@ class CreatePlaneAssemblySerializer(Serializer): # Uçak üretme serializerı
         return parts
 
     def _validate_part_amounts(self, parts):
-        # Part tiplerinin Türkçe karşılıkları
-        part_type_display_map = {
-            "WING": "Kanat",
-            "FUSELAGE": "Gövde",
-            "TAIL": "Kuyruk",
-            "AVIONICS": "Aviyonik"
-        }
-
         plane_type = self.initial_data['plane_type']
-        parts_used = parts
-        
-        # Her parça tipi için gereken miktarları kontrol et
-        for part_data in parts_used:
-            part_type = part_data['part_type']
-            part_amount = part_data['amount']
-            
-            # Parça tipinin Türkçe karşılığını al
-            part_type_display = part_type_display_map.get(part_type, part_type)
-            
-            # Kullanılabilir parçaları bul
-            available_parts = Part.objects.filter(
-                part_type=part_type,
-                plane_type=plane_type,
-                used_in_plane=False
-            )
-            
-            # Yeterli parça var mı kontrol et
-            if available_parts.count() < part_amount:
-                raise ValidationError(
-                    f"{plane_type} uçağı için {part_type_display} parçası eksik, "
-                    f"{part_amount - available_parts.count()} adet parça bulunamadı."
-                )
+        requirements = build_requirements(parts)
+
+        # Tüm parça tipleri için kullanılabilir parça sayıları envanter sayaçlarından tek sorguda alınır
+        available_counts = get_available_counts(plane_type, requirements)
 
+        # Yeterli parça var mı kontrol et
+        for part_type, part_amount in requirements.items():
+            available = available_counts.get(part_type, 0)
+            if available < part_amount:
+                raise_missing_parts(plane_type, part_type, part_amount - available)
 
     def create(self, validated_data):
         parts_data = validated_data.pop('parts_used')
@@ -140,29 +139,36 @@ class CreatePlaneAssemblySerializer(Serializer): # Uçak üretme serializerı
 
         with transaction.atomic():
             plane_assembly = PlaneAssembly.objects.create(plane_type=plane_type, user=user)
+            # Parçalar allocation motoru ile toplu olarak seçilip uçağa bağlanıyor
+            requirements = build_requirements(parts_data)
+            events.plane_assembled(plane_assembly, requirements) # Olay commit sonrası gönderilir, montaj geri alınırsa gönderilmez
+            allocate_parts(plane_assembly, requirements)
 
-            # PartUsage nesneleri oluşturuluyor
-            for part_data in parts_data:
-                part_type = part_data.get('part_type')
-                amount = part_data.get('amount')
-                part_plane_type = part_data.get('plane_type')
+        return plane_assembly
 
-                available_parts = Part.objects.filter(plane_type=part_plane_type, part_type=part_type, used_in_plane=False)
-                if available_parts.count() < amount:
-                    raise ValidationError(f"{self.initial_data['plane_type']} uçağı için {part_type} parçası eksik, {amount} adet parça bulunamadı.")
 
-                # PartUsage kaydediliyor
-                for part in available_parts[:amount]:
-                    PartUsage.objects.create(part=part, plane_assembly=plane_assembly)
-                    part.used_in_plane = True
-                    part.save()
+class PlaneAssemblyListSerializer(AircraftModelSerializer):
+    """
+        Uçak listesinin kompakt gösterimi. Parçalar iç içe serialize edilmez; queryset'in with_part_summary()
+        ile hesapladığı parça id'leri ve parça tipine göre sayılar döner. Tam gösterim için detay endpointi kullanılır.
+    """
+    parts_used = SerializerMethodField()
+    part_counts = SerializerMethodField()
 
-        return plane_assembly
+    def get_parts_used(self, obj: PlaneAssembly) -> list:
+        return obj.part_ids
+
+    def get_part_counts(self, obj: PlaneAssembly) -> dict:
+        return {part_type: getattr(obj, f"{part_type.lower()}_count") for part_type in Part.PartTypes.values}
+
+    class Meta:
+        model = PlaneAssembly
+        fields = ('id', 'plane_type', 'parts_used', 'part_counts', 'user', 'created_at')
 
 
-class PlaneAssemblyListSerializer(ModelSerializer):
+class PlaneAssemblyDetailSerializer(AircraftModelSerializer):
     parts_used = PartListSerializer(many=True, read_only=True)
 
     class Meta:
         model = PlaneAssembly
-        fields = ('id', 'plane_type', 'parts_used', 'user', 'created_at')
\ No newline at end of file
+        fields = ('id', 'plane_type', 'parts_used', 'user', 'created_at')
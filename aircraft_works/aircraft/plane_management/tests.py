@@ -1,8 +1,24 @@
+import asyncio
+import json
+import threading
+import time
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models import Count, F
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 from aircraft.accounts.models import User, Team
-from aircraft.plane_management.models import Part, PlaneAssembly
+from aircraft.core.events import hub
+from aircraft.plane_management.allocation import free_parts
+from aircraft.plane_management.inventory import find_drift, get_available_counts, get_plane_scores, rebuild_counters, record_parts_created
+from aircraft.plane_management.models import Part, PartUsage, PlaneAssembly
 
 
 class PartViewTests(APITestCase):
@@ -108,6 +124,22 @@ class PartViewTests(APITestCase):
         self.assertEqual(new_part.plane_type, 'TB2')
         self.assertEqual(new_part.user, self.wing_user)
 
+    def test_bulk_part_creation_is_inserted_in_batches(self):
+        """Büyük miktarlar tek doğrulama ile gruplar halinde eklenmeli ve özet dönmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+
+        with self.settings(PART_CREATE_BATCH_SIZE=10), CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('part_management'), {'part_type': 'WING', 'plane_type': 'TB2', 'quantity': 35}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 35)
+        created = list(Part.objects.filter(plane_type="TB2").exclude(id=self.wing_part.id).order_by('id').values_list('id', flat=True))
+        self.assertEqual(len(created), 35)
+        self.assertEqual((response.data['first_id'], response.data['last_id']), (created[0], created[-1]))
+
+        part_inserts = [query for query in queries if query['sql'].startswith(f'INSERT INTO "{Part._meta.db_table}"')]
+        self.assertEqual(len(part_inserts), 4)
+
     def test_part_creation_with_wrong_part_type(self):
         """Yanlış parça tipi ile oluşturuyoruzma testi"""
         # Kanat takımı kullanıcısı ile giriş yapıyoruz
@@ -176,6 +208,110 @@ class PartViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+class PartListQueryCountTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.plane = PlaneAssembly.objects.create(plane_type="TB2")
+        self.client.force_authenticate(user=self.wing_user)
+
+    def _create_parts(self, count):
+        parts = Part.objects.bulk_create([Part(part_type="WING", plane_type="TB2", user=self.wing_user) for _ in range(count)])
+        # Parçaların yarısı bir uçakta kullanılmış olsun ki kullanım geçmişi de serialize edilsin
+        PartUsage.objects.bulk_create([PartUsage(part=part, plane_assembly=self.plane) for part in parts[::2]])
+
+    def _list_query_count(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('part_management'), {'page_size': page_size})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), min(page_size, Part.objects.count()))
+        return len(queries)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        """Sayfa boyutu artsa da parça listeleme sorgu sayısı sabit kalmalı"""
+        self._create_parts(4)
+        small_page_queries = self._list_query_count(4)
+
+        self._create_parts(60)
+        large_page_queries = self._list_query_count(64)
+
+        self.assertEqual(small_page_queries, large_page_queries)
+
+    def test_list_serializes_usage_history(self):
+        """Kullanılmış parçaların kullanım geçmişi listede dönmeli"""
+        self._create_parts(2)
+        response = self.client.get(reverse('part_management'))
+
+        usages = [part['part_usages'] for part in response.data['results']]
+        self.assertIn([], usages)
+        self.assertIn([{'plane_assembly': self.plane.id}], usages)
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        cache.clear()
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.assembly_team = Team.objects.create(team_type="ASSEMBLY")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.assembly_user = User.objects.create(email="assembly@example.com", team=self.assembly_team, is_active=True)
+        self.parts = Part.objects.bulk_create([Part(part_type="WING", plane_type="TB2", user=self.wing_user) for _ in range(25)])
+        record_parts_created("WING", "TB2", len(self.parts))
+
+    def test_walk_pages_with_cursor(self):
+        """next linkleri takip edilerek tüm parçalar bir kez ve yeniden eskiye doğru gelmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        url = reverse('part_management')
+        seen = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(part['created_at'] for part in response.data['results'])
+            url = response.data['next']
+            pages += 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+        # Geri gelmek için previous linki kullanılabilmeli
+        first_page = self.client.get(reverse('part_management'))
+        second_page = self.client.get(first_page.data['next'])
+        back = self.client.get(second_page.data['previous'])
+        self.assertEqual(back.data['results'], first_page.data['results'])
+
+    def test_count_is_read_from_inventory_counters(self):
+        """with_count istendiğinde toplam parça sayısı Part tablosu sayılmadan dönmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('part_management'), {'with_count': 'true'})
+
+        self.assertEqual(response.data['count'], 25)
+        self.assertFalse(any('COUNT(' in query['sql'].upper() for query in queries))
+
+    def test_page_size_is_capped(self):
+        """İstemci en fazla 100 kayıtlık sayfa isteyebilmeli"""
+        Part.objects.bulk_create([Part(part_type="WING", plane_type="TB2", user=self.wing_user) for _ in range(100)])
+        self.client.force_authenticate(user=self.wing_user)
+
+        response = self.client.get(reverse('part_management'), {'page_size': 10000})
+
+        self.assertEqual(len(response.data['results']), 100)
+
+    def test_plane_count_uses_cached_count(self):
+        """Uçak listesinde toplam sayı kısa süreli cache'ten dönmeli"""
+        PlaneAssembly.objects.create(plane_type="TB2", user=self.assembly_user)
+        self.client.force_authenticate(user=self.assembly_user)
+        url = reverse('plane_management')
+
+        self.assertEqual(self.client.get(url, {'with_count': 'true'}).data['count'], 1)
+        PlaneAssembly.objects.create(plane_type="TB2", user=self.assembly_user)
+        self.assertEqual(self.client.get(url, {'with_count': 'true'}).data['count'], 1)
+
+
 class PartScoreTests(APITestCase):
     def setUp(self):
         """Test öncesi gerekli verileri oluşturuyoruz"""
@@ -303,6 +439,214 @@ class PartScoreTests(APITestCase):
             self.assertEqual(response.data['error'], "Bu takım parçalar üretmiyor.")
 
 
+class PartScoreCacheTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        cache.clear()
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        Part.objects.create(part_type="WING", plane_type="TB2", user=self.wing_user)
+        self.client.force_authenticate(user=self.wing_user)
+
+    def test_score_is_served_from_cache(self):
+        """Skor ikinci istekte sayaçlar okunmadan cache'ten dönmeli, sadece ETag versiyonu okunmalı"""
+        url = reverse('parts_score')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1): # ETag versiyonları veritabanında tutuluyor (core.EtagVersion).
+            second = self.client.get(url)
+        self.assertEqual(second.data, first.data)
+
+    def test_score_cache_is_invalidated_on_part_change(self):
+        """Takımın parçaları değiştiğinde skor cache'i yenilenmeli"""
+        url = reverse('parts_score')
+        self.assertEqual(self.client.get(url).data['scores']['TB2']['unused'], 1)
+
+        response = self.client.post(reverse('part_management'), {'part_type': 'WING', 'plane_type': 'TB2', 'quantity': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(url).data['scores']['TB2']['unused'], 3)
+
+        part = Part.objects.filter(part_type="WING").first()
+        self.client.delete(reverse('part_details', kwargs={'pk': part.id}))
+        self.assertEqual(self.client.get(url).data['scores']['TB2']['unused'], 2)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        cache.clear()
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.assembly_team = Team.objects.create(team_type="ASSEMBLY")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.assembly_user = User.objects.create(email="assembly@example.com", team=self.assembly_team, is_active=True)
+        Part.objects.create(part_type="WING", plane_type="TB2", user=self.wing_user)
+
+    def _assert_not_modified(self, url, etag):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+        self.assertFalse([query for query in queries if 'plane_management' in query['sql']])
+
+    def test_part_list_returns_304_until_parts_change(self):
+        """Parça listesi değişmedikçe 304, yeni parça üretildiğinde 200 dönmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        url = reverse('part_management')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('Authorization', first['Vary'])
+        self._assert_not_modified(url, first['ETag'])
+
+        # Farklı query string farklı ETag üretir
+        self.assertNotEqual(self.client.get(url, {'page_size': 1})['ETag'], first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True): # Versiyonlar commit sonrası değişiyor
+            self.client.post(url, {'part_type': 'WING', 'plane_type': 'TB2', 'quantity': 1}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_part_list_changes_when_part_owner_changes(self):
+        """Sayaçları değiştirmeyen güncellemeler (ör. kullanıcı) de ETag'i değiştirmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        url = reverse('part_management')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other_user = User.objects.create(email="wing2@example.com", team=self.wing_team, is_active=True)
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+        etag = self.client.get(url)['ETag']
+
+        part = Part.objects.get()
+        part.user = other_user
+        with self.captureOnCommitCallbacks(execute=True):
+            part.save()
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_score_returns_304_until_inventory_changes(self):
+        """Skor endpointi envanter değişmedikçe 304 dönmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        url = reverse('parts_score')
+        first = self.client.get(url)
+        self._assert_not_modified(url, first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Part.objects.create(part_type="WING", plane_type="TB2", user=self.wing_user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['scores']['TB2']['unused'], 2)
+
+    def test_plane_list_changes_when_plane_is_assembled(self):
+        """Uçak listesi yeni uçak üretildiğinde yenilenmeli"""
+        self.client.force_authenticate(user=self.assembly_user)
+        url = reverse('plane_management')
+        first = self.client.get(url)
+        self._assert_not_modified(url, first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PlaneAssembly.objects.create(plane_type="TB2", user=self.assembly_user)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, status.HTTP_200_OK)
+
+    def test_etag_is_not_used_for_other_teams_or_writes(self):
+        """Montaj takımının parça listesi ve POST cevapları ETag içermemeli"""
+        self.client.force_authenticate(user=self.assembly_user)
+        self.assertFalse(self.client.get(reverse('part_management')).has_header('ETag'))
+
+        self.client.force_authenticate(user=self.wing_user)
+        response = self.client.post(reverse('part_management'), {'part_type': 'WING', 'plane_type': 'TB2', 'quantity': 1}, format='json', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_permissions_are_checked_before_etag(self):
+        """Yetkisi olmayan kullanıcı geçerli bir ETag gönderse de 304 almamalı"""
+        self.client.force_authenticate(user=self.wing_user)
+        etag = self.client.get(reverse('part_management'))['ETag']
+
+        self.client.force_authenticate(user=self.assembly_user)
+        response = self.client.get(reverse('part_management'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DashboardTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        cache.clear()
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.assembly_team = Team.objects.create(team_type="ASSEMBLY")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.assembly_user = User.objects.create(email="assembly@example.com", team=self.assembly_team, is_active=True)
+        self.no_team_user = User.objects.create(email="noteam@example.com", is_active=True)
+        self.parts = [Part.objects.create(part_type="WING", plane_type="TB2", user=self.wing_user) for _ in range(15)]
+
+    def test_part_team_receives_parts_and_score(self):
+        """Parça takımı parçaların ilk sayfasını ve skorları tek istekte almalı, sonraki sayfa parça endpointinden okunmalı"""
+        self.client.force_authenticate(user=self.wing_user)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['team'], 'WING')
+        self.assertNotIn('planes', response.data)
+        self.assertEqual(response.data['score']['scores']['TB2'], {'used': 0, 'unused': 15})
+        self.assertEqual(response.data['score']['part_type'], 'Kanat')
+
+        parts = response.data['parts']
+        self.assertEqual(parts['count'], 15)
+        self.assertEqual([part['id'] for part in parts['results']], [str(part.id) for part in reversed(self.parts)][:10])
+        self.assertIn(reverse('part_management'), parts['next'])
+
+        next_page = self.client.get(parts['next'])
+        self.assertEqual(len(next_page.data['results']), 5)
+
+    def test_section_size_is_capped(self):
+        """?size= ile bölüm boyutu değişmeli ama DASHBOARD_MAX_SECTION_SIZE'ı aşmamalı"""
+        self.client.force_authenticate(user=self.wing_user)
+        response = self.client.get(reverse('dashboard'), {'size': 4})
+        self.assertEqual(len(response.data['parts']['results']), 4)
+        self.assertIn('page_size=4', response.data['parts']['next'])
+
+        with self.settings(DASHBOARD_MAX_SECTION_SIZE=12):
+            response = self.client.get(reverse('dashboard'), {'size': 1000})
+        self.assertEqual(len(response.data['parts']['results']), 12)
+
+    def test_query_count_matches_separate_endpoints(self):
+        """Dashboard, parça listesi ve skor endpointlerinin toplamından daha az sorgu çalıştırmalı"""
+        self.client.force_authenticate(user=self.wing_user)
+        with CaptureQueriesContext(connection) as separate:
+            self.client.get(reverse('part_management'), {'with_count': 'true'})
+            self.client.get(reverse('parts_score'))
+        cache.clear()
+        with CaptureQueriesContext(connection) as combined:
+            self.client.get(reverse('dashboard'))
+        self.assertLess(len(combined), len(separate))
+
+    def test_assembly_team_receives_planes(self):
+        """Montaj takımı uçakların ilk sayfasını almalı"""
+        PlaneAssembly.objects.create(plane_type="TB2", user=self.assembly_user)
+        self.client.force_authenticate(user=self.assembly_user)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['team'], 'ASSEMBLY')
+        self.assertNotIn('parts', response.data)
+        self.assertEqual(response.data['planes']['count'], 1)
+        self.assertEqual(len(response.data['planes']['results']), 1)
+
+    def test_dashboard_returns_304_until_data_changes(self):
+        """Veriler değişmedikçe 304 dönmeli"""
+        self.client.force_authenticate(user=self.wing_user)
+        etag = self.client.get(reverse('dashboard'))['ETag']
+        self.assertEqual(self.client.get(reverse('dashboard'), HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Part.objects.create(part_type="WING", plane_type="TB2", user=self.wing_user)
+        self.assertEqual(self.client.get(reverse('dashboard'), HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_user_without_team(self):
+        """Takımı olmayan kullanıcı 400 almalı"""
+        self.client.force_authenticate(user=self.no_team_user)
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class PlaneAssemblyTests(APITestCase):
     def setUp(self):
         """Test öncesi gerekli verileri oluşturuyoruz"""
@@ -431,6 +775,42 @@ class PlaneAssemblyTests(APITestCase):
         self.avionics_part.refresh_from_db()
         self.assertTrue(self.avionics_part.used_in_plane)
 
+    def _assemble_with_avionics(self, amount):
+        """Verilen adette aviyonik ile AKINCI üretir ve çalışan sorgu sayısını döner"""
+        for _ in range(amount):
+            Part.objects.create(part_type="WING", plane_type="AKINCI", user=self.wing_user)
+            Part.objects.create(part_type="WING", plane_type="AKINCI", user=self.wing_user)
+            Part.objects.create(part_type="FUSELAGE", plane_type="AKINCI", user=self.fuselage_user)
+            Part.objects.create(part_type="TAIL", plane_type="AKINCI", user=self.tail_user)
+            Part.objects.create(part_type="AVIONICS", plane_type="AKINCI", user=self.avionics_user)
+
+        self.client.force_authenticate(user=self.assembly_user)
+        data = {
+            "plane_type": "AKINCI",
+            "parts_used": [
+                {"part_type": "FUSELAGE", "plane_type": "AKINCI", "amount": 1},
+                {"part_type": "WING", "plane_type": "AKINCI", "amount": 2},
+                {"part_type": "TAIL", "plane_type": "AKINCI", "amount": 1},
+                {"part_type": "AVIONICS", "plane_type": "AKINCI", "amount": amount},
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('plane_management'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return len(queries)
+
+    def test_plane_assembly_query_count_is_constant(self):
+        """Aviyonik sayısı artsa da montajın sorgu sayısı sabit kalmalı"""
+        single_avionics_queries = self._assemble_with_avionics(1)
+        many_avionics_queries = self._assemble_with_avionics(6)
+
+        self.assertEqual(single_avionics_queries, many_avionics_queries)
+
+        # Her uçak için kullanılan parçalar tek seferde işaretlenmiş olmalı
+        plane = PlaneAssembly.objects.latest('created_at')
+        self.assertEqual(plane.parts_used.filter(part_type="AVIONICS").count(), 6)
+        self.assertFalse(plane.parts_used.filter(used_in_plane=False).exists())
+
     def test_plane_assembly_without_auth(self):
         """Giriş yapmadan uçak üretme testi"""
         url = reverse('plane_management')
@@ -581,6 +961,71 @@ class PlaneAssemblyTests(APITestCase):
         self.assertGreaterEqual(len(parts_used), 5)  # En az 2 kanat + 1 gövde + 1 kuyruk + 1 aviyonik olmalı
 
 
+class PlaneListTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.assembly_team = Team.objects.create(team_type="ASSEMBLY")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.assembly_user = User.objects.create(email="assembly@example.com", team=self.assembly_team, is_active=True)
+        self.client.force_authenticate(user=self.assembly_user)
+
+    def _create_planes(self, count):
+        """Her uçak için 2 kanat, 1 gövde, 1 kuyruk ve 2 aviyonik bağlanmış uçaklar oluşturur"""
+        for _ in range(count):
+            plane = PlaneAssembly.objects.create(plane_type="TB2", user=self.assembly_user)
+            part_types = ["WING", "WING", "FUSELAGE", "TAIL", "AVIONICS", "AVIONICS"]
+            parts = Part.objects.bulk_create([
+                Part(part_type=part_type, plane_type="TB2", user=self.wing_user, used_in_plane=True) for part_type in part_types
+            ])
+            PartUsage.objects.bulk_create([PartUsage(part=part, plane_assembly=plane) for part in parts])
+
+    def test_compact_plane_listing(self):
+        """Uçak listesi parça id'lerini ve parça tipine göre sayıları dönmeli"""
+        self._create_planes(1)
+        plane = PlaneAssembly.objects.get()
+
+        response = self.client.get(reverse('plane_management'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data['results'][0]
+        self.assertEqual(result['part_counts'], {"WING": 2, "FUSELAGE": 1, "TAIL": 1, "AVIONICS": 2})
+        self.assertEqual(sorted(result['parts_used']), sorted(plane.parts_used.values_list('id', flat=True)))
+
+    def test_plane_list_query_count_does_not_grow(self):
+        """Uçak ve parça sayısı artsa da uçak listeleme sorgu sayısı sabit kalmalı"""
+        self._create_planes(2)
+        with CaptureQueriesContext(connection) as few_planes:
+            self.client.get(reverse('plane_management'), {'page_size': 50})
+
+        self._create_planes(20)
+        with CaptureQueriesContext(connection) as many_planes:
+            response = self.client.get(reverse('plane_management'), {'page_size': 50})
+
+        self.assertEqual(len(response.data['results']), 22)
+        self.assertEqual(len(few_planes), len(many_planes))
+
+    def test_plane_detail_returns_nested_parts(self):
+        """Uçak detayı kullanılan parçaları tüm bilgileriyle dönmeli"""
+        self._create_planes(1)
+        plane = PlaneAssembly.objects.get()
+
+        response = self.client.get(reverse('plane_details', kwargs={'pk': plane.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['parts_used']), 6)
+        self.assertEqual(response.data['parts_used'][0]['team'], 'Kanat Takımı')
+
+    def test_plane_detail_with_non_assembly_team(self):
+        """Montaj takımı dışındaki kullanıcılar uçak detayını görememeli"""
+        self._create_planes(1)
+        self.client.force_authenticate(user=self.wing_user)
+
+        response = self.client.get(reverse('plane_details', kwargs={'pk': PlaneAssembly.objects.get().id}))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class PartDetailTests(APITestCase):
     def setUp(self):
         """Test öncesi gerekli verileri oluşturuyoruz"""
@@ -743,3 +1188,290 @@ class PartDetailTests(APITestCase):
             self.wing_part.refresh_from_db()
 
 
+
+
+class ConcurrentPlaneAssemblyTests(TransactionTestCase):
+    """Paralel montaj isteklerinin aynı parçayı iki kez kullanmadığını doğrulayan stres testi"""
+    worker_count = 8
+    plane_stock = 6
+
+    def setUp(self):
+        """Test öncesi sabit bir parça stoğu oluşturuyoruz"""
+        teams = {team_type: Team.objects.create(team_type=team_type) for team_type in ["WING", "FUSELAGE", "TAIL", "AVIONICS", "ASSEMBLY"]}
+        self.users = {
+            team_type: User.objects.create(email=f"{team_type.lower()}@example.com", team=team, is_active=True)
+            for team_type, team in teams.items()
+        }
+
+        # plane_stock adet uçağa yetecek kadar AKINCI parçası
+        parts = []
+        for _ in range(self.plane_stock):
+            parts.append(Part(part_type="WING", plane_type="AKINCI", user=self.users["WING"]))
+            parts.append(Part(part_type="WING", plane_type="AKINCI", user=self.users["WING"]))
+            parts.append(Part(part_type="FUSELAGE", plane_type="AKINCI", user=self.users["FUSELAGE"]))
+            parts.append(Part(part_type="TAIL", plane_type="AKINCI", user=self.users["TAIL"]))
+            parts.append(Part(part_type="AVIONICS", plane_type="AKINCI", user=self.users["AVIONICS"]))
+        Part.objects.bulk_create(parts)
+        rebuild_counters()
+
+    def _assemble(self, barrier, results):
+        """Her thread kendi veritabanı bağlantısı ile bir uçak üretmeye çalışır"""
+        client = APIClient()
+        client.force_authenticate(user=self.users["ASSEMBLY"])
+        data = {
+            "plane_type": "AKINCI",
+            "parts_used": [
+                {"part_type": "FUSELAGE", "plane_type": "AKINCI", "amount": 1},
+                {"part_type": "WING", "plane_type": "AKINCI", "amount": 2},
+                {"part_type": "TAIL", "plane_type": "AKINCI", "amount": 1},
+                {"part_type": "AVIONICS", "plane_type": "AKINCI", "amount": 1},
+            ]
+        }
+        try:
+            barrier.wait()
+            response = client.post(reverse('plane_management'), data, format='json')
+            results.append(response.status_code)
+        finally:
+            connections.close_all()
+
+    def test_parallel_assemblies_do_not_double_book_parts(self):
+        """Stoktan fazla paralel istek geldiğinde stok kadar uçak üretilmeli ve hiçbir parça iki kez kullanılmamalı"""
+        barrier = threading.Barrier(self.worker_count)
+        results = []
+        threads = [threading.Thread(target=self._assemble, args=(barrier, results)) for _ in range(self.worker_count)]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        # Stok kadar istek başarılı olmalı, geri kalanlar eksik parça hatası almalı
+        self.assertEqual(len(results), self.worker_count)
+        self.assertEqual(results.count(status.HTTP_201_CREATED), self.plane_stock)
+        self.assertEqual(results.count(status.HTTP_400_BAD_REQUEST), self.worker_count - self.plane_stock)
+
+        # Hiçbir parça birden fazla uçakta kullanılmamalı
+        usage_count = PartUsage.objects.count()
+        self.assertEqual(usage_count, self.plane_stock * 5)
+        self.assertEqual(PartUsage.objects.values('part').distinct().count(), usage_count)
+        self.assertEqual(PlaneAssembly.objects.count(), self.plane_stock)
+        for plane in PlaneAssembly.objects.all():
+            self.assertEqual(plane.parts_used.count(), 5)
+        self.assertFalse(Part.objects.filter(used_in_plane=False).exists())
+
+        # Paralel istekler birbirini beklemeden tamamlanmalı (saniyede en az 1 montaj isteği)
+        self.assertGreater(self.worker_count / elapsed, 1)
+
+
+class PartInventoryTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.client.force_authenticate(user=self.wing_user)
+
+    def _counters(self, part_type, plane_type):
+        return get_available_counts(plane_type, [part_type]).get(part_type, 0), get_plane_scores(part_type)[plane_type]["used"]
+
+    def test_counters_follow_part_lifecycle(self):
+        """Parça oluşturma, güncelleme, kullanma ve silme işlemleri sayaçlara yansımalı"""
+        response = self.client.post(reverse('part_management'), {'part_type': 'WING', 'plane_type': 'TB2', 'quantity': 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._counters("WING", "TB2"), (3, 0))
+
+        # Uçak tipi güncellenen parça bir kovadan diğerine taşınmalı
+        part = Part.objects.filter(part_type="WING").first()
+        response = self.client.patch(reverse('part_details', kwargs={'pk': part.id}), {'plane_type': 'TB3'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._counters("WING", "TB2"), (2, 0))
+        self.assertEqual(self._counters("WING", "TB3"), (1, 0))
+
+        # Uçakta kullanılan parça kullanılabilirden kullanılmışa geçmeli
+        used_part = Part.objects.filter(plane_type="TB2").first()
+        used_part.used_in_plane = True
+        used_part.save()
+        self.assertEqual(self._counters("WING", "TB2"), (1, 1))
+
+        # Silinen parça sayaçlardan düşmeli
+        response = self.client.delete(reverse('part_details', kwargs={'pk': part.id}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self._counters("WING", "TB3"), (0, 0))
+        self.assertEqual(find_drift(), {})
+
+    def test_rebuild_command_repairs_drift(self):
+        """rebuild_part_inventory komutu bozulmuş sayaçları Part tablosundan yeniden oluşturmalı"""
+        Part.objects.bulk_create([Part(part_type="WING", plane_type="AKINCI", user=self.wing_user) for _ in range(4)])
+        self.assertNotEqual(find_drift(), {})
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_part_inventory', '--check', stdout=StringIO())
+
+        call_command('rebuild_part_inventory', stdout=StringIO())
+        self.assertEqual(find_drift(), {})
+        self.assertEqual(self._counters("WING", "AKINCI"), (4, 0))
+
+
+class BigIntegerPrimaryKeyTests(APITestCase):
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+
+    def test_ids_are_stored_as_bigint_and_returned_as_string(self):
+        """id'ler veritabanında bigint olarak saklanmalı, Python ve API tarafında string olarak dönmeli"""
+        part = Part.objects.create(part_type="WING", plane_type="TB2", user=self.wing_user)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT data_type FROM information_schema.columns WHERE table_name = %s AND column_name = 'id'",
+                [Part._meta.db_table],
+            )
+            self.assertEqual(cursor.fetchone()[0], 'bigint')
+
+        fetched = Part.objects.select_related('user__team').get(id=part.id)
+        self.assertIsInstance(fetched.id, str)
+        self.assertIsInstance(fetched.user_id, str)
+        self.assertEqual(fetched.user.team.id, self.wing_team.id)
+
+        self.client.force_authenticate(user=self.wing_user)
+        response = self.client.get(reverse('part_details', kwargs={'pk': part.id}))
+        self.assertEqual(response.data['id'], part.id)
+
+    def test_ids_are_ordered_numerically(self):
+        """Basamak sayısı farklı id'ler string sırasına göre değil sayısal sıraya göre sıralanmalı"""
+        Part.objects.create(id="999", part_type="WING", plane_type="TB2", user=self.wing_user)
+        Part.objects.create(id="1000", part_type="WING", plane_type="TB2", user=self.wing_user)
+
+        ids = list(Part.objects.filter(id__in=["999", "1000"]).order_by('id').values_list('id', flat=True))
+        self.assertEqual(ids, ["999", "1000"])
+
+
+class GenerateDatasetTests(APITestCase):
+    def _generate(self, seed=7):
+        call_command('generate_dataset', '--parts', '400', '--users-per-team', '2', '--seed', str(seed), '--reset', stdout=StringIO())
+        return sorted(Part.objects.values_list('part_type', 'plane_type', 'used_in_plane').annotate(count=Count('id')))
+
+    def test_dataset_is_consistent_and_reproducible(self):
+        """Üretilen veri tutarlı olmalı ve aynı seed ile aynı dağılım tekrar üretilmeli"""
+        distribution = self._generate()
+        self.assertEqual(Part.objects.count(), 400)
+        self.assertEqual(User.objects.filter(email__startswith="dataset-").count(), 2 * len(Team.Team.values))
+        self.assertEqual(find_drift(), {})
+
+        # Her uçakta her parça tipinden bir parça kullanılmış olmalı ve kullanılan parçalar işaretlenmiş olmalı
+        planes = PlaneAssembly.objects.count()
+        self.assertGreater(planes, 0)
+        self.assertEqual(PartUsage.objects.count(), planes * len(Part.PartTypes.values))
+        self.assertEqual(Part.objects.filter(used_in_plane=True).count(), PartUsage.objects.count())
+        self.assertFalse(PartUsage.objects.exclude(part__plane_type=F('plane_assembly__plane_type')).exists())
+
+        self.assertEqual(self._generate(), distribution)
+        self.assertEqual(User.objects.filter(email__startswith="dataset-").count(), 2 * len(Team.Team.values))
+
+
+class PartIndexTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Planner'ın ipucu olmadan index seçeceği büyüklükte bir veri seti oluşturuluyor (generate_dataset ANALYZE de çalıştırır)"""
+        call_command('generate_dataset', '--parts', '50000', '--users-per-team', '20', stdout=StringIO())
+        cls.team = Team.objects.get(team_type="WING")
+        cls.user = User.objects.filter(team=cls.team).first()
+        cls.part = Part.objects.filter(part_type="WING", used_in_plane=False).first()
+
+    def assertUsesIndex(self, queryset, index_name=None):
+        # Küçük tablolar (kullanıcı, takım) sıralı taranabilir; sadece Part tablosunun sıralı taranmaması bekleniyor.
+        plan = queryset.explain()
+        self.assertNotIn(f"Seq Scan on {Part._meta.db_table}", plan)
+        if index_name:
+            self.assertIn(index_name, plan)
+
+    def test_free_part_allocation_uses_partial_index(self):
+        """Montajda boştaki parçaların seçimi kısmi index ile yapılmalı"""
+        self.assertUsesIndex(free_parts("TB2", "WING", 2), "part_free_alloc_idx")
+
+    def test_part_list_uses_type_and_created_index(self):
+        """Parça listesi parça tipi ve cursor sıralaması index'i ile okunmalı"""
+        self.assertUsesIndex(Part.objects.filter(part_type="WING").order_by('-created_at', '-id')[:11], "part_type_created_idx")
+
+    def test_team_part_queries_use_indexes(self):
+        """Takımın parçaları, parça detayı ve kullanıcının parçaları (kullanıcı silinirken SET NULL) sıralı tarama yapmamalı"""
+        self.assertUsesIndex(Part.objects.filter(part_type="WING", user__team=self.team), "part_user_type_idx")
+        self.assertUsesIndex(Part.objects.filter(part_type="WING", user__team=self.team, pk=self.part.pk))
+        self.assertUsesIndex(Part.objects.filter(user=self.user, part_type="WING"), "part_user_type_idx")
+        self.assertUsesIndex(Part.objects.filter(user_id__in=[self.user.pk]), "part_user_type_idx")
+
+
+@override_settings(EVENTS_ENABLED=True)
+class EventStreamTests(TransactionTestCase):
+    """Olayların commit sonrası NOTIFY ile dinleyiciye ulaşıp SSE akışına yazıldığını doğrulayan test"""
+
+    def setUp(self):
+        """Test öncesi gerekli verileri oluşturuyoruz"""
+        self.wing_team = Team.objects.create(team_type="WING")
+        self.wing_user = User.objects.create(email="wing@example.com", team=self.wing_team, is_active=True)
+        self.addCleanup(hub.stop)
+
+        client = APIClient()
+        client.force_authenticate(user=self.wing_user)
+        response = client.post(reverse('events_ticket'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.ticket = response.data['ticket']
+
+    async def _next_event(self, stream) -> tuple:
+        frame = (await asyncio.wait_for(anext(stream), 5)).decode()
+        lines = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+        return lines['event'], json.loads(lines['data'])
+
+    async def test_committed_changes_are_streamed(self):
+        """Parça üretimi commit olduktan sonra takımın akışına parça ve skor olayları gelmeli"""
+        response = await AsyncClient().get(reverse('events'), {'ticket': self.ticket})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"retry: "))
+        self.assertTrue(await asyncio.to_thread(hub.wait_until_listening, 5))
+
+        part = await sync_to_async(Part.objects.create)(part_type="WING", plane_type="TB2", user=self.wing_user)
+        self.assertEqual(await self._next_event(stream), ('part.created', {
+            'part_type': 'WING', 'plane_type': 'TB2', 'count': 1, 'first_id': str(part.id), 'last_id': str(part.id),
+        }))
+        self.assertEqual(await self._next_event(stream), ('score.delta', {'part_type': 'WING', 'plane_type': 'TB2', 'available': 1, 'used': 0}))
+        await stream.aclose()
+
+    async def test_stream_requires_valid_ticket(self):
+        """Geçersiz biletle akış açılamamalı"""
+        response = await AsyncClient().get(reverse('events'), {'ticket': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_stream_rejects_ticket_of_deactivated_or_reteamed_user(self):
+        """Bilet alındıktan sonra pasife alınan ya da takımı değişen kullanıcı eski biletle akışı açamamalı"""
+        self.wing_user.is_active = False
+        await sync_to_async(self.wing_user.save)()
+        response = await AsyncClient().get(reverse('events'), {'ticket': self.ticket})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.wing_user.is_active = True
+        await sync_to_async(self.wing_user.save)()
+        client = APIClient()
+        client.force_authenticate(user=self.wing_user)
+        ticket = (await sync_to_async(client.post)(reverse('events_ticket'))).data['ticket']
+        self.wing_user.team = await Team.objects.acreate(team_type="TAIL")
+        await sync_to_async(self.wing_user.save)()
+        response = await AsyncClient().get(reverse('events'), {'ticket': ticket})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(hub.client_count, 0)
+
+    def test_stream_is_not_served_over_wsgi(self):
+        """WSGI ile gelen akış isteği worker'ı meşgul etmeden 501 ile reddedilmeli"""
+        response = APIClient().get(reverse('events'), {'ticket': self.ticket})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertEqual(hub.client_count, 0)
+
+    def test_ticket_is_not_issued_when_disabled(self):
+        """EVENTS_ENABLED kapalıyken (varsayılan) bilet alınamamalı, frontend polling ile devam etmeli"""
+        client = APIClient()
+        client.force_authenticate(user=self.wing_user)
+        with self.settings(EVENTS_ENABLED=False):
+            self.assertEqual(client.post(reverse('events_ticket')).status_code, status.HTTP_404_NOT_FOUND)
+
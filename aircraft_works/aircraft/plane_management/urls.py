@@ -6,5 +6,9 @@ urlpatterns = [
     path("v1/parts/", views.PartView.as_view(), name="part_management"),
     path('v1/parts/<int:pk>/', views.PartRetrieveUpdateDestroyView.as_view(), name='part_details'),
     path('v1/planes/', views.PlaneAssemblyCreateView.as_view(), name='plane_management'),
+    path('v1/planes/<int:pk>/', views.PlaneAssemblyDetailView.as_view(), name='plane_details'),
     path('v1/parts/score/', views.PartScoreView.as_view(), name='parts_score'),
+    path('v1/dashboard/', views.DashboardView.as_view(), name='dashboard'), # Gösterge panelinin ilk açılış verileri tek istekte
+    path('v1/events/', views.EventStreamView.as_view(), name='events'), # Takımın değişikliklerini SSE ile akıtır
+    path('v1/events/ticket/', views.EventTicketView.as_view(), name='events_ticket'),
 ]
@@ -1,12 +1,28 @@
+import asyncio
 from typing import TYPE_CHECKING
 
-from rest_framework.generics import RetrieveUpdateDestroyAPIView, ListCreateAPIView
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Prefetch
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.generics import RetrieveAPIView, RetrieveUpdateDestroyAPIView, ListCreateAPIView
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 
+from aircraft.accounts.models import Team
+from aircraft.core.async_views import AircraftAsyncAPIView
+from aircraft.core.events import RESYNC, EventStreamFull, EventStreamUnavailable, format_event, hub, make_ticket, read_ticket, ticket_is_current
+from aircraft.core.etags import USERS_SCOPE, ConditionalGetMixin, get_versions, make_etag
+from aircraft.core.helpers import generate_unique_id
+from aircraft.core.paginators import AircraftCursorPagination, estimate_table_count
 from aircraft.core.permissions import AircraftIsAuthenticated, IsAircraftAssemblyTeam, IsNotAircraftAssemblyTeam, AircraftIsAuthenticated, HasTeamAndNotAssembly
+from aircraft.plane_management.inventory import PLANES_SCOPE, get_cached_plane_scores, get_part_type_total, inventory_scope
 from aircraft.plane_management.models import Part, PlaneAssembly
-from aircraft.plane_management.serializers import CreatePlaneAssemblySerializer, PartCreateSerializer, PartListSerializer, PlaneAssemblyListSerializer
+from aircraft.plane_management.serializers import CreatePlaneAssemblySerializer, PartCreateSerializer, PartListSerializer, PlaneAssemblyDetailSerializer, PlaneAssemblyListSerializer
 from rest_framework.views import APIView
 
 
@@ -16,8 +32,15 @@ if TYPE_CHECKING:
     from django.db.models.query import QuerySet
     
 
-class PartView(ListCreateAPIView): # Bu view hem parçaların listelenmesini hem de parça üretilmesini sağlar
+def team_part_type(user) -> str | None: # Kullanıcının takımının ürettiği parça tipi, montaj takımı ve takımsız kullanıcılar için None
+    if not user.team or user.team.team_type == Team.Team.ASSEMBLY:
+        return None
+    return user.team.team_type
+
+
+class PartView(ConditionalGetMixin, ListCreateAPIView): # Bu view hem parçaların listelenmesini hem de parça üretilmesini sağlar
     permission_classes = [IsNotAircraftAssemblyTeam] # parça üretme ve listemem montaj ekibi dışında sistemde logi olmuş kullanıcıların hepsi yapabilecek
+    pagination_class = AircraftCursorPagination # Derin sayfalarda da sabit maliyetli cursor sayfalama
 
     def get_serializer_class(self): # Gelen methoda göre uygun serializer sınıfı seçilecek.
         if self.request.method == 'POST':
@@ -44,15 +67,24 @@ class PartView(ListCreateAPIView): # Bu view hem parçaların listelenmesini hem
         if not part_type:
             return Part.objects.none()  # Boş queryset dönüyoruz.
 
-        return Part.objects.filter(part_type=part_type).order_by('-created_at')
+        return Part.objects.with_list_relations().filter(part_type=part_type).order_by('-created_at')
+
+    def get_etag(self, request): # Liste, takımın parça tipinin envanteri ya da kullanıcı bilgileri değişmedikçe aynı kalır
+        part_type = team_part_type(request.user)
+        if not part_type:
+            return None
+        return make_etag("parts", part_type, request.get_full_path(), *get_versions(inventory_scope(part_type), USERS_SCOPE))
+
+    def get_pagination_count(self, queryset) -> int: # Toplam parça sayısı Part tablosu sayılmadan envanter sayaçlarından okunuyor
+        return get_part_type_total(self.request.user.team.team_type)
 
     def post(self, request, *args, **kwargs): #Parça üretmek için kullandığımız method
         data = request.data.copy() # bodyden gelen değerin kopyasını alıyoruz çünkü buraya user'ı eklicez o şekilde serializera göndericez.
         data['user'] = request.user.id
         serializer = self.get_serializer_class()(data=data, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(status=HTTP_201_CREATED)
+        summary = serializer.save() # Oluşturulan parçaların özeti: {count, first_id, last_id}
+        return Response(summary, status=HTTP_201_CREATED)
 
 
 class PartRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
@@ -79,7 +111,7 @@ class PartRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         if not part_type:
             return Part.objects.none()
 
-        return Part.objects.filter(part_type=part_type, user__team=user.team)
+        return Part.objects.with_list_relations().filter(part_type=part_type, user__team=user.team)
 
     def get_object(self):
         """
@@ -115,8 +147,9 @@ class PartRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
             serializer.save()  # plane_type yoksa diğer alanları güncelle
 
 
-class PlaneAssemblyCreateView(ListCreateAPIView): #Uçak üretme ve uçakları listeleme endpointimiz budur.
+class PlaneAssemblyCreateView(ConditionalGetMixin, ListCreateAPIView): #Uçak üretme ve uçakları listeleme endpointimiz budur.
     permission_classes = [IsAircraftAssemblyTeam] #Uçak üretme ve listelemeyi sadece Montaj takımına ait kullanıcılar gerçekleştirebilir.
+    pagination_class = AircraftCursorPagination
 
     def get_serializer_class(self): # Burada get ve post işlemleri yapılabilir bu fonksiyonlada gelen methoda göre uygun serializer belirleniyor
         if self.request.method == 'POST':
@@ -124,8 +157,14 @@ class PlaneAssemblyCreateView(ListCreateAPIView): #Uçak üretme ve uçakları l
         if self.request.method == "GET":
             return PlaneAssemblyListSerializer
     
-    def get_queryset(self, **kwargs: "Any") -> "QuerySet[PlaneAssembly]": # Uçak listeleme
-        return PlaneAssembly.objects.all().order_by('-created_at')
+    def get_queryset(self, **kwargs: "Any") -> "QuerySet[PlaneAssembly]": # Uçak listeleme, parçalar yerine parça özeti dönüyor
+        return PlaneAssembly.objects.with_part_summary().order_by('-created_at')
+
+    def get_etag(self, request): # Uçak üretildiğinde ya da kullanılmış parçalar değiştiğinde yenilenir
+        return make_etag("planes", request.get_full_path(), *get_versions(PLANES_SCOPE))
+
+    def get_pagination_count(self, queryset) -> int: # Büyük tablolarda Postgres istatistiklerinden tahmini sayı, küçüklerde cache'lenen gerçek sayım kullanılır
+        return estimate_table_count(PlaneAssembly)
 
     def post(self, request, *args, **kwargs): # Uçak üretme
         data = request.data.copy()
@@ -137,9 +176,24 @@ class PlaneAssemblyCreateView(ListCreateAPIView): #Uçak üretme ve uçakları l
     
 
 
-class PartScoreView(APIView): # Burada parçalardan kaç tanesi kullanıldı kaç tanesi kullanılmadı bunu gösteriyorum.
+class PlaneAssemblyDetailView(RetrieveAPIView): # Uçakta kullanılan parçaları tüm detaylarıyla dönen endpointdir.
+    permission_classes = [IsAircraftAssemblyTeam]
+    serializer_class = PlaneAssemblyDetailSerializer
+
+    def get_queryset(self, **kwargs: "Any") -> "QuerySet[PlaneAssembly]":
+        parts = Part.objects.with_list_relations()
+        return PlaneAssembly.objects.prefetch_related(Prefetch('parts_used', queryset=parts))
+
+
+class PartScoreView(ConditionalGetMixin, APIView): # Burada parçalardan kaç tanesi kullanıldı kaç tanesi kullanılmadı bunu gösteriyorum.
     permission_classes = [AircraftIsAuthenticated]  # Kullanıcı giriş yapmış olmalı
 
+    def get_etag(self, request): # Skorlar envanter sayaçlarından hesaplandığı için sayaçlarla birlikte değişir
+        part_type = team_part_type(request.user)
+        if not part_type:
+            return None
+        return make_etag("score", part_type, *get_versions(inventory_scope(part_type)))
+
     def get(self, request, *args, **kwargs):
         """ Kullanıcının takımındaki parçaların tüm uçaklardaki kullanım durumunu döndürür. """
         user = request.user
@@ -168,18 +222,128 @@ class PartScoreView(APIView): # Burada parçalardan kaç tanesi kullanıldı ka
         if not part_type:
             return Response({"error": "Bu takım parçalar üretmiyor."}, status=HTTP_400_BAD_REQUEST)
 
-        # Tüm uçak modellerini içeren bir skor tablosu başlatım
-        all_plane_types = ["TB2", "TB3", "AKINCI", "KIZILELMA"]
-        plane_scores = {plane: {"used": 0, "unused": 0} for plane in all_plane_types}
-
-        # Kullanıcının takımına ait parçaları uçak tiplerine göre gruplayarak filtreledim
-        team_parts = Part.objects.filter(part_type=part_type)
-
-        for part in team_parts:
-            plane_scores[part.plane_type]["used" if part.used_in_plane else "unused"] += 1
+        # Skorlar Part tablosu taranmadan envanter sayaçlarından okunuyor ve takım bazında kısa süre cache'leniyor
+        plane_scores = get_cached_plane_scores(part_type)
 
         return Response({
             "team": user.team.get_team_type_display(),
             "part_type": part_type_display_map.get(part_type, part_type),
             "scores": plane_scores  # Her uçak modeli için kullanılan ve kullanılmayan parça sayısı
-        }, status=HTTP_200_OK)
\ No newline at end of file
+        }, status=HTTP_200_OK)
+
+
+class DashboardView(ConditionalGetMixin, APIView):
+    """
+        Gösterge panelinin ilk açılışta ihtiyaç duyduğu verileri tek istekte döner: parça takımlarına parçaların ilk sayfası ve skorlar,
+        montaj takımına uçakların ilk sayfası. Kimlik doğrulama, yetki kontrolü ve takım çözümlemesi bir kez yapılır ve bölümler bu bilgiyi paylaşır.
+        Her bölüm ?size= ile en fazla DASHBOARD_MAX_SECTION_SIZE kayıt içerir. Listelerin next linkleri kendi endpointlerine işaret eder.
+    """
+    permission_classes = [AircraftIsAuthenticated]
+
+    def get_section_size(self) -> int:
+        try:
+            size = int(self.request.query_params.get("size", settings.DASHBOARD_SECTION_SIZE))
+        except ValueError:
+            size = settings.DASHBOARD_SECTION_SIZE
+        return max(1, min(size, settings.DASHBOARD_MAX_SECTION_SIZE))
+
+    def get_etag(self, request): # Bölümlerin bağlı olduğu versiyonlardan biri değişene kadar aynı kalır
+        if not request.user.team:
+            return None
+        part_type = team_part_type(request.user)
+        scopes = (inventory_scope(part_type), USERS_SCOPE) if part_type else (PLANES_SCOPE,)
+        return make_etag("dashboard", request.user.team.team_type, request.get_full_path(), *get_versions(*scopes))
+
+    def get(self, request, *args, **kwargs):
+        team = request.user.team
+        if not team:
+            return Response({"error": "Kullanıcının bir takımı yok."}, status=HTTP_400_BAD_REQUEST)
+
+        data = {"team": team.team_type}
+        part_type = team_part_type(request.user)
+        if part_type:
+            # Toplam parça sayısı skorlarla aynı sayaçlardan geldiği için ayrıca sayılmıyor, skorlar cache'teyse hiç sorgu çalışmıyor.
+            scores = get_cached_plane_scores(part_type)
+            total = sum(score["used"] + score["unused"] for score in scores.values())
+            parts = Part.objects.with_list_relations().filter(part_type=part_type)
+            data["parts"] = self.paginate_section(parts, PartListSerializer, "part_management", total)
+            data["score"] = {"team": team.get_team_type_display(), "part_type": Part.PartTypes(part_type).label, "scores": scores}
+        else:
+            planes = PlaneAssembly.objects.with_part_summary()
+            data["planes"] = self.paginate_section(planes, PlaneAssemblyListSerializer, "plane_management", estimate_table_count(PlaneAssembly))
+        return Response(data, status=HTTP_200_OK)
+
+    def paginate_section(self, queryset, serializer_class, url_name: str, count) -> dict:
+        """ Listenin ilk sayfasını kendi endpointindeki cursor sayfalama ile aynı sırada ve formatta döner. """
+        size = self.get_section_size()
+        paginator = AircraftCursorPagination()
+        paginator.page_size = size
+        paginator.page_size_query_param = None # Sayfa boyutu ?size= ile sınırlandı, page_size parametresi okunmuyor
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        # next linki dashboard yerine listenin kendi endpointine işaret etmeli
+        query = {"page_size": size} if size != AircraftCursorPagination.page_size else {}
+        paginator.base_url = self.request.build_absolute_uri(reverse(url_name)) + (f"?{urlencode(query)}" if query else "")
+        return {
+            "next": paginator.get_next_link(),
+            "count": count if count is not None else paginator.get_count(queryset),
+            "results": serializer_class(page, many=True, context={"request": self.request}).data,
+        }
+
+
+class EventTicketView(APIView): # Olay akışını açmak için kullanılan bileti verir, EventSource Authorization header'ı gönderemiyor.
+    permission_classes = [AircraftIsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not settings.EVENTS_ENABLED:
+            raise NotFound()
+        if not request.user.team:
+            return Response({"error": "Kullanıcının bir takımı yok."}, status=HTTP_400_BAD_REQUEST)
+        return Response({"ticket": make_ticket(request.user), "expires_in": settings.EVENTS_TICKET_MAX_AGE}, status=HTTP_200_OK)
+
+
+class EventStreamView(AircraftAsyncAPIView):
+    """
+        Kullanıcının takımına ait parça, uçak ve skor değişikliklerini Server-Sent Events olarak akıtan endpoint (?ticket=<bilet>).
+        Bağlantı boyunca veritabanına gidilmez; olaylar worker'daki EventHub'dan gelir. Sadece ASGI ile çalışır: WSGI altında Django
+        akışın tamamını göndermeden önce topladığı için bağlantı hiçbir şey göndermeden bir worker'ı süresiz meşgul eder. Bu yüzden
+        istek ASGI ile gelmediyse 501 dönülür ve frontend polling ile devam eder.
+    """
+    http_method_names = ["get"]
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            if not settings.EVENTS_ENABLED:
+                raise NotFound()
+            if not isinstance(request, ASGIRequest):
+                raise EventStreamUnavailable()
+            ticket = read_ticket(request.GET.get("ticket", ""))
+            if not ticket or not ticket["team"]:
+                raise NotAuthenticated()
+            if not await sync_to_async(ticket_is_current)(ticket): # Kullanıcı pasife alındı ya da takımı değişti
+                raise NotAuthenticated()
+            if hub.client_count >= settings.EVENTS_MAX_CLIENTS:
+                raise EventStreamFull()
+        except APIException as exc:
+            return self.handle_exception(request, exc)
+
+        response = StreamingHttpResponse(self.stream(ticket["team"], request.META.get("HTTP_LAST_EVENT_ID")), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no" # nginx cevabı tamponlamasın
+        return response
+
+    async def stream(self, team_type: str, last_event_id: str):
+        # Abonelik generator içinde açılır, böylece istemci bağlantıyı kapattığında finally bloğu aboneliği her durumda siler.
+        subscription, replay = hub.subscribe(team_type, last_event_id)
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+            if replay is None:
+                yield format_event(generate_unique_id(), RESYNC, {})
+            for frame in replay or []:
+                yield frame
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), settings.EVENTS_KEEPALIVE)
+                except TimeoutError:
+                    yield ": keepalive\n\n" # Proxy'ler boşta kalan bağlantıyı kapatmasın
+        finally:
+            hub.unsubscribe(subscription)
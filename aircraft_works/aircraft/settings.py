@@ -12,7 +12,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
-from os import getenv
+from os import cpu_count, getenv
+import sys
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -63,6 +64,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "aircraft.core.middleware.MetricsMiddleware",
+    "aircraft.core.middleware.QueryInstrumentationMiddleware",
+    "aircraft.core.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -99,7 +103,7 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "aircraft.core.authentication.AircraftJWTAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": "aircraft.core.paginators.CustomPageNumberPagination",
@@ -162,7 +166,103 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 GRAPPELLI_ADMIN_TITLE = "Control Panel"
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Parça skor endpointinin cache süresi (saniye). Cache her worker'da ayrı tutulduğu için kısa tutuyoruz,
+# başka bir worker'da yapılan değişiklikler en geç bu süre sonunda skora yansır.
+PART_SCORE_CACHE_TIMEOUT = int(getenv("PART_SCORE_CACHE_TIMEOUT", "10"))
+
+# Snowflake id üreticisinin worker id'si (aircraft/core/ids.py). Verilmezse her process advisory lock ile boş bir worker id alır;
+# verilirse lock alınmadan bu değer kullanılır ve aynı değer birden fazla process'e verilmemelidir. Testler tek process'te çalıştığı için
+# sabit bir değer kullanır, böylece veritabanı kullanmayan testler de çalışır.
+TESTING = sys.argv[1:2] == ["test"]
+ID_WORKER_ID = getenv("AIRCRAFT_ID_WORKER_ID", "0" if TESTING else None)
+# Veritabanına bağlanılamadığında process id'sinden türetilen geçici worker id ile devam edebilen, satır yazmayan yönetim komutları.
+# Sunucu processleri ve diğer komutlar worker id alamazsa hata verir.
+ID_UNCLAIMED_COMMANDS = ["check", "makemigrations", "showmigrations", "sqlmigrate", "collectstatic", "spectacular", "diffsettings", "help", "profiles"]
+
+# Toplu parça üretiminde tek bir INSERT sorgusu ile eklenecek en fazla parça sayısı.
+PART_CREATE_BATCH_SIZE = int(getenv("PART_CREATE_BATCH_SIZE", "1000"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
+
+# Access token içindeki takım ve aktiflik bilgileri (claim) bu süreden eskiyse kullanıcı veritabanından okunur.
+# Versiyon kontrolü kaçırsa bile takım değişikliği ya da pasife alınma en geç bu süre sonunda etkili olur; bu yüzden
+# ACCESS_TOKEN_LIFETIME'dan çok daha kısa tutulmalıdır.
+TOKEN_CLAIMS_MAX_AGE = timedelta(seconds=int(getenv("TOKEN_CLAIMS_MAX_AGE", "300")))
+
+# Kimliği doğrulanan kullanıcılar her worker'da en fazla USER_CACHE_SIZE kayıt ve USER_CACHE_TIMEOUT saniye boyunca tutulur.
+# User/Team kaydedildiğinde veritabanındaki auth_version değişir ve kayıt geçersiz olur. Versiyonlar CACHES'te AUTH_VERSION_CACHE_TIMEOUT
+# saniye tutulur; CACHES workerlar arasında ortak değilse (LocMemCache) başka bir worker'daki değişiklik en geç bu süre sonunda etkili olur.
+AUTH_VERSION_CACHE_TIMEOUT = int(getenv("AUTH_VERSION_CACHE_TIMEOUT", "5"))
+USER_CACHE_ENABLED = getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+USER_CACHE_SIZE = int(getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TIMEOUT = int(getenv("USER_CACHE_TIMEOUT", "60"))
+
+# Asenkron login ve kayıt endpointlerinde şifre hashleme bu kadar thread'de yapılır. Çalışan + bekleyen iş sayısı
+# PASSWORD_HASHING_WORKERS + PASSWORD_HASHING_QUEUE_LIMIT'i aşarsa istek 503 ile reddedilir.
+PASSWORD_HASHING_WORKERS = int(getenv("PASSWORD_HASHING_WORKERS", str(min(4, cpu_count() or 1))))
+PASSWORD_HASHING_QUEUE_LIMIT = int(getenv("PASSWORD_HASHING_QUEUE_LIMIT", "32"))
+
+# /api/v1/dashboard/ endpointinde her bölümün (parçalar, uçaklar) varsayılan ve en fazla kayıt sayısı.
+DASHBOARD_SECTION_SIZE = int(getenv("DASHBOARD_SECTION_SIZE", "10"))
+DASHBOARD_MAX_SECTION_SIZE = int(getenv("DASHBOARD_MAX_SECTION_SIZE", "50"))
+
+# İstek başına SQL ölçümü (sorgu sayısı, DB süresi, Server-Timing header'ı ve N+1 uyarısı). Kapalıyken middleware hiç yüklenmez.
+# Açıkken /api/ isteklerinin SQL_INSTRUMENTATION_SAMPLE_RATE oranı (0-1) ölçülür; production'da düşük bir oran ile açık bırakılabilir.
+SQL_INSTRUMENTATION_ENABLED = getenv("SQL_INSTRUMENTATION_ENABLED", "false").lower() == "true"
+SQL_INSTRUMENTATION_SAMPLE_RATE = float(getenv("SQL_INSTRUMENTATION_SAMPLE_RATE", "1.0"))
+SQL_INSTRUMENTATION_PATH_PREFIX = getenv("SQL_INSTRUMENTATION_PATH_PREFIX", "/api/")
+SQL_INSTRUMENTATION_REPEAT_THRESHOLD = int(getenv("SQL_INSTRUMENTATION_REPEAT_THRESHOLD", "5"))
+
+# İstek profilleme. Açıkken /api/ isteklerinden imzalı PROFILING_HEADER header'ı gönderenler ya da PROFILING_SAMPLE_RATE oranında
+# rastgele seçilenler cProfile ile profillenir ve PROFILING_DIR altına yazılır. Dizinde en fazla PROFILING_MAX_FILES profil tutulur.
+PROFILING_ENABLED = getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE = float(getenv("PROFILING_SAMPLE_RATE", "0.0"))
+PROFILING_PATH_PREFIX = getenv("PROFILING_PATH_PREFIX", "/api/")
+PROFILING_HEADER = getenv("PROFILING_HEADER", "X-Aircraft-Profile")
+PROFILING_TOKEN_MAX_AGE = int(getenv("PROFILING_TOKEN_MAX_AGE", "3600"))
+PROFILING_DIR = getenv("PROFILING_DIR", str(BASE_DIR / "profiles"))
+PROFILING_MAX_FILES = int(getenv("PROFILING_MAX_FILES", "200"))
+
+# Route bazında istek/gecikme/sorgu metrikleri ve allocation süreleri. Her worker kendi değerlerini METRICS_DIR altındaki dosyasına
+# en fazla METRICS_FLUSH_INTERVAL saniyede bir yazar; /api/v1/metrics/ tüm worker'ların toplamını sadece METRICS_ALLOWED_IPS'e döner.
+METRICS_ENABLED = getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_DIR = getenv("METRICS_DIR", str(BASE_DIR / "metrics"))
+METRICS_FLUSH_INTERVAL = float(getenv("METRICS_FLUSH_INTERVAL", "1.0"))
+METRICS_ALLOWED_IPS = getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+# Parça, uçak ve skor değişikliklerinin /api/v1/events/ SSE akışı. Sadece ASGI sunucusu (ör. uvicorn) ile çalışır, WSGI altında akış
+# 501 döner; docker/scripts/entrypoint.sh WSGI (gunicorn sync worker) kullandığı için varsayılan olarak kapalıdır. Olaylar commit sonrası Postgres NOTIFY ile
+# EVENTS_CHANNEL kanalına gönderilir, her worker kanalı tek bir bağlantı ile dinler ve en fazla EVENTS_MAX_CLIENTS istemciye dağıtır.
+# İstemci başına en fazla EVENTS_QUEUE_SIZE olay bekletilir, dolarsa istemciye "resync" gönderilir. Yeniden bağlanan istemcilere
+# son EVENTS_HISTORY_SIZE olaydan kaçırdıkları tekrar gönderilir. Boşta kalan bağlantıya EVENTS_KEEPALIVE saniyede bir yorum satırı yazılır,
+# tarayıcı kopan bağlantıyı EVENTS_RETRY_MS sonra yeniden açar. Akış bileti EVENTS_TICKET_MAX_AGE saniye geçerlidir,
+# kullanıcı ya da takımı kaydedilirse (pasife alma, takım değişikliği) akış bu bilet ile tekrar açılamaz.
+EVENTS_ENABLED = getenv("EVENTS_ENABLED", "false").lower() == "true"
+EVENTS_CHANNEL = getenv("EVENTS_CHANNEL", "aircraft_events")
+EVENTS_MAX_CLIENTS = int(getenv("EVENTS_MAX_CLIENTS", "1000"))
+EVENTS_QUEUE_SIZE = int(getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_HISTORY_SIZE = int(getenv("EVENTS_HISTORY_SIZE", "1000"))
+EVENTS_KEEPALIVE = float(getenv("EVENTS_KEEPALIVE", "15"))
+EVENTS_RETRY_MS = int(getenv("EVENTS_RETRY_MS", "3000"))
+EVENTS_RECONNECT_DELAY = float(getenv("EVENTS_RECONNECT_DELAY", "1.0"))
+EVENTS_TICKET_MAX_AGE = int(getenv("EVENTS_TICKET_MAX_AGE", "3600"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "aircraft": {"handlers": ["console"], "level": getenv("AIRCRAFT_LOG_LEVEL", "INFO"), "propagate": False},
+    },
+}
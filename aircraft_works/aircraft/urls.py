@@ -18,11 +18,14 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
+from aircraft.core.views import metrics_view
+
 urlpatterns = [
     path("cp-grappelli/", include("grappelli.urls")),
     path("cp/", admin.site.urls),
     path("api/", include("aircraft.accounts.urls")),
     path("api/", include("aircraft.plane_management.urls")),
+    path("api/v1/metrics/", metrics_view, name="metrics"), # Prometheus formatında metrikler
     # Swagger
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     # Optional UI: